@@ -3,6 +3,12 @@ import argparse
 from src.main_flow.parser import Parser
 from src.main_flow.scheduler import Scheduler
 from src.main_flow.resource import Resource_Manager
+from src.main_flow.ii_search import II_Search
+from src.main_flow.modulo_scheduler import Modulo_Scheduler
+from src.main_flow.list_scheduler import List_Scheduler
+from src.utilities.cache_manager import Cache_Manager, Solution_Cache
+from src.utilities.cdfg_manager import get_loop_bbs
+from src.utilities.ilp_manager import Portfolio_Backend, solution_statuses, difference_solvers
 import logging
 
 # create log interface
@@ -13,6 +19,35 @@ formatter = logging.Formatter('%(levelname)s - %(message)s') # create formatter
 console_handler.setFormatter(formatter) # add formatter to console
 log.addHandler(console_handler) # add console_handler to log
 
+# time limit and relative MIP gap of the solver per scheduling method (the key None is the default of all the methods), and cache of the ILP solutions
+solver_options = {"time_limit": {}, "mip_gap": {}, "solution_cache": None}
+
+# function to parse a solver limit option: a default value, and/or values per scheduling method, e.g. "30 asap_rconst_exact=120"
+def parse_solver_limit(option, allowed_techniques):
+	values = {}
+	if option == None:
+		return values
+	for token in option.split():
+		technique, value = token.split("=") if "=" in token else (None, token)
+		if technique != None and not(technique in allowed_techniques):
+			log.error(f"{technique} is not a valid scheduling method, its solver limit is ignored")
+			continue
+		values[technique] = float(value)
+	return values
+
+# function to set the solver options of a scheduler for a scheduling method: time limit, relative MIP gap and cache of the ILP solutions
+def set_solver_options(scheduler, technique):
+	scheduler.set_solver_limits(*[ solver_options[limit].get(technique, solver_options[limit].get(None)) for limit in ["time_limit", "mip_gap"] ])
+	scheduler.ilp.set_solution_cache(solver_options["solution_cache"])
+
+# function to get the solver of a scheduling method whose ILP is not only made of difference constraints: a solver of difference constraints
+# only is replaced by CBC
+def get_mip_solver(solver, technique):
+	if solver in difference_solvers:
+		log.warning(f"The solver {solver} only solves difference constraints, the ILP of {technique} is solved by PULP_CBC_CMD")
+		return "PULP_CBC_CMD"
+	return solver
+
 def main(args):
 	frontend_only = args.frontend
 	input_list = args.input_list
@@ -26,12 +61,17 @@ def main(args):
 	if debug_mode:
 		log.setLevel(logging.DEBUG)
 
+	# parsed CDFGs are cached on disk only if a cache folder is given
+	cache = None
+	if args.cache_dir != None:
+		cache = Cache_Manager(args.cache_dir, args.cache_size * 1024 * 1024, log=log)
+
 	#reading the list of examples to execute
 	examples_list_file = open(input_list, "r")
 	examples_list = examples_list_file.read().split("\n")
 	examples_list_file.close()
 
-	allowed_techniques = ["asap", "alap", "asap_rconst", "pipelined", "pipelined_rconst", "all"]
+	allowed_techniques = ["asap", "alap", "asap_rconst", "asap_rconst_list", "asap_rconst_exact", "pipelined", "pipelined_rconst", "pipelined_rconst_ims", "all"]
 	if args.methods != None:
 		techniques = args.methods.split()
 		for t in techniques:
@@ -41,49 +81,72 @@ def main(args):
 				return False
 	else:
 		techniques = allowed_techniques
+	solver_options["time_limit"] = parse_solver_limit(args.time_limit, allowed_techniques)
+	solver_options["mip_gap"] = parse_solver_limit(args.mip_gap, allowed_techniques)
+	# the ILP solutions are memoized in memory, and on disk if a cache folder is given
+	if args.solution_cache > 0:
+		solver_options["solution_cache"] = Solution_Cache(args.solution_cache, disk_cache=cache, log=log)
 
 	for example_name in examples_list:
 		if example_name == "":
 			continue
 
-		for scheduling_type in techniques:
+		log.info("*** BENCHMARK {0} ***".format(example_name))
+		# the path of the ssa file should be base_path/example_name/reports/example_name.cpp_mem2reg_constprop_simplifycfg_die.ll
+		path_ssa_example = "{0}/{1}/reports/{1}.cpp_mem2reg_constprop_simplifycfg_die.ll".format(base_path, example_name)
 
-			log.info("*** BENCHMARK {0} ***".format(example_name))
-			# the path of the ssa file should be base_path/example_name/reports/example_name.cpp_mem2reg_constprop_simplifycfg_die.ll
-			path_ssa_example = "{0}/{1}/reports/{1}.cpp_mem2reg_constprop_simplifycfg_die.ll".format(base_path, example_name)
+		# the example is parsed once, its CDFG is shared by all the scheduling techniques
+		log.info("Parsing file {0}".format(path_ssa_example))
+		ssa_parser = Parser(path_ssa_example, example_name, log, frontend=args.parser_mode, cache=cache, artifacts=args.artifacts)
+		if not(ssa_parser.is_valid()):
+			log.error("Parser has encountered a problem. Please verify path correctness ({0})".format(path_ssa_example))
+			continue
+		ssa_parser.draw_cdfg("{0}/{1}/test.pdf".format(base_path, example_name))
 
-			log.info("Parsing file {0}".format(path_ssa_example))
-			ssa_parser = Parser(path_ssa_example, example_name, log)
-			if not(ssa_parser.is_valid()):
-				log.error("Parser has encountered a problem. Please verify path correctness ({0})".format(path_ssa_example))
-				continue
-			ssa_parser.draw_cdfg("{0}/{1}/test.pdf".format(base_path, example_name))
+		for scheduling_type in techniques:
 
 			if scheduling_type == "asap":
-				asap(ssa_parser, base_path, example_name)
+				asap(ssa_parser, base_path, example_name, args.solver, args.artifacts, args.workers)
 
 			elif scheduling_type == "alap":
-				alap(ssa_parser, base_path, example_name)
+				alap(ssa_parser, base_path, example_name, args.solver, args.artifacts, args.workers)
 
 			elif scheduling_type == "asap_rconst":
-				asap_rconstrained(ssa_parser, base_path, example_name)
+				asap_rconstrained(ssa_parser, base_path, example_name, args.solver, args.artifacts, args.workers)
+
+			elif scheduling_type == "asap_rconst_list":
+				asap_rconstrained_list(ssa_parser, base_path, example_name, args.artifacts)
+
+			elif scheduling_type == "asap_rconst_exact":
+				asap_rconstrained_exact(ssa_parser, base_path, example_name, args.solver, args.artifacts, args.workers)
 
 			elif scheduling_type == "pipelined":
-				pipelined(ssa_parser, base_path, example_name)
+				pipelined(ssa_parser, base_path, example_name, args.solver, args.artifacts, args.max_ii, args.workers)
 
 			elif scheduling_type == "pipelined_rconst":
-				pipelined_rconstrained(ssa_parser, base_path, example_name)
+				pipelined_rconstrained(ssa_parser, base_path, example_name, args.solver, args.artifacts, args.max_ii, args.workers)
+
+			elif scheduling_type == "pipelined_rconst_ims":
+				pipelined_rconstrained_ims(ssa_parser, base_path, example_name, args.artifacts, args.max_ii)
 
 			elif scheduling_type == "all":
-				asap(ssa_parser, base_path, example_name)
-				alap(ssa_parser, base_path, example_name)
-				asap_rconstrained(ssa_parser, base_path, example_name)
-				pipelined(ssa_parser, base_path, example_name)
-				pipelined_rconstrained(ssa_parser, base_path, example_name)
+				asap(ssa_parser, base_path, example_name, args.solver, args.artifacts, args.workers)
+				alap(ssa_parser, base_path, example_name, args.solver, args.artifacts, args.workers)
+				asap_rconstrained(ssa_parser, base_path, example_name, args.solver, args.artifacts, args.workers)
+				asap_rconstrained_list(ssa_parser, base_path, example_name, args.artifacts)
+				asap_rconstrained_exact(ssa_parser, base_path, example_name, args.solver, args.artifacts, args.workers)
+				pipelined(ssa_parser, base_path, example_name, args.solver, args.artifacts, args.max_ii, args.workers)
+				pipelined_rconstrained(ssa_parser, base_path, example_name, args.solver, args.artifacts, args.max_ii, args.workers)
+				pipelined_rconstrained_ims(ssa_parser, base_path, example_name, args.artifacts, args.max_ii)
 
 			else:
 				print(f"{scheduling_type} is not a valid scheduling technique")
 
+	if args.solver == "PORTFOLIO":
+		Portfolio_Backend.print_stats(log)
+	if solver_options["solution_cache"] != None:
+		log.info("Solution cache: {0}".format(solver_options["solution_cache"].get_stats()))
+
 	if frontend_only:
 		log.info("Early execution termination\n\nBye :)")
 
@@ -91,33 +154,39 @@ def main(args):
 
 
 		###################### ASAP ######################
-def asap(parser, base_path, example_name):
-	scheduler = Scheduler(parser, "asap", log=log)
+def asap(parser, base_path, example_name, solver, artifacts, workers=1):
+	scheduler = Scheduler(parser, "asap", log=log, solver=solver, artifacts=artifacts, workers=workers)
+	set_solver_options(scheduler, "asap")
 	scheduler.create_scheduling_ilp()
 	status = scheduler.solve_scheduling_ilp(base_path, example_name)
 	chart_title = "{0} - {1}".format("asap", example_name)
 	scheduler.print_gantt_chart( chart_title, "{0}/{1}/{2}_{1}.pdf".format(base_path, example_name, "asap") )
 	scheduler.print_scheduling_summary("{0}/{1}/{2}_{1}.txt".format(base_path, example_name, "asap") )
+	return scheduler # the schedule is in the scheduler, whatever the artifact level
 
 
 		###################### ALAP ######################
-def alap(parser, base_path, example_name):
-	asap = Scheduler(parser, "asap", log=log)
+def alap(parser, base_path, example_name, solver, artifacts, workers=1):
+	asap = Scheduler(parser, "asap", log=log, solver=solver, artifacts=artifacts, workers=workers)
+	set_solver_options(asap, "alap")
 	asap.create_scheduling_ilp()
 	status = asap.solve_scheduling_ilp(base_path, example_name)
 	sink_svs = asap.get_sink_svs()
 
-	scheduler = Scheduler(parser, "alap", log=log)
+	scheduler = Scheduler(parser, "alap", log=log, solver=solver, artifacts=artifacts, workers=workers)
+	set_solver_options(scheduler, "alap")
 	scheduler.create_scheduling_ilp(sink_svs)
 	status = scheduler.solve_scheduling_ilp(base_path, example_name)
 	chart_title = "{0} - {1}".format("alap", example_name)
 	scheduler.print_gantt_chart( chart_title, "{0}/{1}/{2}_{1}.pdf".format(base_path, example_name, "alap") )
 	scheduler.print_scheduling_summary("{0}/{1}/{2}_{1}.txt".format(base_path, example_name, "alap") )
+	return scheduler # the schedule is in the scheduler, whatever the artifact level
 
 ###################### ASAP with RESOURCE CONSTRAINTS sdc ######################
 
-def asap_rconstrained(parser, base_path, example_name):
-	scheduler = Scheduler(parser, "asap", log=log)
+def asap_rconstrained(parser, base_path, example_name, solver, artifacts, workers=1):
+	scheduler = Scheduler(parser, "asap", log=log, solver=solver, artifacts=artifacts, workers=workers)
+	set_solver_options(scheduler, "asap_rconst")
 	scheduler.create_scheduling_ilp()
 
 	ilp_dependency_inj = scheduler.pass_scheduling_ilp
@@ -135,28 +204,92 @@ def asap_rconstrained(parser, base_path, example_name):
 	chart_title = "{0} - {1}".format("asap resource constrained", example_name)
 	scheduler.print_gantt_chart( chart_title, "{0}/{1}/{2}_{1}_resource_ADD_1_MUL_1.pdf".format(base_path, example_name, "asap"))
 	scheduler.print_scheduling_summary("{0}/{1}/{2}_{1}_resource_ADD_1_MUL_1.txt".format(base_path, example_name, "asap") )
+	return scheduler # the schedule is in the scheduler, whatever the artifact level
+
+
+###################### ASAP with RESOURCE CONSTRAINTS list scheduling (without ILP) ######################
+
+def asap_rconstrained_list(parser, base_path, example_name, artifacts):
+	resource_constraint_dict = {}
+	resource_constraint_dict["add"] = 1
+	resource_constraint_dict["mul"] = 1
+	resource_constraint_dict["zext"] = 1
+
+	scheduler = List_Scheduler(parser, resource_constraint_dict, priority="critical_path", log=log, artifacts=artifacts)
+	scheduler.schedule()
+
+	chart_title = "{0} - {1}".format("asap resource constrained list scheduling", example_name)
+	scheduler.print_gantt_chart( chart_title, "{0}/{1}/{2}_{1}_list_resource_ADD_1_MUL_1.pdf".format(base_path, example_name, "asap"))
+	scheduler.print_scheduling_summary("{0}/{1}/{2}_{1}_list_resource_ADD_1_MUL_1.txt".format(base_path, example_name, "asap") )
+	return scheduler # the schedule is in the scheduler, whatever the artifact level
+
+
+###################### ASAP with RESOURCE CONSTRAINTS exact time-indexed ILP ######################
+
+def asap_rconstrained_exact(parser, base_path, example_name, solver, artifacts, workers=1):
+	resource_constraint_dict = {}
+	resource_constraint_dict["add"] = 1
+	resource_constraint_dict["mul"] = 1
+	resource_constraint_dict["zext"] = 1
+
+	# the latency of each BB is bounded by a list scheduling
+	list_scheduler = List_Scheduler(parser, resource_constraint_dict, log=log, artifacts="none")
+	list_scheduler.schedule()
+	# the window of each operation comes from unconstrained ASAP and ALAP schedulings (difference constraints only, solved by the SDC engine)
+	asap = Scheduler(parser, "asap", log=log, solver="SDC", artifacts="none")
+	asap.create_scheduling_ilp()
+	asap.solve_scheduling_ilp(base_path, example_name)
+	alap = Scheduler(parser, "alap", log=log, solver="SDC", artifacts="none")
+	alap.create_scheduling_ilp(list_scheduler.get_sink_svs())
+	alap.solve_scheduling_ilp(base_path, example_name)
+
+	scheduler = Scheduler(parser, "asap", log=log, solver=get_mip_solver(solver, "asap_rconst_exact"), artifacts=artifacts, workers=workers)
+	set_solver_options(scheduler, "asap_rconst_exact")
+	scheduler.create_scheduling_ilp()
+	resource_manager = Resource_Manager(parser, scheduler.pass_scheduling_ilp, log=log)
+	resource_manager.add_resource_constraints_time_indexed(resource_constraint_dict, asap.sched_sol, alap.sched_sol)
+	list_scheduler.pass_schedule(scheduler, upper_bound=True) # the list schedule is feasible: starting point and latency upper bound
+	status = scheduler.solve_scheduling_ilp(base_path, example_name)
+	if not(status in solution_statuses):
+		log.error("The exact resource-constrained scheduling of {0} has no solution (status {1})".format(example_name, status))
+		return None
+
+	chart_title = "{0} - {1}".format("asap resource constrained exact", example_name)
+	scheduler.print_gantt_chart( chart_title, "{0}/{1}/{2}_{1}_exact_resource_ADD_1_MUL_1.pdf".format(base_path, example_name, "asap"))
+	scheduler.print_scheduling_summary("{0}/{1}/{2}_{1}_exact_resource_ADD_1_MUL_1.txt".format(base_path, example_name, "asap") )
+	return scheduler # the schedule is in the scheduler, whatever the artifact level
 
 
 		###################### ASAP pipelined ######################
 
-def pipelined(parser, base_path, example_name):
-	status = 0
-	ii = 0
-	scheduler = 0
-	while(status != 1):
-		ii= ii + 1
+def pipelined(parser, base_path, example_name, solver, artifacts, max_II=None, workers=1):
+	ii_search = II_Search(parser, max_II=max_II, log=log)
+	# the ILP is created once, only the II changes between the attempts
+	scheduler = Scheduler(parser, "pipelined", log=log, solver=solver, artifacts=artifacts, workers=workers)
+	set_solver_options(scheduler, "pipelined")
+	scheduler.create_scheduling_ilp(II=ii_search.MII)
+	def try_II(ii):
 		print(f"Trying II = {ii}")
-		scheduler = Scheduler(parser, "pipelined", log=log)
-		scheduler.create_scheduling_ilp(II=ii)
+		scheduler.set_II(ii)
 		status = scheduler.solve_scheduling_ilp(base_path, example_name)
+		return II_Search.get_feasibility(status), scheduler # a time limit without schedule is not an infeasible II
+
+	ii, scheduler = ii_search.search(try_II)
+	if scheduler == None:
+		if ii_search.stopped_II != None:
+			log.error("The II search of {0} stopped at II = {1}, whose feasibility is unknown".format(example_name, ii_search.stopped_II))
+		else:
+			log.error("The loop of {0} cannot be pipelined".format(example_name))
+		return None
 	chart_title = "{0} - {1} (II: {2})".format("asap pipelined", example_name, ii)
 	scheduler.print_gantt_chart( chart_title, "{0}/{1}/{2}_{1}_asap_pipelined.pdf".format(base_path, example_name, "pipelined"))
 	scheduler.print_scheduling_summary("{0}/{1}/{2}_{1}_asap_pipelined.pdf.txt".format(base_path, example_name, "pipelined") )
+	return scheduler # the schedule is in the scheduler, whatever the artifact level
 
 
 		###################### ASAP pipelined resource constrained ######################
 
-def pipelined_rconstrained(parser, base_path, example_name):
+def pipelined_rconstrained(parser, base_path, example_name, solver, artifacts, max_II=None, workers=1):
 	chart_title = "{0} - {1}".format("asap pipelined resource constrained", example_name)
 
 
@@ -165,31 +298,77 @@ def pipelined_rconstrained(parser, base_path, example_name):
 	resource_constraint_dict["add"] = 1
 	resource_constraint_dict["zext"] = 1
 
-	succesful = False
-	ii = 0
-	while not succesful:
-		ii= ii + 1
+	ii_search = II_Search(parser, resource_constraint_dict, max_II=max_II, log=log)
+	# the ILP is created once, only the II changes between the attempts
+	scheduler = Scheduler(parser, "pipelined", log=log, solver=get_mip_solver(solver, "pipelined_rconst"), artifacts=artifacts, workers=workers)
+	set_solver_options(scheduler, "pipelined_rconst")
+	scheduler.create_scheduling_ilp(II=ii_search.MII)
+	resource_manager = Resource_Manager(parser, scheduler.pass_scheduling_ilp, log=log)
+	# the BBs that are not pipelined keep the resource constraints of asap_rconst, the loop BBs get the MRT of each II
+	loop_bbs = get_loop_bbs(parser.get_cdfg())
+	resource_manager.add_resource_constraints(resource_constraint_dict, bbs=[ int(bb.attr["id"]) for bb in parser.get_cfg() if not(int(bb.attr["id"]) in loop_bbs) ])
+	def try_II(ii):
 		print(f"Trying II = {ii}")
-		scheduler = Scheduler(parser, "pipelined", log=log)
-		scheduler.create_scheduling_ilp(II=ii)
-		
-		resource_manager = Resource_Manager(parser, scheduler.pass_scheduling_ilp, log=log)
-
-		resource_manager.add_resource_constraints(resource_constraint_dict)
-		status = scheduler.solve_scheduling_ilp(base_path, example_name)
-		if status == 1:
-			succesful = resource_manager.check_resource_constraints_pipelined(resource_constraint_dict, ii)
-
+		scheduler.set_II(ii)
+		resource_manager.add_resource_constraints_pipelined(resource_constraint_dict, ii)
+		status = scheduler.solve_scheduling_ilp(base_path, example_name) # the MRT is in the ILP, a single solution decides the feasibility of the II
+		if status in solution_statuses and not(resource_manager.check_resource_constraints_pipelined(resource_constraint_dict, ii)):
+			log.error(f"II = {ii}: the schedule of the solver does not respect the MRT, the attempt failed")
+			return None, scheduler # the solution is wrong, it does not decide the feasibility of the II
+		return II_Search.get_feasibility(status), scheduler # a time limit without schedule is not an infeasible II
+
+	ii, scheduler = ii_search.search(try_II)
+	if scheduler == None:
+		if ii_search.stopped_II != None:
+			log.error("The II search of {0} stopped at II = {1}, whose feasibility is unknown".format(example_name, ii_search.stopped_II))
+		else:
+			log.error("The loop of {0} cannot be pipelined with the resources {1}".format(example_name, resource_constraint_dict))
+		return None
 	scheduler.print_gantt_chart(chart_title, "{0}/{1}/{2}_{1}_asap_pipelined_res_constrained.pdf".format(base_path, example_name, "pipelined"))
 	scheduler.print_scheduling_summary("{0}/{1}/{2}_{1}_asap_pipelined_res_constrained.txt".format(base_path, example_name, "pipelined") )
+	return scheduler # the schedule is in the scheduler, whatever the artifact level
+
+		###################### ASAP pipelined resource constrained (iterative modulo scheduling, without ILP) ######################
+
+def pipelined_rconstrained_ims(parser, base_path, example_name, artifacts, max_II=None):
+	chart_title = "{0} - {1}".format("iterative modulo scheduling resource constrained", example_name)
+
+	resource_constraint_dict = {}
+	resource_constraint_dict["mul"] = 1
+	resource_constraint_dict["add"] = 1
+	resource_constraint_dict["zext"] = 1
+
+	ii_search = II_Search(parser, resource_constraint_dict, max_II=max_II, log=log)
+	scheduler = Modulo_Scheduler(parser, resource_constraint_dict, log=log, artifacts=artifacts)
+	def try_II(ii):
+		print(f"Trying II = {ii}")
+		return (True if scheduler.schedule(ii) else None), scheduler # a budget exhausted is a failure of the heuristic, not an infeasible II
+
+	ii, scheduler = ii_search.search_linear(try_II) # the IIs are swept from MII, the failures of the heuristic do not bound the search
+	if scheduler == None:
+		log.error("The iterative modulo scheduling of {0} failed up to II = {1} with the resources {2}".format(example_name, ii_search.max_II, resource_constraint_dict))
+		return None
+	scheduler.print_gantt_chart(chart_title, "{0}/{1}/{2}_{1}_ims_pipelined_res_constrained.pdf".format(base_path, example_name, "pipelined"))
+	scheduler.print_scheduling_summary("{0}/{1}/{2}_{1}_ims_pipelined_res_constrained.txt".format(base_path, example_name, "pipelined") )
+	return scheduler # the schedule is in the scheduler, whatever the artifact level
 
 #todo: add desc in assignment
 if __name__ == '__main__':
 	arg_parser = argparse.ArgumentParser(description="Welcome to the SDC project for the Summer Semester 2023!")
 	arg_parser.add_argument('--input_list', type=str, help='Input filelist containing examples to run', default="filelist.lst")
-	arg_parser.add_argument('--methods', type=str, help='Space-separated list of scheduling methods that should be run, all methods are tested when this is not specified.  Possible values are: asap, alap, asap_rconst, pipelined, pipelined_rconst, all')
+	arg_parser.add_argument('--methods', type=str, help='Space-separated list of scheduling methods that should be run, all methods are tested when this is not specified.  Possible values are: asap, alap, asap_rconst, asap_rconst_list, asap_rconst_exact, pipelined, pipelined_rconst, pipelined_rconst_ims, all')
 	arg_parser.add_argument('--examples_folder', type=str, help='Path of the examples folder', default="examples")
 	arg_parser.add_argument('--frontend', action='store_true' , help='Execute only frontend', default=False)
+	arg_parser.add_argument('--parser_mode', type=str, choices=['regex', 'structured'], help='Frontend mode: regex parses the instruction text, structured reads the llvmlite operands directly', default="regex")
+	arg_parser.add_argument('--cache_dir', type=str, help='Folder of the on-disk cache of parsed CDFGs, and of the ILP solutions with --solution_cache (no cache if not specified)', default=None)
+	arg_parser.add_argument('--cache_size', type=int, help='Maximum size of the on-disk cache of parsed CDFGs in MB', default=256)
+	arg_parser.add_argument('--solver', type=str, help='Solver of the scheduling ILPs: a pulp solver, SDC to solve the difference constraints by shortest paths, or SCIPY_HIGHS to solve in process with HiGHS (scipy >= 1.9), or PORTFOLIO to race CBC, HiGHS and SDC in parallel processes and keep the first proof', default="PULP_CBC_CMD")
+	arg_parser.add_argument('--artifacts', type=str, choices=['none', 'summary', 'full'], help='Files written by the flow: none (schedules only in memory), summary (only the scheduling summaries) or full (also the drawings, the ILP formulations and the gantt charts)', default="full")
+	arg_parser.add_argument('--max_ii', type=int, help='Maximum II tried by the II search of the pipelined scheduling (by default, the sum of the latencies of the CDFG)', default=None)
+	arg_parser.add_argument('--workers', type=int, help='Number of processes solving the BBs of each scheduling ILP in parallel (the BBs are independent components of the ILP), 1 to solve each ILP at once', default=1)
+	arg_parser.add_argument('--time_limit', type=str, help='Time limit of each ILP solution in seconds, the best schedule found is then kept even if it is not proven optimal: a default value and/or values per method, e.g. "30 asap_rconst_exact=120" (no limit if not specified)', default=None)
+	arg_parser.add_argument('--mip_gap', type=str, help='Relative MIP gap at which the solver stops: a default value and/or values per method, e.g. "0.05 pipelined_rconst=0.1" (default gap of the solver if not specified)', default=None)
+	arg_parser.add_argument('--solution_cache', type=int, help='Number of ILP solutions memoized in memory, keyed by the fingerprint of their ILP formulation (0 disables the solution cache)', default=0)
 	arg_parser.add_argument('--debug', action='store_true' , help='Set debug mode', default=False)
 
 
@@ -0,0 +1,193 @@
+from src.utilities.cdfg_manager import *
+from src.utilities.ilp_manager import solution_statuses
+from src.main_flow.resource import get_res_mii
+import pulp as ilp
+import logging
+import time
+
+############################################################################################################################################
+############################################################################################################################################
+#
+#	`II_SEARCH` CLASS
+#
+############################################################################################################################################
+#	DESCRIPTION:
+#					The following class searches the minimum II (Initiation Interval) of a pipelined scheduling.
+#					The search starts from MII = max(ResMII, RecMII), computed from the CDFG and the resource dictionary, then the II
+#					is increased exponentially until a feasible II is found, and the minimum feasible II is found by binary search
+############################################################################################################################################
+#	INFO:
+#					the search assumes that the feasibility is monotone in the II (every II larger than a feasible II is feasible)
+#					the attempts can share a same scheduler whose II is changed (`Scheduler.set_II`), the minimum II is then solved again if it was not the last attempt
+#					the feasibility of an attempt is True, False, or None if it is unknown (the solver reached its time limit without any schedule, or it cannot
+#					solve the formulation): an unknown II is never a lower bound of the search. The exponential search stops at an unknown II without result,
+#					the binary search goes on below it (a smaller feasible II would prove it feasible), then between it and the smallest feasible II, the II
+#					found is then not proven minimum
+#					the failure of a heuristic scheduler (e.g. iterative modulo scheduling out of budget) proves nothing either: its IIs are swept
+#					linearly from MII (`search_linear`) and its failures are recorded as heuristic failures, not as infeasible IIs
+############################################################################################################################################
+#	ATTRIBUTES:
+#					- cdfg : CDFG representation of the SSA IR input
+#					- resource_dict : resource dictionary of the scheduling (None if it is not resource constrained)
+#					- res_mii : resource-constrained minimum II
+#					- critical_recurrence : recurrence limiting the II, as (latency, distance, cycle) (None if there is no recurrence)
+#					- rec_mii : recurrence-constrained minimum II
+#					- MII : minimum II, the search starts from it
+#					- max_II : maximum II tried by the search
+#					- attempts : statistics of each attempted II (II, feasibility, heuristic scheduler or not, number of solutions, solution time, total time)
+#					- unknown_IIs : IIs whose feasibility is unknown (time limit reached without any schedule, formulation not supported by the solver, or
+#					  failure of a heuristic scheduler)
+#					- stopped_II : unknown II at which the exponential search stopped without result (None if it did not stop)
+#					- results : scheduler of each feasible II
+#					- ilp_stats : number of solutions and solution time of each ILP object at its last attempt (the ILP of a shared scheduler accumulates them)
+#					- log: logger object used to output logs
+############################################################################################################################################
+#	FUNCTIONS:
+#					- get_feasibility : get the feasibility of an II from the status of its scheduling ILP
+#					- get_default_max_II : get the default maximum II
+#					- attempt : try to schedule with a given II
+#					- get_feasibility_name : get the name of a feasibility
+#					- search : search the minimum feasible II
+#					- search_linear : search the minimum II scheduled by a heuristic scheduler, by a linear sweep
+#					- print_attempts : log the statistics of the attempts
+############################################################################################################################################
+############################################################################################################################################
+
+class II_Search:
+
+	def __init__(self, parser, resource_dict=None, max_II=None, log=None):
+		if log != None:
+			self.log = log
+		else:
+			self.log = logging.getLogger('ii_search') # if the logger is not given at object generation, create a new one
+		assert(parser != None) # ensure Parser is different from None
+		self.cdfg = parser.get_cdfg()
+		self.resource_dict = resource_dict
+		self.critical_recurrence = get_critical_recurrence(self.cdfg)
+		self.rec_mii = -(-self.critical_recurrence[0] // self.critical_recurrence[1]) if self.critical_recurrence != None else 0 # ceiling of the maximum cycle ratio
+		self.res_mii = get_res_mii(self.cdfg, resource_dict) if resource_dict != None else 0
+		self.MII = max(1, self.rec_mii, self.res_mii)
+		self.max_II = max_II if max_II != None else self.get_default_max_II()
+		self.attempts = []
+		self.unknown_IIs = []
+		self.stopped_II = None
+		self.results = {}
+		self.ilp_stats = {}
+		self.log.info(f"MII = {self.MII} (ResMII = {self.res_mii}, RecMII = {self.rec_mii}), maximum II = {self.max_II}")
+		if self.critical_recurrence != None:
+			latency, distance, cycle = self.critical_recurrence
+			self.log.info(f"Critical recurrence (latency {latency}, distance {distance}): {' -> '.join([ self.cdfg.node_names[node] for node in cycle ])}")
+
+	# function to get the feasibility of an II from the status of its scheduling ILP: a schedule found within the time limit is feasible even if
+	# it is not optimal, only a proven infeasibility is infeasible, and the other statuses (time limit reached without any schedule, formulation
+	# not supported by the solver) do not decide the feasibility (None)
+	@staticmethod
+	def get_feasibility(status):
+		if status in solution_statuses:
+			return True
+		if status == ilp.LpStatusInfeasible:
+			return False
+		return None
+
+	# function to get the default maximum II: without any overlap of the iterations, an iteration lasts at most the sum of the latencies
+	def get_default_max_II(self):
+		return max(self.MII, sum(self.cdfg.node_latency) + 1)
+
+	"""
+	Tries to schedule with a given II, and records the statistics of the attempt
+	@param try_II: function taking the II and returning the feasibility (True, False or None if unknown) and the scheduler of the attempt
+	@param heuristic: True if the scheduler is a heuristic, an unknown feasibility is then a failure of the heuristic
+	"""
+	def attempt(self, try_II, II, heuristic=False):
+		start_time = time.perf_counter()
+		feasible, scheduler = try_II(II)
+		total_time = time.perf_counter() - start_time
+		solve_count, solve_time = 0, 0.0
+		if scheduler != None and scheduler.ilp != None: # the heuristic schedulers have no ILP
+			previous_count, previous_time = self.ilp_stats.get(scheduler.ilp, (0, 0.0))
+			solve_count, solve_time = scheduler.ilp.solve_count - previous_count, scheduler.ilp.solve_time - previous_time
+			self.ilp_stats[scheduler.ilp] = (scheduler.ilp.solve_count, scheduler.ilp.solve_time)
+		self.attempts.append({"II": II, "feasible": feasible, "heuristic": heuristic, "solves": solve_count, "solve_time": solve_time, "time": total_time, "scheduler": scheduler})
+		self.log.debug(f"II = {II}: {self.get_feasibility_name(feasible, heuristic)} ({solve_count} solve(s) in {solve_time:.4f} s, {total_time:.4f} s in total)")
+		if feasible:
+			self.results[II] = scheduler
+		elif feasible == None:
+			self.unknown_IIs.append(II)
+		return feasible
+
+	# function to get the name of a feasibility, the unknown feasibility of a heuristic scheduler is a failure of the heuristic
+	def get_feasibility_name(self, feasible, heuristic=False):
+		if feasible == None:
+			return 'heuristic failure' if heuristic else 'unknown'
+		return 'feasible' if feasible else 'infeasible'
+
+	"""
+	Searches the minimum feasible II between MII and max_II, it returns the II and its scheduler (None, None if there is no feasible II)
+	@param try_II: function taking the II and returning the feasibility (True, False or None if unknown) and the scheduler of the attempt
+	"""
+	def search(self, try_II):
+		# exponential search: MII, MII+1, MII+3, MII+7, ... (the last attempt is max_II), it stops at an unknown II: the larger IIs would be
+		# searched as if it was infeasible
+		infeasible_II, feasible_II = self.MII - 1, None
+		step = 1
+		while feasible_II == None and infeasible_II < self.max_II:
+			II = min(self.MII + step - 1, self.max_II)
+			feasible = self.attempt(try_II, II)
+			if feasible:
+				feasible_II = II
+			elif feasible == None:
+				self.stopped_II = II
+				self.print_attempts()
+				self.log.error(f"The feasibility of II = {II} is unknown, the II search stops without result (the larger IIs are not tried)")
+				return None, None
+			else:
+				infeasible_II = II
+			step *= 2
+		if feasible_II == None:
+			self.print_attempts()
+			self.log.error(f"No feasible II has been found between {self.MII} and {self.max_II}")
+			return None, None
+		# binary search between the largest infeasible II and the smallest feasible II, an unknown II is not a lower bound: the search first goes on
+		# below it (a smaller feasible II would prove it feasible), then between it and the smallest feasible II (the II found is not proven minimum)
+		lower_II, upper_II = infeasible_II, feasible_II
+		while upper_II - lower_II > 1:
+			II = (lower_II + upper_II) // 2
+			feasible = self.attempt(try_II, II)
+			if feasible:
+				feasible_II = upper_II = II
+			elif feasible == None:
+				upper_II = II
+			else:
+				lower_II = II
+			if upper_II - lower_II <= 1 and upper_II != feasible_II: # no feasible II below the unknown upper_II
+				lower_II, upper_II = upper_II, feasible_II
+		# a shared scheduler holds the solution of its last attempt
+		if self.attempts[-1]["II"] != feasible_II and self.attempts[-1]["scheduler"] is self.results[feasible_II]:
+			self.attempt(try_II, feasible_II)
+		self.print_attempts()
+		if any([ II < feasible_II for II in self.unknown_IIs ]):
+			self.log.warning(f"II = {feasible_II} is not proven minimum: the feasibility of II = {[ II for II in self.unknown_IIs if II < feasible_II ]} is unknown")
+		return feasible_II, self.results[feasible_II]
+
+	"""
+	Searches the minimum II scheduled by a heuristic scheduler with a linear sweep MII, MII+1, ... up to max_II, as in the iterative modulo scheduling
+	of Rau: a failure of the heuristic does not prove the II infeasible, so it cannot bound a binary search. It returns the first II scheduled and
+	its scheduler (None, None if the heuristic failed at every II)
+	@param try_II: function taking the II and returning True if the heuristic scheduled it (None if it failed) and the scheduler of the attempt
+	"""
+	def search_linear(self, try_II):
+		for II in range(self.MII, self.max_II + 1):
+			if self.attempt(try_II, II, heuristic=True):
+				self.print_attempts()
+				if len(self.unknown_IIs) > 0:
+					self.log.warning(f"II = {II} is not proven minimum: the heuristic failed at II = {self.unknown_IIs}")
+				return II, self.results[II]
+		self.print_attempts()
+		self.log.error(f"The heuristic failed at every II between {self.MII} and {self.max_II} (no II is proven infeasible)")
+		return None, None
+
+	# function to log the statistics of the attempts
+	def print_attempts(self):
+		self.log.info(f"II search: {len(self.attempts)} attempt(s), {sum([a['solves'] for a in self.attempts])} solve(s) in {sum([a['solve_time'] for a in self.attempts]):.4f} s")
+		for a in self.attempts:
+			self.log.info(f"\tII = {a['II']}: {self.get_feasibility_name(a['feasible'], a['heuristic'])}, {a['solves']} solve(s) in {a['solve_time']:.4f} s, {a['time']:.4f} s in total")
@@ -0,0 +1,158 @@
+from src.main_flow.scheduler import *
+from src.main_flow.resource import allowed_resources
+import heapq
+import logging
+
+############################################################################################################################################
+############################################################################################################################################
+#
+#	`LIST_SCHEDULER` CLASS
+#
+############################################################################################################################################
+#	DESCRIPTION:
+#					The following class is a resource-constrained ASAP scheduler that does not use an ILP solver. It is a priority list
+#					scheduler: the operations whose predecessors are scheduled are ready, the ready operation with the best priority is
+#					scheduled at its earliest time with a unit of its resource type free until its completion. The ready list costs O((V+E) log V),
+#					the first cycle with a free unit is found through the full cycles of each resource type, linked to the next cycle in a union-find
+#					with path compression, and at most the latency of the operation is checked from each free cycle tried
+############################################################################################################################################
+#	INFO:
+#					'list_priorities' are the allowed priorities: "critical_path" (longest path to the end of the BB first) or "mobility"
+#					(smallest ALAP - ASAP first), the ties are broken by topological order
+#					the resource dictionary has the format of `Resource_Manager`, an operation uses a unit of its type from its start until its
+#					completion (cycles [start, start + latency)), as in the resource constraints of `Resource_Manager.add_resource_constraints`
+#					the solution is written in the start times of the CDFG, as for `Scheduler`, so that the gantt chart and the summary work,
+#					and it can be passed to the ILP of a scheduler as starting point or as latency upper bound of each BB
+############################################################################################################################################
+#	ATTRIBUTES:
+#					- resource_dict : resource dictionary, e.g. {'add': 1, 'mul': 1, 'zext': 1}
+#					- priority : priority of the ready operations
+#					- topological_index : position of each node in the topological order
+############################################################################################################################################
+#	FUNCTIONS:
+#					- get_dag_dependencies : get the dag edges of a same BB, the only ones constraining the ASAP scheduling
+#					- get_priorities : compute the priority of each node
+#					- get_free_cycle : get the first cycle with a free unit of a resource type, from a given cycle
+#					- get_free_interval : get the first cycle from which a unit of a resource type is free during a given latency, from a given cycle
+#					- schedule : priority list scheduling
+#					- pass_schedule : pass the schedule to the ILP of a scheduler (starting point, optionally latency upper bounds)
+############################################################################################################################################
+############################################################################################################################################
+
+list_priorities = ["critical_path", "mobility"]
+
+class List_Scheduler(Scheduler):
+
+	def __init__(self, parser, resource_dict, priority="critical_path", log=None, artifacts="full"):
+		super().__init__(parser, "asap", log=log, artifacts=artifacts, build_ilp=False) # the ILP of the scheduler is not used
+		for resource in resource_dict:
+			if not(resource in allowed_resources): # the resource type should be present in the list of allowed resource types
+				self.log.error("Resource {0} is not allowed (allowed resources = {1})".format(resource, allowed_resources))
+		assert(priority in list_priorities) # the priority must belong to the allowed ones
+		self.resource_dict = resource_dict
+		self.priority = priority
+		self.topological_index = { node : pos for pos, node in enumerate(get_topological_order(self.cdfg)) }
+
+	# function to get the dag edges of a same BB (edge ids), the only ones constraining the ASAP scheduling
+	def get_dag_dependencies(self):
+		cdfg = self.cdfg
+		return [ e for e in get_dag_edges(cdfg) if cdfg.node_bb[cdfg.edge_src[e]] == cdfg.node_bb[cdfg.edge_dst[e]] ]
+
+	# function to compute the priority of each node (the smallest first), from the ASAP times and the heights without resource constraints
+	def get_priorities(self, dependencies):
+		cdfg = self.cdfg
+		order = sorted(self.topological_index, key=lambda node : self.topological_index[node])
+		out_dependencies = [ [] for _ in cdfg ]
+		for e in dependencies:
+			out_dependencies[cdfg.edge_src[e]].append(cdfg.edge_dst[e])
+		heights = [ 0 ] * len(cdfg) # longest path to the end of the BB, latency of the node included
+		for node in reversed(order):
+			heights[node] = cdfg.node_latency[node] + max([ heights[succ] for succ in out_dependencies[node] ], default=0)
+		if self.priority == "critical_path":
+			return [ (-heights[node], self.topological_index[node]) for node in cdfg ]
+		asap = [ 0 ] * len(cdfg)
+		for node in order:
+			for succ in out_dependencies[node]:
+				asap[succ] = max(asap[succ], asap[node] + cdfg.node_latency[node])
+		bb_latency = {} # latency of each BB without resource constraints
+		for node in cdfg:
+			bb_latency[cdfg.node_bb[node]] = max(bb_latency.get(cdfg.node_bb[node], 0), asap[node] + heights[node])
+		# mobility = ALAP - ASAP, with ALAP = latency of the BB - height
+		return [ (bb_latency[cdfg.node_bb[node]] - heights[node] - asap[node], -heights[node], self.topological_index[node]) for node in cdfg ]
+
+	# function to get the first cycle from `time` with a free unit of a resource (key (BB, resource type)), `full_cycles` links each full cycle
+	# of the resource to a later cycle, the links of the followed path are compressed
+	def get_free_cycle(self, full_cycles, key, time):
+		path = []
+		while (key, time) in full_cycles:
+			path.append(time)
+			time = full_cycles[(key, time)]
+		for full_time in path:
+			full_cycles[(key, full_time)] = time
+		return time
+
+	# function to get the first cycle from `time` from which a unit of a resource (key (BB, resource type)) is free during `latency` cycles
+	def get_free_interval(self, full_cycles, key, time, latency):
+		time = self.get_free_cycle(full_cycles, key, time)
+		end = time + 1
+		while end < time + latency:
+			if (key, end) in full_cycles: # all the units are busy in a cycle of the interval, the next interval starts after it
+				time = self.get_free_cycle(full_cycles, key, end)
+				end = time + 1
+			else:
+				end += 1
+		return time
+
+	"""
+	Schedules the CDFG by priority list scheduling, the solution is written as the one of the ILP
+	"""
+	def schedule(self):
+		cdfg = self.cdfg
+		dependencies = self.get_dag_dependencies()
+		priorities = self.get_priorities(dependencies)
+		out_dependencies = [ [] for _ in cdfg ]
+		remaining_predecessors = [ 0 ] * len(cdfg)
+		for e in dependencies:
+			out_dependencies[cdfg.edge_src[e]].append(cdfg.edge_dst[e])
+			remaining_predecessors[cdfg.edge_dst[e]] += 1
+		earliest = [ 0 ] * len(cdfg)
+		start = [ 0 ] * len(cdfg)
+		usage = {} # number of units of each (BB, resource type, cycle) in use
+		full_cycles = {} # next cycle to try after each full ((BB, resource type), cycle)
+		ready = [ (priorities[node], node) for node in cdfg if remaining_predecessors[node] == 0 ]
+		heapq.heapify(ready)
+		while ready:
+			node = heapq.heappop(ready)[1]
+			node_type = cdfg.get_type(node)
+			time = earliest[node]
+			if node_type in self.resource_dict:
+				key = (cdfg.node_bb[node], node_type)
+				time = self.get_free_interval(full_cycles, key, time, cdfg.node_latency[node])
+				for cycle in range(time, time + cdfg.node_latency[node]): # a unit is busy until the completion of the operation
+					usage[key + (cycle,)] = usage.get(key + (cycle,), 0) + 1
+					if usage[key + (cycle,)] == self.resource_dict[node_type]:
+						full_cycles[(key, cycle)] = cycle + 1
+			start[node] = time
+			for succ in out_dependencies[node]:
+				earliest[succ] = max(earliest[succ], time + cdfg.node_latency[node])
+				remaining_predecessors[succ] -= 1
+				if remaining_predecessors[succ] == 0:
+					heapq.heappush(ready, (priorities[succ], succ))
+		for node in cdfg:
+			cdfg.set_start(node, float(start[node]))
+		self.sched_sol = { f"sv{cdfg.node_names[node]}" : float(start[node]) for node in cdfg }
+		self.log.debug(f"List scheduling ({self.priority} priority): BB latencies {self.get_sink_svs()}")
+		return self.sched_sol
+
+	"""
+	Passes the schedule to the ILP of a scheduler of the same CDFG: the schedule is the starting point of the solver, and optionally the latency
+	of each BB is an upper bound of the ILP (only valid if the ILP admits the list schedule, e.g. with the time-indexed resource constraints of
+	`Resource_Manager`, the chains of `add_resource_constraints` fix an order of the operations that can exclude it)
+	@param scheduler: the scheduler whose ILP is created
+	@param upper_bound: True to add the latency of each BB as upper bound
+	"""
+	def pass_schedule(self, scheduler, upper_bound=False):
+		assert self.sched_sol != None, "There should be a solution to the list scheduling before running this function"
+		scheduler.ilp.set_initial_solution({ var_name : value for var_name, value in self.sched_sol.items() if var_name in scheduler.ilp.get_variables_list() })
+		if upper_bound:
+			scheduler.add_sink_sv_constraints(self.get_sink_svs())
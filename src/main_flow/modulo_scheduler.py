@@ -0,0 +1,169 @@
+from src.main_flow.scheduler import *
+from src.main_flow.resource import allowed_resources
+import heapq
+import math
+import logging
+
+############################################################################################################################################
+############################################################################################################################################
+#
+#	`MODULO_SCHEDULER` CLASS
+#
+############################################################################################################################################
+#	DESCRIPTION:
+#					The following class is a resource-constrained pipelined scheduler that does not use an ILP solver. It implements the
+#					iterative modulo scheduling of B. R. Rau ("Iterative modulo scheduling: an algorithm for software pipelining loops",
+#					MICRO 1994): the operations are scheduled by decreasing height in a modulo reservation table (MRT), an operation that
+#					cannot be placed evicts the operations conflicting with it, and the scheduling fails when its budget is exhausted
+############################################################################################################################################
+#	INFO:
+#					the dependencies are the ones of the pipelined scheduling ILP: the dag edges of a same BB and the back edges (distance 1)
+#					the resource dictionary has the format of `Resource_Manager`, an operation uses a unit of its type in its start cycle
+#					the MRT of the loop BBs is indexed by the start time modulo II, the other BBs (not pipelined) use a plain reservation table
+#					the solution is written in the start times of the CDFG, as for `Scheduler`, so that the gantt chart and the summary work
+############################################################################################################################################
+#	ATTRIBUTES:
+#					- resource_dict : resource dictionary, e.g. {'add': 1, 'mul': 1, 'zext': 1}
+#					- budget_ratio : number of scheduling steps allowed per operation before the scheduling of an II fails
+#					- loop_bbs : BBs containing back edges, they are pipelined
+#					- in_dependencies, out_dependencies : dependencies entering and leaving each node, as (node, latency, distance)
+#					- topological_index : position of each node in the topological order, used to break the ties of the priorities
+#					- steps : number of scheduling steps of the last scheduling
+############################################################################################################################################
+#	FUNCTIONS:
+#					- set_dependencies : collect the dependencies of the nodes
+#					- get_heights : compute the height-based priority of each node for an II
+#					- get_table_key : get the entry of the reservation table used by a node at a time
+#					- schedule : iterative modulo scheduling for an II
+############################################################################################################################################
+############################################################################################################################################
+
+class Modulo_Scheduler(Scheduler):
+
+	def __init__(self, parser, resource_dict, log=None, artifacts="full", budget_ratio=6):
+		super().__init__(parser, "pipelined", log=log, artifacts=artifacts, build_ilp=False) # the ILP of the scheduler is not used
+		for resource in resource_dict:
+			if not(resource in allowed_resources): # the resource type should be present in the list of allowed resource types
+				self.log.error("Resource {0} is not allowed (allowed resources = {1})".format(resource, allowed_resources))
+		assert(budget_ratio > 0) # at least one scheduling step per operation
+		self.resource_dict = resource_dict
+		self.budget_ratio = budget_ratio
+		self.loop_bbs = get_loop_bbs(self.cdfg)
+		self.topological_index = { node : pos for pos, node in enumerate(get_topological_order(self.cdfg)) }
+		self.steps = 0
+		self.set_dependencies()
+
+	# function to collect the dependencies of the nodes: sv(dst) >= sv(src) + latency - II * distance
+	def set_dependencies(self):
+		cdfg = self.cdfg
+		self.in_dependencies = [ [] for _ in cdfg ]
+		self.out_dependencies = [ [] for _ in cdfg ]
+		for src, dst, latency, distance in get_recurrence_edges(cdfg):
+			if src == dst: # a self recurrence only requires II >= latency, ensured by RecMII
+				continue
+			self.out_dependencies[src].append((dst, latency, distance))
+			self.in_dependencies[dst].append((src, latency, distance))
+
+	# function to compute the height of each node for an II: the longest path to the end of the iteration, the back edges counting -II
+	# the passes stop after |V| passes at most (Bellman-Ford), they only converge if there is no positive cycle, i.e. if II >= RecMII
+	def get_heights(self, II):
+		heights = [ 0 ] * len(self.cdfg)
+		reverse_order = sorted(self.topological_index, key=lambda node : -self.topological_index[node])
+		for _ in range(len(self.cdfg)):
+			changed = False
+			for node in reverse_order:
+				for succ, latency, distance in self.out_dependencies[node]:
+					height = heights[succ] + latency - II * distance
+					if height > heights[node]:
+						heights[node] = height
+						changed = True
+			if not(changed):
+				return heights
+		assert False, f"The heights do not converge with II = {II}, the recurrences have a positive cycle (II < RecMII)"
+
+	# function to get the entry of the reservation table used by a node starting at a time (None if its type is not constrained)
+	def get_table_key(self, node, time, II):
+		node_type = self.cdfg.get_type(node)
+		if not(node_type in self.resource_dict):
+			return None
+		bb = self.cdfg.node_bb[node]
+		if bb in self.loop_bbs:
+			return (bb, node_type, time % II)
+		return (bb, node_type, time)
+
+	"""
+	Schedules the CDFG with a given II by iterative modulo scheduling, it returns True if the scheduling succeeded within its budget
+	@param II: the II of the pipelined scheduling
+	"""
+	def schedule(self, II):
+		assert(self.is_II_feasible(II)) # below RecMII the recurrences have a positive cycle, no II-periodic schedule exists
+		cdfg = self.cdfg
+		heights = self.get_heights(II)
+		start = {} # start time of the scheduled nodes
+		previous_start = {} # last start time of each node, also after its eviction
+		table = {} # scheduled nodes of each entry of the reservation table
+		queue = [ (-heights[node], self.topological_index[node], node) for node in cdfg ]
+		heapq.heapify(queue)
+		budget = self.budget_ratio * len(cdfg)
+		self.steps = 0
+
+		def evict(node):
+			key = self.get_table_key(node, start[node], II)
+			if key != None:
+				table[key].remove(node)
+			del start[node]
+			heapq.heappush(queue, (-heights[node], self.topological_index[node], node))
+
+		while queue and self.steps < budget:
+			node = heapq.heappop(queue)[2]
+			if node in start: # already scheduled (pushed again by an eviction then scheduled from an older entry)
+				continue
+			self.steps += 1
+			earliest = 0
+			for pred, latency, distance in self.in_dependencies[node]:
+				if pred in start:
+					earliest = max(earliest, start[pred] + latency - II * distance)
+			# first time without resource conflict, in II consecutive cycles for the MRT
+			time = None
+			if self.get_table_key(node, earliest, II) == None:
+				time = earliest
+			else:
+				units = self.resource_dict[cdfg.get_type(node)]
+				last = earliest + II - 1 if cdfg.node_bb[node] in self.loop_bbs else math.inf
+				candidate = earliest
+				while candidate <= last:
+					if len(table.get(self.get_table_key(node, candidate, II), [])) < units:
+						time = candidate
+						break
+					candidate += 1
+			if time == None: # no free slot, the node is forced and evicts the conflicting nodes
+				if not(node in previous_start) or earliest > previous_start[node]:
+					time = earliest
+				else:
+					time = previous_start[node] + 1
+				key = self.get_table_key(node, time, II)
+				while len(table[key]) >= self.resource_dict[cdfg.get_type(node)]:
+					evict(table[key][0])
+			# the scheduled nodes whose dependencies with the node are violated are evicted
+			for succ, latency, distance in self.out_dependencies[node]:
+				if succ in start and start[succ] < time + latency - II * distance:
+					evict(succ)
+			for pred, latency, distance in self.in_dependencies[node]:
+				if pred in start and time < start[pred] + latency - II * distance:
+					evict(pred)
+			start[node] = time
+			previous_start[node] = time
+			key = self.get_table_key(node, time, II)
+			if key != None:
+				update_dic_list(table, key, node)
+
+		if len(start) < len(cdfg):
+			self.log.debug(f"II = {II}: the iterative modulo scheduling exhausted its budget of {budget} steps")
+			return False
+		# the solution is written as the one of the ILP
+		for node, time in start.items():
+			cdfg.set_start(node, float(time))
+		self.sched_sol = { f"sv{cdfg.node_names[node]}" : float(time) for node, time in start.items() }
+		self.II = II
+		self.log.debug(f"II = {II}: scheduled in {self.steps} steps")
+		return True
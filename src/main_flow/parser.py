@@ -1,7 +1,7 @@
 import re
 import pygraphviz as pgv
 import logging
-from llvmlite.binding import parse_assembly, get_function_cfg
+from llvmlite.binding import parse_assembly, get_function_cfg, ValueKind, TypeKind
 
 if __name__ == '__main__':
 	print("ERROR - Use option --frontend with the run_SDC.py script to run only the parser")
@@ -10,7 +10,10 @@ if __name__ == '__main__':
 # this imports are relative to SDC main path, so they shouldn't be run if the script run on its own
 from src.utilities.regex import *
 from src.utilities.cdfg_manager import *
+from src.utilities.ilp_manager import artifact_levels
 
+frontend_modes = ["regex", "structured"]
+parser_version = "6" # to be increased whenever the parser output changes, it invalidates the cached outputs
 
 ############################################################################################################################################
 ############################################################################################################################################
@@ -25,26 +28,40 @@ from src.utilities.cdfg_manager import *
 ############################################################################################################################################
 #	ATTRIBUTES:
 #					- ssa_path : path location of the input SSA IR
+#					- frontend : frontend mode ('regex' parses the instruction text, 'structured' uses the llvmlite accessors)
 #					- example_name : name of the input function
 #					- assembly : text of the input SSA IR
 #					- top_function : name of the top function
 #					- function_inputs : inputs of the top function
 #					- cfg : output CFG of the parser
 #					- dic_bbID : dictionary of bb_IDNumber per bbID
-#					- cdfg : output CDFG of the parser
+#					- cdfg : output CDFG of the parser (`CDFG` object, exported to pygraphviz only when drawn)
 #					- dic_nodes : dictionary of nodes per type
+#					- dic_value_names : dictionary of the slot numbers of unnamed values (only with the 'structured' frontend)
+#					- cache : Cache_Manager object storing the parser outputs (None if disabled)
+#					- from_cache : the parser output has been loaded from the cache
+#					- artifacts : artifact level, the CDFG and the CFG are only drawn at level "full"
 #					- log: logger object used to output logs
 ############################################################################################################################################
 #	FUNCTIONS:
 #					- is_valid : check validity of the parser object
+#					- get_cache_key : get the cache key of the parser output
+#					- load_cache : restore the parser output from the cache
+#					- store_cache : store the parser output in the cache
 #					- read_ssa_file : read the SSA IR input file
 # 					- set_top_function : set top_function name
 #					- create_cfg : create control flow graph of the SSA IR input file
 #					- is_backedge : check if the edge is a back edge
 #					- create_cdfg : create CDFG output
 #					- parse_cdfg_instruction : parse instruction from SSA IR to create CDFG nodes and edges
+#					- parse_cdfg_value : parse instruction from the llvmlite accessors to create CDFG nodes and edges
+#					- add_cdfg_instruction : add the node of a parsed instruction with its input nodes and edges
+#					- number_unnamed_values : number the unnamed values of the top function
+#					- get_value_name : get the CDFG name of an instruction or argument
+#					- get_icmp_predicate : get the predicate of an icmp instruction
+#					- get_constant_label : get the label of a constant operand
 #					- create_bb_control_signals : create a control wire between BBs (connecting branch(es) and phi(s) )
-#					- draw_cdfg : represent CDFG in an output file
+#					- draw_cdfg : represent CDFG in an output file (only at artifact level "full")
 #					- get_cdfg : get CDFG output
 #					- get_cfg : get CFG output
 ############################################################################################################################################
@@ -53,18 +70,27 @@ from src.utilities.cdfg_manager import *
 class Parser():
 
 	# it takes as input the ssa_path where the SSA IR is located and the name of the input function
-	def __init__(self, ssa_path, example_name, log=None):
+	def __init__(self, ssa_path, example_name, log=None, frontend='regex', cache=None, artifacts="full"):
 		if log != None:
 			self.log = log
 		else:
 			self.log = logging.getLogger('parser') # if the logger is not given at object generation, create a new one
+		assert(frontend in frontend_modes) # the frontend mode chosen must belong to the allowed ones
+		assert(artifacts in artifact_levels) # the artifact level chosen must belong to the allowed ones
 		self.ssa_path = ssa_path
 		self.example_name = example_name
+		self.frontend = frontend
+		self.cache = cache
+		self.from_cache = False
+		self.artifacts = artifacts
 
+		if self.load_cache(): # on a cache hit, llvmlite is not used at all
+			return
 		self.read_ssa_file(ssa_path) #function to set the parser assembly
 		self.set_top_function(example_name) #it assumes that the filename corresponds to top function
 		self.create_cfg() # it generates the control flow graph
 		self.create_cdfg() # it generates the control data flow graph
+		self.store_cache()
 
 	#function to check validity of the parser
 	def is_valid(self):
@@ -72,6 +98,8 @@ class Parser():
 		if self.ssa_path == None or not(".ll" in self.ssa_path):
 			self.log.error("SSA path is wrong ({0}). Please check the correct path and the correct format (.ll)".format(self.ssa_path))
 			valid = False
+		if self.from_cache: # the assembly and the top function are not read when the parser output comes from the cache
+			return valid
 		if self.assembly == None:
 			self.log.error("Assembly is invalid. You need to call read_ssa_file function at least once")
 			valid = False
@@ -80,6 +108,37 @@ class Parser():
 			valid = False
 		return valid
 
+	#function to get the cache key of the parser output: it depends on the SSA IR content, the parser version, the frontend mode and the top function
+	def get_cache_key(self):
+		with open(self.ssa_path, 'rb') as f:
+			ssa = f.read()
+		return self.cache.get_key(ssa, parser_version, self.frontend, self.example_name)
+
+	#function to restore the parser output from the cache, it returns True on a cache hit
+	def load_cache(self):
+		if self.cache == None:
+			return False
+		self.cache_key = self.get_cache_key()
+		entry = self.cache.load(self.cache_key)
+		if entry == None:
+			return False
+		self.assembly, self.top_function = None, None
+		self.cfg = pgv.AGraph(string=entry['cfg'])
+		self.cdfg = entry['cdfg']
+		self.dic_nodes = entry['dic_nodes']
+		self.dic_bbID = entry['dic_bbID']
+		self.function_inputs = entry['function_inputs']
+		self.from_cache = True
+		self.log.info("Parser output of {0} loaded from the cache".format(self.ssa_path))
+		return True
+
+	#function to store the parser output in the cache
+	def store_cache(self):
+		if self.cache == None:
+			return
+		entry = { 'cfg': self.cfg.string(), 'cdfg': self.cdfg, 'dic_nodes': self.dic_nodes, 'dic_bbID': self.dic_bbID, 'function_inputs': self.function_inputs }
+		self.cache.store(self.cache_key, entry)
+
 	#function to read ssa file and check its validity
 	def read_ssa_file(self, ssa_path):
 
@@ -94,6 +153,10 @@ class Parser():
 		for function in self.assembly.functions:
 			if re.search(top_function_name, function.name):
 				self.top_function = function
+				if self.frontend == 'structured': # inputs are read from the function arguments
+					self.number_unnamed_values()
+					self.function_inputs = [ self.get_value_name(arg) for arg in function.arguments ]
+					continue
 				# finding and setting inputs of function
 				for line in str(function).split("\n"):
 					if "define" in line and top_function_name in line:
@@ -113,154 +176,243 @@ class Parser():
 		self.dic_bbID = dict([ (bb_node.name, bb_IDNum) for bb_IDNum, bb_node in enumerate(self.top_function.blocks) ])
 		init_cfg = pgv.AGraph(get_function_cfg(self.top_function, False)) # obtaining initial cfg from pygraphviz
 		# dictionary with bb_node instance as keys and bb_label as values
-		dic_bbNode_bbLabel = dict([ (bb_node, re.search(r'\{([\w.]+)', bb_node.attr['label']).group(1)) for bb_node in get_cdfg_nodes(init_cfg) ])
+		dic_bbNode_bbLabel = dict([ (bb_node, re.search(r'\{([\w.]+)', bb_node.attr['label']).group(1)) for bb_node in init_cfg.nodes() ])
 		self.cfg = pgv.AGraph() # empty graph
-		for bbNode in get_cdfg_nodes(init_cfg):
+		for bbNode in init_cfg.nodes():
 			label = dic_bbNode_bbLabel[bbNode] # label of bb_node instance
 			idNum = self.dic_bbID[label] # id number of bb_node instance
 			self.cfg.add_node(label, id=idNum, label=f'BB{idNum}\n({label})') # adding node in CFG
-		for bb_edge in get_cdfg_edges(init_cfg): # add each BB edge in the CFG
+		for bb_edge in init_cfg.edges(): # add each BB edge in the CFG
 			bb_src = bb_edge[0]
 			bb_dst = bb_edge[1]
 			self.cfg.add_edge(dic_bbNode_bbLabel[bb_src], dic_bbNode_bbLabel[bb_dst])
 
 	# function to check if the edge is backedge
 	def is_backedge(self, src, dst):
-		src_bbID, dst_bbID = self.cdfg.get_node(src).attr['bbID'], self.cdfg.get_node(dst).attr['bbID'] # retrieve src and dst bbID
-		is_src_not_cst = src.attr['type'] != 'constant' # the src shouldn't be a constant
-		is_dst_phi = dst.attr['type'] == 'phi' # the dst should be a 'phi' type node
-		bbID_cons_order = self.dic_bbID[src_bbID] >= self.dic_bbID[dst_bbID] # the BB id of the src should be the same or later one than the one of dst
+		src_bbID, dst_bbID = self.cdfg.node_bb[src], self.cdfg.node_bb[dst] # retrieve src and dst numeric bbID
+		is_src_not_cst = self.cdfg.get_type(src) != 'constant' # the src shouldn't be a constant
+		is_dst_phi = self.cdfg.get_type(dst) == 'phi' # the dst should be a 'phi' type node
+		bbID_cons_order = src_bbID >= dst_bbID # the BB id of the src should be the same or later one than the one of dst
 		return is_src_not_cst and is_dst_phi and bbID_cons_order
 
 	#function to create the cdfg representation of the assembly code
 	def create_cdfg(self):
 		assert(not(self.top_function is None)) #check that top_function it not None and the set_top_function has been called at least once
-		self.cdfg = pgv.AGraph(strict=False, directed=True)
+		self.cdfg = CDFG()
+		self.cdfg.bb_labels = dict([ (bb_num, bb_name) for bb_name, bb_num in self.dic_bbID.items() ]) # BB clusters are recreated from the bb_labels at export
 		self.dic_nodes = {} # dictionary of nodes per type # format = { "type1" = [a, b, c], ...} where type1 is a node type and a,b,c are labels
 		for basic_block in self.top_function.blocks: #iterate trough basic blocks to generate the cdfg with instructions as nodes
 			for instruction in basic_block.instructions:
-				self.parse_cdfg_instruction(str(instruction), self.cdfg, str(basic_block.name)) # each instruction is instantiated inside the cdfg
+				if self.frontend == 'structured':
+					self.parse_cdfg_value(instruction, self.cdfg, basic_block.name) # each instruction is instantiated from its operands
+				else:
+					self.parse_cdfg_instruction(str(instruction), self.cdfg, str(basic_block.name)) # each instruction is instantiated inside the cdfg
 
 		# get entry BB information
 		entry_bb_label, entry_bb_num = [ (bb_name, bb_num) for bb_name, bb_num in self.dic_bbID.items() if bb_num == 0 ][0]
 		# associate entry BB to each function argument
 		for arg in get_cdfg_nodes(self.cdfg):
-			if arg.attr['type'] == 'argument':
-				arg.attr['bbID'] = entry_bb_label
-				arg.attr['id'] = entry_bb_num
-
-		for bb_id in set([ node.attr['bbID'] for node in get_cdfg_nodes(self.cdfg) if node.attr['bbID'] != '' ]): # iterating through the BB ids to recreate BB graph
-			self.cdfg.add_subgraph([ str(cdfg_node) for cdfg_node in get_cdfg_nodes(self.cdfg) if cdfg_node.attr['bbID'] == bb_id ], name = f'cluster_{bb_id}', color = 'darkgreen', label = bb_id)
-			# associating to each node in the cdfg the corresponding BB id it belongs to
+			if self.cdfg.get_type(arg) == 'argument':
+				self.cdfg.node_bb[arg] = entry_bb_num
 
 		# creating the bb control signals between branch(es) and phi(s)
 		self.create_bb_control_signals()
+		# the cdfg is shared by all the schedulers, each of them modifies its own overlay
+		self.cdfg.freeze()
 
 	# function to parse each instruction
 	def parse_cdfg_instruction(self, instruction, cdfg, bbID):
 		assert type(instruction) == str # the instruction input type should be string
 		operands, result, label = [], '', instruction
-		# iterating through all regex instruction to indentify a candidate instruction
-		for instruction_key, instruction_regex in all_regex_instructions.items():
-			match = re.search(instruction_regex, instruction)
-			if match:
-				# depending on the type of instruction different information extraction are applied
-				# the match groups depend on the regex (see utilities.regex.py for detailed list of regex)
-				# binary intruction case
-				bitwidth = 0 # by default, we assign bitwidth = 0 for all operations
-				# we associate bitwidth of the variable to the operation that produces it
-				if instruction_key in binary_instructions: # instruction format: result = binary_instruction output_type input_1 input_2
-					operands = [ n for n in match.groups() if n != None][-2:]
-					result = match.group(1)
-					if instruction_key == 'icmp':
-						bitwidth = 1 # comparators have boolean output
-						label = 'icmp_' + match.group(2) + ' ' + result # icmp instruction format: result = icmp icmp_type output_type input_1 input_2
-					else:
-						label = instruction_key + ' ' + result
-						bitwidth = re.match(r'(f|i)(\d+)', match.groups()[-3])[2]
-				# unary instruction case
-				elif instruction_key in unary_instructions:
-					if "ext" in instruction_key: # instruction format: result = unary_instruction input_type input to output_type
-						operands = [match.group(3)]
-						result = match.group(1)
-						label = instruction_key + ' ' + result
-						bitwidth = re.match(r'(f|i)(\d+)', match.groups()[-1])[2]
-					elif instruction_key == "fneg": # fneg instruction format: result = fneg output_type input
-						operands = [ n for n in match.groups() if n != None][-1]
-						result = match.group(1)
-						label = instruction_key + ' ' + result
-						bitwidth = re.match(r'(f|i)(\d+)', match.groups()[-1])[2]
-				# memory instruction case
-				elif instruction_key in memory_instructions:
-					if "load" in instruction_key:
-						operands = [ match.group(5) ]
-						result = match.group(1)
-						label = 'load_' + result
-						bitwidth = re.match(r'(f|i)(\d+)', match.groups()[2])[2]
-					elif instruction_key == 'store':
-						operands = match.group(3, 5)
-						result = 'store_' + match.group(5)
-						label = 'store_' + result
-						bitwidth = re.match(r'(f|i)(\d+)', match.groups()[1])[2]
-					elif instruction_key == 'getelementptr':
-						operands = match.group(4, 6)
-						result = match.group(1)
-						label = instruction_key + ' ' + result
-						bitwidth = re.match(r'(f|i)(\d+)', match.groups()[1])[2]
-				# control instruction case
-				elif instruction_key in control_instructions:
-					if instruction_key == 'ret':
-						operands = [match.group(2)]
-						result = f'ret_{bbID}'
-						label = result
-					elif instruction_key == 'br':
-						operands = [match.group(1)]
-						result = f'br_{bbID}'
-						label = result
-					elif instruction_key == 'phi':
-						result = match.group(1)
-						label = instruction_key + ' ' + result
-						input_regex = r'\[(\s)*(\S+)(\s)*,(\s)*(\S+)(\s)*\]' # input format: [value, label]
-						for n in match.groups()[-2:]:
-							if n != None:
-								match_input = re.search(input_regex,n)
-								if match_input != None:
-									operands.append(match_input.group(2))
-						bitwidth = re.match(r'(f|i)(\d+)', match.groups()[9])[2]
+		# the opcode is read once and only the regex of the candidate instruction types sharing it are tried
+		instruction_key, match = match_instruction(instruction)
+		if match:
+			# depending on the type of instruction different information extraction are applied
+			# the match groups depend on the regex (see utilities.regex.py for detailed list of regex)
+			# binary intruction case
+			bitwidth = 0 # by default, we assign bitwidth = 0 for all operations
+			# we associate bitwidth of the variable to the operation that produces it
+			if instruction_key in binary_instructions: # instruction format: result = binary_instruction output_type input_1 input_2
+				operands = [ n for n in match.groups() if n != None][-2:]
+				result = match.group(1)
+				if instruction_key == 'icmp':
+					bitwidth = 1 # comparators have boolean output
+					label = 'icmp_' + match.group(2) + ' ' + result # icmp instruction format: result = icmp icmp_type output_type input_1 input_2
 				else:
-					self.log.error("Identifying instruction '{0}'".format(instruction))
+					label = instruction_key + ' ' + result
+					bitwidth = re.match(r'(f|i)(\d+)', match.groups()[-3])[2]
+			# unary instruction case
+			elif instruction_key in unary_instructions:
+				if "ext" in instruction_key: # instruction format: result = unary_instruction input_type input to output_type
+					operands = [match.group(3)]
+					result = match.group(1)
+					label = instruction_key + ' ' + result
+					bitwidth = re.match(r'(f|i)(\d+)', match.groups()[-1])[2]
+				elif instruction_key == "fneg": # fneg instruction format: result = fneg output_type input
+					operands = [ n for n in match.groups() if n != None][-1]
+					result = match.group(1)
+					label = instruction_key + ' ' + result
+					bitwidth = re.match(r'(f|i)(\d+)', match.groups()[-1])[2]
+			# memory instruction case
+			elif instruction_key in memory_instructions:
+				if "load" in instruction_key:
+					operands = [ match.group(5) ]
+					result = match.group(1)
+					label = 'load_' + result
+					bitwidth = re.match(r'(f|i)(\d+)', match.groups()[2])[2]
+				elif instruction_key == 'store':
+					operands = match.group(3, 5)
+					result = 'store_' + match.group(5)
+					label = 'store_' + result
+					bitwidth = re.match(r'(f|i)(\d+)', match.groups()[1])[2]
+				elif instruction_key == 'getelementptr':
+					operands = match.group(4, 6)
+					result = match.group(1)
+					label = instruction_key + ' ' + result
+					bitwidth = re.match(r'(f|i)(\d+)', match.groups()[1])[2]
+			# control instruction case
+			elif instruction_key in control_instructions:
+				if instruction_key == 'ret':
+					operands = [match.group(2)]
+					result = f'ret_{bbID}'
+					label = result
+				elif instruction_key == 'br':
+					operands = [match.group(1)]
+					result = f'br_{bbID}'
+					label = result
+				elif instruction_key == 'phi':
+					result = match.group(1)
+					label = instruction_key + ' ' + result
+					input_regex = r'\[(\s)*(\S+)(\s)*,(\s)*(\S+)(\s)*\]' # input format: [value, label]
+					for n in match.groups()[-2:]:
+						if n != None:
+							match_input = re.search(input_regex,n)
+							if match_input != None:
+								operands.append(match_input.group(2))
+					bitwidth = re.match(r'(f|i)(\d+)', match.groups()[9])[2]
+			else:
+				self.log.error("Identifying instruction '{0}'".format(instruction))
 
-				self.log.debug(f'The bitwidth of label {label} is {bitwidth}')
+			self.log.debug(f'The bitwidth of label {label} is {bitwidth}')
 
-				# update the dictionary containing the list of nodes per type
-				self.dic_nodes = update_dic_list(self.dic_nodes ,instruction_key, result.replace('%', '_'))
-				break
+			# update the dictionary containing the list of nodes per type
+			self.dic_nodes = update_dic_list(self.dic_nodes ,instruction_key, result.replace('%', '_'))
 
 		result = result.replace('%', '_')
 		constants = [ op for op in operands if '%' not in op ] # constants are operands without initial '%' symbol
 		variables = [ op.replace('%', '_') for op in operands if '%' in op ] # variables are operands with initial '%' symbol
 		if result != '':
-			cdfg.add_node(f'{result}', label = label.replace('%', '_'), id = self.dic_bbID[bbID], bbID = bbID, instruction = instruction.strip(), type=instruction_key, bitwidth=bitwidth) # add node related to the instruction
-			self.log.debug("Added node {0} with input variable {1} and input constant {2}".format(label, variables, constants))
-			for input_ in variables: # add a node for each input variable if not present and the edge connecting it to result
-				if input_ in self.function_inputs:
-					# if the variable is a function input, the bbid is assigned depending on last operation calling it, and we call the type of this variable "argument"
-					#cdfg.add_node(f'{input_}', id = self.dic_bbID[bbID], bbID = bbID, type='argument')
-					cdfg.add_node(f'{input_}', type='argument')
-				else:
-					cdfg.add_node(f'{input_}')
-				cdfg.add_edge(f'{input_}', f'{result}')
-				self.log.debug("Added variable node {0} and edge {0} -> {1}".format(input_, result))
-			for cst_id_, input_ in enumerate(constants): # add a node for each input constant and the edge connecting it to result, each constant should have an unique identifier to distinguish
-				cdfg.add_node(f'cst_{result}_{cst_id_}', id = self.dic_bbID[bbID], bbID = bbID,  type='constant', label=f'{input_}', value=f'{cst_id_}') # TODO: maybe we don't need the bitwidth for constant nodes, even for functional correctness reasons
-				cdfg.add_edge(f'cst_{result}_{cst_id_}', f'{result}')
-				self.log.debug("Added constant node {0} and edge {0} -> {1}".format(input_, result))
+			self.add_cdfg_instruction(cdfg, bbID, instruction_key, result, label.replace('%', '_'), variables, constants, bitwidth, instruction.strip())
+
+	# function to parse each instruction from the structured llvmlite accessors (opcode, operands, type) without going through its text
+	def parse_cdfg_value(self, instruction, cdfg, bbID):
+		instruction_key, opcode = instruction.opcode, instruction.opcode
+		if not(opcode in all_regex_instructions):
+			self.log.debug("Skipping instruction with opcode '{0}'".format(opcode))
+			return
+		operands = [ op for op in instruction.operands if op.value_kind != ValueKind.basic_block ] # branch targets are not data operands
+		result = self.get_value_name(instruction)
+		bitwidth = 0 # by default, we assign bitwidth = 0 for all operations
+		# we associate bitwidth of the variable to the operation that produces it
+		if opcode in binary_instructions:
+			if opcode == 'icmp':
+				bitwidth = 1 # comparators have boolean output
+				label = 'icmp_' + self.get_icmp_predicate(instruction) + ' ' + result
+			else:
+				label = opcode + ' ' + result
+				bitwidth = operands[0].type.type_width
+		elif opcode in unary_instructions:
+			label = opcode + ' ' + result
+			bitwidth = instruction.type.type_width
+		elif opcode == 'load':
+			label = 'load_' + result
+			bitwidth = instruction.type.type_width
+		elif opcode == 'store':
+			result = 'store_' + self.get_value_name(operands[1])
+			label = 'store_' + result
+			bitwidth = operands[0].type.type_width
+		elif opcode == 'getelementptr': # all the indices are kept, the source element type is not exposed with opaque pointers
+			label = opcode + ' ' + result
+		elif opcode == 'ret':
+			result = f'ret_{bbID}'
+			label = result
+		elif opcode == 'br':
+			if len(operands) == 0: # unconditional branch
+				instruction_key, result = 'jmp', ''
+			else:
+				result = f'br_{bbID}'
+				label = result
+		elif opcode == 'phi': # all the incoming values are kept
+			label = opcode + ' ' + result
+			bitwidth = instruction.type.type_width
+
+		self.dic_nodes = update_dic_list(self.dic_nodes, instruction_key, result)
+		if result == '':
+			return
+		self.log.debug(f'The bitwidth of label {label} is {bitwidth}')
+		variables = [ self.get_value_name(op) for op in operands if op.value_kind in (ValueKind.instruction, ValueKind.argument) ]
+		constants = [ self.get_constant_label(op) for op in operands if not(op.value_kind in (ValueKind.instruction, ValueKind.argument)) ]
+		self.add_cdfg_instruction(cdfg, bbID, instruction_key, result, label, variables, constants, bitwidth)
+
+	# function to add the node of a parsed instruction, its input variables and constants, and the edges connecting them
+	def add_cdfg_instruction(self, cdfg, bbID, instruction_key, result, label, variables, constants, bitwidth, instruction=None):
+		if instruction != None:
+			result_node = cdfg.add_node(f'{result}', type=instruction_key, bb=self.dic_bbID[bbID], bitwidth=bitwidth, label = label, instruction = instruction) # add node related to the instruction
+		else:
+			result_node = cdfg.add_node(f'{result}', type=instruction_key, bb=self.dic_bbID[bbID], bitwidth=bitwidth, label = label)
+		self.log.debug("Added node {0} with input variable {1} and input constant {2}".format(label, variables, constants))
+		for input_ in variables: # add a node for each input variable if not present and the edge connecting it to result
+			if input_ in self.function_inputs:
+				# if the variable is a function input, the bbid is assigned depending on last operation calling it, and we call the type of this variable "argument"
+				input_node = cdfg.add_node(f'{input_}', type='argument')
+			else:
+				input_node = cdfg.add_node(f'{input_}')
+			cdfg.add_edge(input_node, result_node)
+			self.log.debug("Added variable node {0} and edge {0} -> {1}".format(input_, result))
+		for cst_id_, input_ in enumerate(constants): # add a node for each input constant and the edge connecting it to result, each constant should have an unique identifier to distinguish
+			input_node = cdfg.add_node(f'cst_{result}_{cst_id_}', type='constant', bb=self.dic_bbID[bbID], label=f'{input_}', value=f'{cst_id_}') # TODO: maybe we don't need the bitwidth for constant nodes, even for functional correctness reasons
+			cdfg.add_edge(input_node, result_node)
+			self.log.debug("Added constant node {0} and edge {0} -> {1}".format(input_, result))
+
+	# function to number the unnamed values of the top function as LLVM does when printing it (arguments, then BBs and their instructions)
+	def number_unnamed_values(self):
+		self.dic_value_names = {}
+		slot = 0
+		for arg in self.top_function.arguments:
+			if arg.name == '':
+				self.dic_value_names[arg] = str(slot)
+				slot += 1
+		for basic_block in self.top_function.blocks:
+			if basic_block.name == '':
+				slot += 1
+			for instruction in basic_block.instructions:
+				if instruction.name == '' and instruction.type.type_kind != TypeKind.void:
+					self.dic_value_names[instruction] = str(slot)
+					slot += 1
+
+	# function to get the CDFG name of an instruction or argument (the same as its SSA name with '%' replaced by '_')
+	def get_value_name(self, value):
+		if value.name != '':
+			return '_' + value.name
+		return '_' + self.dic_value_names.get(value, '')
+
+	# function to get the predicate of an icmp instruction, the only field not exposed by the llvmlite accessors
+	def get_icmp_predicate(self, instruction):
+		return str(instruction).split(None, 4)[3] # instruction format: result = icmp icmp_type output_type input_1 input_2
+
+	# function to get the label of a constant operand
+	def get_constant_label(self, value):
+		if value.value_kind in (ValueKind.global_variable, ValueKind.function, ValueKind.global_alias):
+			return '@' + value.name
+		if value.value_kind in (ValueKind.constant_int, ValueKind.constant_fp):
+			return str(value.get_constant_value())
+		return value.value_kind.name
 
 	# function to connect branch(es) with phi(s)
 	def create_bb_control_signals(self):
 		assert(self.dic_nodes != None) # check that the nodes dictionary has been already created
 		if not("br" in self.dic_nodes) or not("phi" in self.dic_nodes): # check that phi(s) and branch(es) have been already included
-			assert len(list(get_cdfg_nodes(self.cfg))) == 1, "Branch(es) and Phi(s) should be present if there are multiple BBs"
+			assert len(self.cfg) == 1, "Branch(es) and Phi(s) should be present if there are multiple BBs"
 			return
 
 		# branch_nodes_list = self.dic_nodes["br"]
@@ -272,14 +424,17 @@ class Parser():
 		# 		if branch_node.attr['bbID'] == phi_node.attr['bbID']:
 		# 			self.cdfg = create_control_edge(self.cdfg, branch_node, phi_node)
 		for e in get_cdfg_edges(self.cdfg):
-			if self.is_backedge(e[0], e[1]):
-				e.attr['style'] = 'dashed'
+			if self.is_backedge(self.cdfg.edge_src[e], self.cdfg.edge_dst[e]):
+				self.cdfg.set_edge_kind(e, EDGE_BACK)
 
 	#function to draw cdfg function representation of the ssa input file
 	def draw_cdfg(self, output_file = 'test.pdf', layout = 'dot'):
 		assert(not(self.cdfg is None))
-		self.cdfg.draw(output_file, prog=layout) # drawing cdfg in the .pdf file
-		self.cdfg.write(output_file.replace('.pdf', '.dot')) # describing cdfg in dot file
+		if self.artifacts != "full":
+			return
+		cdfg = self.cdfg.to_agraph() # pygraphviz is only used to export the cdfg
+		cdfg.draw(output_file, prog=layout) # drawing cdfg in the .pdf file
+		cdfg.write(output_file.replace('.pdf', '.dot')) # describing cdfg in dot file
 		self.log.info("Printed cdfg in file {0} with layout {1}. Its dot representation is in file {2}".format(output_file, layout, output_file.replace('.pdf','.dot')))
 		cfg_filename = output_file.replace('.pdf', '.cfg.pdf')
 		self.cfg.draw(cfg_filename, prog=layout) # drawing cfg in the .pdf file
@@ -1,5 +1,6 @@
 from src.utilities.ilp_manager import *
 from src.utilities.cdfg_manager import *
+import numpy as np
 import logging
 
 ############################################################################################################################################
@@ -15,17 +16,40 @@ import logging
 #					- ilp : ILP problem of the class ILP
 #					- constraint_set : set of constraints of the class CONSTRAINT_SET
 #					- obj_function : optimization function of the class Obj_Function
+#					- modulo_constraints : numbers of the constraints of the modulo reservation table (MRT) of the current II
+#					- modulo_variables : names of the variables of the modulo reservation table (MRT) of the current II
+#					- modulo_slots : number of slots of the MRT in the ILP (the slots from the current II on are fixed to 0), and its resource dictionary
+#					- modulo_time_rows : number of the constraint `sv = II * it + sum(slot * mrt_slot)` of each operation of the MRT
 #					- log: logger object used to output logs
 ############################################################################################################################################
 #	FUNCTIONS:
 # 					- add_resource_constraints : setting up the maximum resource usage per res type in the constraint set
-#					- add_resource_constraints_pipelined : add resources constraints for pipelined scheduling
+#					- add_resource_constraints_time_indexed : add the exact time-indexed resource constraints (a unit is busy until the completion of its
+#					  operation), within the ASAP/ALAP window of each operation
+#					- add_constraint_rows : add a block of constraints given as rows of terms
+#					- add_resource_constraints_pipelined : add the modulo reservation table (MRT) of the loop BBs for pipelined scheduling
+#					- set_modulo_II : change the II of the modulo reservation table (MRT) in place
+#					- remove_resource_constraints_pipelined : remove the modulo reservation table (MRT) of the previous II
+#					- check_resource_constraints_pipelined : check the modulo reservation table (MRT) of a pipelined scheduling solution
 #					- check_resource_dict : validate values in resource dict
 ############################################################################################################################################
 ############################################################################################################################################
 
 allowed_resources = ["load", "add", "mul", "div", "zext"]
 
+# function to compute the resource-constrained minimum II (ResMII): in each loop BB, the operations of a resource type share its units
+def get_res_mii(cdfg, resource_dict):
+	res_mii = 0
+	loop_bbs = get_loop_bbs(cdfg)
+	usage = {}
+	for node in cdfg:
+		node_type = cdfg.get_type(node)
+		if cdfg.node_bb[node] in loop_bbs and node_type in resource_dict:
+			usage[(cdfg.node_bb[node], node_type)] = usage.get((cdfg.node_bb[node], node_type), 0) + 1
+	for (bb, node_type), count in usage.items():
+		res_mii = max(res_mii, -(-count // resource_dict[node_type])) # ceil(count / units)
+	return res_mii
+
 class Resource_Manager:
 	def __init__(self, parser, ilp_dependency_inj, log=None, ):
 		assert(parser != None) # ensure Parser is different from None
@@ -36,57 +60,68 @@ class Resource_Manager:
 			self.log = log
 		else:
 			self.log = logging.getLogger('resource') # if the logger is not given at object generation, create a new one
-		
+		self.modulo_constraints = range(0)
+		self.modulo_variables = []
+		self.modulo_slots = (0, None)
+		self.modulo_time_rows = {}
+
 		ilp_dependency_inj(self)
 
 	"""
-	Adds scheduling ILP created by the Scheduler must be passed to the Resources
+	Adds scheduling ILP created by the Scheduler must be passed to the Resources, together with the CDFG overlay of the Scheduler (containing the supersources)
 	"""
-	def set_scheduling_ilp(self, ilp, constraints, obj_fun):
+	def set_scheduling_ilp(self, ilp, constraints, obj_fun, cdfg=None):
 		self.ilp = ilp
 		self.constraints = constraints
 		self.obj_fun = obj_fun
+		if cdfg != None:
+			self.cdfg = cdfg
 
 
 	"""
 	Adds constraints to the constraint set that enforce the resource constraints contained in the resource dictionary
+	@param bbs: numeric ids of the BBs to constrain (all the BBs by default)
 	"""
-	def add_resource_constraints(self, resource_dict):
+	def add_resource_constraints(self, resource_dict, bbs=None):
 		self.check_resource_dict(resource_dict) # dict e.g.: {'add': 1, 'mul': 1, 'zext': 1}
 
 		print(f"resource constraints are: {resource_dict}")
 
-		instructions = get_topological_order(self.cdfg) #TODO might need to sort this
+		cdfg = self.cdfg
+		bb_instructions = get_bb_topological_orders(cdfg) # topological order of the instructions of each BB
+		chain_constraints = [] # (nodeA, nodeB, c) for each constraint svB - svA >= c
 
 		for bb in self.cfg: # only need to check within each BB
-			BBID = bb.attr["id"]
-			ordered_instructions = list()
-
-			for instr in instructions: # ugly fix to sort instructions
-				try: # get_edge() fails if no edge, i.e. instr is not connected to a supersource -> add to the back
-					self.cdfg.get_edge(f"ssrc_{BBID}", instr)
-					ordered_instructions = [instr] + ordered_instructions
-					self.log.debug(f"found edge ssrc_{BBID} to {instr}")
-				except: # add instr which is connected to supersource to the front
-					ordered_instructions = ordered_instructions + [instr]
-					self.log.debug(f"no edge to {instr}")
+			BBID = int(bb.attr["id"])
+			if bbs != None and not(BBID in bbs):
+				continue
+			supersource = cdfg.get_id(f"ssrc_{BBID}")
+			front_instructions, back_instructions = list(), list()
+
+			for instr in bb_instructions.get(BBID, []): # ugly fix to sort instructions
+				if cdfg.has_edge(supersource, instr): # add instr which is connected to supersource to the front
+					front_instructions.append(instr)
+					self.log.debug(f"found edge ssrc_{BBID} to {cdfg.node_names[instr]}")
+				else: # instr is not connected to a supersource -> add to the back
+					back_instructions.append(instr)
+					self.log.debug(f"no edge to {cdfg.node_names[instr]}")
+			ordered_instructions = front_instructions[::-1] + back_instructions # the last instr connected to the supersource comes first
 
 			# dict containing the ordered nodes of each constrained resource
 			constrained_instructions = {instr_type: [] for instr_type in resource_dict.keys()}
 			for instruction in ordered_instructions:
-				instr_type = instruction.attr["type"]
-				if instruction.attr["id"] != BBID: continue # skip if not in current BB
+				instr_type = cdfg.get_type(instruction)
 				if instr_type not in constrained_instructions.keys(): continue # not resource constrained
 
 				#self.log.debug(f"instruction {instruction} has type {instr_type}")
 
-				constrained_instructions[instr_type] = constrained_instructions[instr_type] + [instruction]
+				constrained_instructions[instr_type].append(instruction)
 
-			self.log.debug(f"constrained instructions for BB{BBID} are: {constrained_instructions}")
+			self.log.debug(f"constrained instructions for BB{BBID} are: { {instr_type: [cdfg.node_names[n] for n in nodes] for instr_type, nodes in constrained_instructions.items()} }")
 
 			# add constraint for each constrained resource
 			for instr_type, nodes in constrained_instructions.items():
-				last_timestep_node = f"ssrc_{BBID}"
+				last_timestep_node = supersource
 				current_timestep_node = None
 				resource_load = 0
 				operation_block = 0
@@ -97,13 +132,20 @@ class Resource_Manager:
 						operation_block += 1
 					current_timestep_node = node
 					resource_load += 1
-					if "ssrc" in last_timestep_node: # ssrc doesn't have any latency -> need to add different constraint
-						self.constraints.add_constraint({f"sv{last_timestep_node}": -1, f"sv{node}": 1}, "geq", 0)
-						self.log.debug(f"adding constraint sv{node} - sv{last_timestep_node} >= 0")
+					last_name, node_name = cdfg.node_names[last_timestep_node], cdfg.node_names[node]
+					if last_timestep_node == supersource: # ssrc doesn't have any latency -> need to add different constraint
+						chain_constraints.append((last_timestep_node, node, 0))
+						self.log.debug(f"adding constraint sv{node_name} - sv{last_name} >= 0")
 					else:
-						self.constraints.add_constraint({f"sv{last_timestep_node}": -1, f"sv{node}": 1}, "geq", get_node_latency(node.attr))
-						self.log.debug(f"adding constraint sv{node} - sv{last_timestep_node} >= {get_node_latency(node.attr)}")
-					
+						chain_constraints.append((last_timestep_node, node, cdfg.node_latency[node]))
+						self.log.debug(f"adding constraint sv{node_name} - sv{last_name} >= {cdfg.node_latency[node]}")
+
+		# all the constraints svB - svA >= c of the chains are added at once
+		var_columns = self.ilp.get_variable_columns()
+		columns = [ (var_columns[f"sv{cdfg.node_names[nodeA]}"], var_columns[f"sv{cdfg.node_names[nodeB]}"]) for nodeA, nodeB, _ in chain_constraints ]
+		rows = np.repeat(np.arange(len(chain_constraints)), 2)
+		coeffs = np.tile([-1, 1], len(chain_constraints))
+		self.constraints.add_constraints(rows, np.array(columns, dtype=np.int64).ravel(), coeffs, "geq", [ c for _, _, c in chain_constraints ])
 		"""
 		given a resource R constrained with C:
 		start first C operations as early as possible
@@ -118,8 +160,141 @@ class Resource_Manager:
 
 		#quit()
 
+	"""
+	Adds the modulo reservation table (MRT) of the loop BBs to the constraint set, so that the pipelined scheduling ILP only has resource feasible
+	solutions: each constrained operation of a loop BB has the start time `sv = II * it + sum(slot * mrt_slot)`, with a single binary `mrt_slot` set,
+	and the operations of a resource type in a same slot do not exceed its units. If the MRT of the previous II has enough slots, it is changed in
+	place (see `set_modulo_II`) so that the solver model is kept, otherwise it is replaced
+	@param resource_dict: the resource dictionary, e.g. {'add': 1, 'mul': 1, 'zext': 1}
+	@param II: the II of the pipelined scheduling ILP
+	"""
+	def add_resource_constraints_pipelined(self, resource_dict, II):
+		self.check_resource_dict(resource_dict)
+		if II <= self.modulo_slots[0] and resource_dict == self.modulo_slots[1]:
+			self.set_modulo_II(II)
+			return
+		self.remove_resource_constraints_pipelined()
+
+		cdfg = self.cdfg
+		loop_bbs = get_loop_bbs(cdfg)
+		nodes = [ node for node in cdfg if cdfg.node_bb[node] in loop_bbs and cdfg.get_type(node) in resource_dict ]
+		for node in nodes:
+			node_name = cdfg.node_names[node]
+			self.modulo_variables.append(f"it{node_name}") # iteration of the start time
+			self.ilp.add_variable(f"it{node_name}", 0, None, 'i')
+			for slot in range(II):
+				self.modulo_variables.append(f"mrt{node_name}_{slot}") # the start time is in this slot of the MRT
+				self.ilp.add_variable(f"mrt{node_name}_{slot}", 0, 1, 'b')
+
+		constraint_rows = []
+		slot_usage = {} # MRT slot variables of each (BB, resource type, slot)
+		for node in nodes:
+			node_name = cdfg.node_names[node]
+			self.modulo_time_rows[node_name] = len(constraint_rows)
+			constraint_rows.append(([(f"sv{node_name}", 1), (f"it{node_name}", -II)] + [ (f"mrt{node_name}_{slot}", -slot) for slot in range(1, II) ], "eq", 0))
+			constraint_rows.append(([ (f"mrt{node_name}_{slot}", 1) for slot in range(II) ], "eq", 1))
+			for slot in range(II):
+				update_dic_list(slot_usage, (cdfg.node_bb[node], cdfg.get_type(node), slot), f"mrt{node_name}_{slot}")
+		for (bb, node_type, slot), var_names in slot_usage.items():
+			if len(var_names) > resource_dict[node_type]:
+				constraint_rows.append(([ (var_name, 1) for var_name in var_names ], "leq", resource_dict[node_type]))
+		self.modulo_constraints = self.add_constraint_rows(constraint_rows)
+		self.modulo_time_rows = { node_name : self.modulo_constraints[row] for node_name, row in self.modulo_time_rows.items() }
+		self.modulo_slots = (II, dict(resource_dict))
+		self.log.debug(f"MRT of II = {II}: {len(nodes)} operation(s), {len(constraint_rows)} constraint(s)")
+
+	# function to change the II of the MRT in place, it should not exceed its number of slots: only the coefficient of the iteration variables
+	# and the bounds of the slot variables change (the slots from II on are fixed to 0), so the solver model does not have to be rebuilt
+	def set_modulo_II(self, II):
+		assert(II <= self.modulo_slots[0]) # the MRT should have a slot per cycle of the II
+		for node_name, number in self.modulo_time_rows.items():
+			self.constraints.set_coefficient(f"c{number}", f"it{node_name}", -II)
+			for slot in range(self.modulo_slots[0]):
+				self.ilp.get_variable(f"mrt{node_name}_{slot}").upBound = 1 if slot < II else 0
+		self.log.debug(f"MRT of II = {II}: {len(self.modulo_time_rows)} operation(s), in place in the MRT of {self.modulo_slots[0]} slot(s)")
+
+	# function to add constraints given as (terms, disequality sign, right coefficient) rows, the terms being (variable name, coefficient) pairs
+	# they are added as a single block, whose range of constraint numbers is returned
+	def add_constraint_rows(self, constraint_rows):
+		var_columns = self.ilp.get_variable_columns()
+		rows, cols, coeffs = [], [], []
+		for row, (terms, _, _) in enumerate(constraint_rows):
+			for var_name, coeff in terms:
+				rows.append(row)
+				cols.append(var_columns[var_name])
+				coeffs.append(coeff)
+		signs = [ disequality_signs[sign] for _, sign, _ in constraint_rows ]
+		return self.constraints.add_constraints(rows, cols, coeffs, signs, [ right_constant for _, _, right_constant in constraint_rows ])
+
+	"""
+	Adds the exact time-indexed resource constraints to the constraint set: each constrained operation has a binary variable per start time of
+	its window [ASAP, ALAP], exactly one is set and gives its sv, and in each cycle of each BB the operations of a resource type in progress do not
+	exceed its units: as in `add_resource_constraints`, a unit is busy until the completion of its operation, so an operation of latency L uses it
+	in cycle t if it starts in (t - L, t]. The windows come from unconstrained ASAP and ALAP schedulings, the ALAP one with a latency upper bound of each BB (e.g. of
+	a list scheduling), so the number of variables only grows with the mobility of the operations. The identical operations (same BB, type,
+	predecessors and successors) are ordered to break the symmetries
+	@param resource_dict: the resource dictionary, e.g. {'add': 1, 'mul': 1, 'zext': 1}
+	@param asap_svs: solution of the ASAP scheduling (dictionary of value per sv variable name)
+	@param alap_svs: solution of the ALAP scheduling with the latency upper bounds
+	"""
+	def add_resource_constraints_time_indexed(self, resource_dict, asap_svs, alap_svs):
+		self.check_resource_dict(resource_dict)
+
+		cdfg = self.cdfg
+		nodes = [ node for node in cdfg if cdfg.get_type(node) in resource_dict ]
+		windows = {}
+		for node in nodes:
+			node_name = cdfg.node_names[node]
+			windows[node] = range(int(asap_svs[f"sv{node_name}"]), int(alap_svs[f"sv{node_name}"]) + 1)
+			assert(len(windows[node]) > 0) # the ALAP time of a node cannot be before its ASAP time
+			for time in windows[node]:
+				self.ilp.add_variable(f"x{node_name}_{time}", 0, 1, 'b') # the node starts at this time
+
+		constraint_rows = []
+		cycle_usage = {} # start time variables of the operations in progress in each (BB, resource type, cycle)
+		for node in nodes:
+			node_name = cdfg.node_names[node]
+			constraint_rows.append(([(f"sv{node_name}", 1)] + [ (f"x{node_name}_{time}", -time) for time in windows[node] if time != 0 ], "eq", 0))
+			constraint_rows.append(([ (f"x{node_name}_{time}", 1) for time in windows[node] ], "eq", 1))
+			for time in windows[node]:
+				for cycle in range(time, time + cdfg.node_latency[node]): # the operation starting at `time` uses a unit until its completion
+					update_dic_list(cycle_usage, (cdfg.node_bb[node], cdfg.get_type(node), cycle), f"x{node_name}_{time}")
+		for (bb, node_type, time), var_names in cycle_usage.items():
+			if len(var_names) > resource_dict[node_type]:
+				constraint_rows.append(([ (var_name, 1) for var_name in var_names ], "leq", resource_dict[node_type]))
+		# symmetry breaking: identical operations start in the order of their ids
+		identical_nodes = {}
+		for node in nodes:
+			dag_edges = lambda edges : frozenset([ e for e in edges if cdfg.edge_kind[e] != EDGE_BACK ])
+			preds = frozenset([ cdfg.edge_src[e] for e in dag_edges(cdfg.in_edges(node)) ])
+			succs = frozenset([ cdfg.edge_dst[e] for e in dag_edges(cdfg.out_edges(node)) ])
+			update_dic_list(identical_nodes, (cdfg.node_bb[node], cdfg.get_type(node), preds, succs), node)
+		for group in identical_nodes.values():
+			for nodeA, nodeB in zip(group, group[1:]):
+				constraint_rows.append(([(f"sv{cdfg.node_names[nodeA]}", 1), (f"sv{cdfg.node_names[nodeB]}", -1)], "leq", 0))
+		self.add_constraint_rows(constraint_rows)
+
+		# size of the formulation, compared to start time variables over the whole latency of each BB
+		bb_latency = {}
+		for node in cdfg:
+			bb_latency[cdfg.node_bb[node]] = max(bb_latency.get(cdfg.node_bb[node], 0), int(alap_svs[f"sv{cdfg.node_names[node]}"]))
+		num_variables = sum([ len(window) for window in windows.values() ])
+		self.log.info(f"Time-indexed resource constraints: {num_variables} start time variable(s) ({sum([ bb_latency[cdfg.node_bb[node]] + 1 for node in nodes ])} without the windows), {len(constraint_rows)} constraint(s)")
+
+	# function to remove the modulo reservation table (MRT) of the previous II, its constraints and its variables (the solver model is then rebuilt)
+	def remove_resource_constraints_pipelined(self):
+		for number in self.modulo_constraints:
+			self.constraints.remove_constraint(f"c{number}")
+		for var_name in self.modulo_variables:
+			self.ilp.remove_variable(var_name)
+		self.modulo_constraints = range(0)
+		self.modulo_variables = []
+		self.modulo_slots = (0, None)
+		self.modulo_time_rows = {}
+
 	'''
 	return true if MRT construction succeeds, else false
+	the MRT of each loop BB is checked, the other BBs are not pipelined
 	'''
 	def check_resource_constraints_pipelined(self, resource_dict, II):
 		self.check_resource_dict(resource_dict)
@@ -128,14 +303,17 @@ class Resource_Manager:
 		#self.log.error("The check_resource_constraints_pipelined member function in src/main_flow/resources.py has not yet been implemented")
 		#self.log.info("Exiting early due to an unimplemented function")
 
+		loop_bbs = get_loop_bbs(self.cdfg)
 		MRT_dictionary = dict()
 		for node in self.cdfg:
-			node_timing = self.ilp.get_operation_timing_solution(node)
-			column_index = int(node_timing % II)
+			if not(self.cdfg.node_bb[node] in loop_bbs) or not(self.cdfg.get_type(node) in resource_dict): # only the constrained types use the MRT (the other nodes may be folded out of the ILP)
+				continue
+			node_timing = self.ilp.get_operation_timing_solution(self.cdfg.node_names[node])
+			column_index = (self.cdfg.node_bb[node], int(node_timing % II))
 			if column_index in MRT_dictionary.keys():
-				MRT_dictionary[column_index] = MRT_dictionary[column_index] + [node.attr["type"]]
+				MRT_dictionary[column_index] = MRT_dictionary[column_index] + [self.cdfg.get_type(node)]
 			else:
-				MRT_dictionary[column_index] = [node.attr["type"]]
+				MRT_dictionary[column_index] = [self.cdfg.get_type(node)]
 
 		self.log.debug(f"checking {MRT_dictionary} with {resource_dict}")
 
@@ -1,6 +1,7 @@
 from src.utilities.ilp_manager import *
 from src.utilities.cdfg_manager import *
 import matplotlib.pyplot as plt
+import numpy as np
 import re
 import logging
 
@@ -24,57 +25,99 @@ def sqrt(n):
 ############################################################################################################################################
 #	ATTRIBUTES:
 #					- parser : parser used to generate CDFG after parsing SSA IR
-#					- cdfg : CDFG representation of the SSA IR input
+#					- cdfg : CDFG representation of the SSA IR input (overlay of the CDFG of the parser)
 #					- cfg : CFG representation of the SSA IR input
 #					- sched_tech : scheduling technique selected
 #					- sched_sol : scheduling solution
-#					- ilp: ilp object
-#					- constraints: constraints object
-#					- obj_fun: optmization function object
+#					- ilp: ilp object (None if the scheduler builds no ILP, e.g. the heuristic schedulers)
+#					- constraints: constraints object (None without ILP)
+#					- obj_fun: optmization function object (None without ILP)
 #					- II : Initiation Interval achieved by scheduling solution
+#					- pipelining_constraints : ids of the inter-iteration constraints and latency of their source node (the II is in their right coefficients)
+#					- rec_mii : recurrence-constrained minimum II of the CDFG (computed when the II is checked)
+#					- presolve_bounds : True to tighten the bounds of the scheduling variables before solving the ILP (see `presolve`)
+#					- original_bounds : bounds of the scheduling variables before the first presolve
+#					- dropped_constraints : number of difference constraints dropped by the presolves
+#					- presolve_reduction : True to remove the redundant difference constraints before solving the ILP (see `reduce_constraints`)
+#					- reduced_constraints : number of redundant difference constraints removed by the reductions
+#					- reduction_rows : difference constraints kept by the last reduction, as a set of (number, right coefficient), the next reduction is
+#					  skipped if they are unchanged (e.g. only the II changed)
+#					- folded_nodes : nodes without variable in the ILP, their sv is the sv of an anchor node plus an offset, as {node: (anchor, offset)}
+#					- workers : number of processes solving the independent components of the ILP (one per BB), 1 to solve the ILP at once
+#					- optimal : True if the last solution of the ILP is proven optimal (False if the solver was stopped by its time limit)
+#					- artifacts : artifact level ("none": no file, "summary": only the scheduling summary, "full": also the drawings, the ILP and the gantt charts)
 #					- log: logger object used to output logs
 ############################################################################################################################################
 #	FUNCTIONS:
 #					- set_sched_technique : set scheduling technique
 #					- add_artificial_nodes : create super nodes
+#					- fold_nodes : fold the constants, arguments and branches into the sv of a neighbour node, before the ILP is built
+#					- get_folded_solution : get the sv of the folded nodes from the solution of the ILP
 #					- set_data_dependency_constraints: setting the data dependency constraints
 #					- set_max_latency_constraints: setting the initialization interval to the value II_value
 #					- add_sink_delays_constraints : add sink delays constraints
 #					- set_obj_function: setting the optimiztion function, according to the optimization option
+#					- add_objective_coefficient : add the objective coefficient of a node to its variable, or to the one of its anchor if it is folded
 #					- create_scheduling_ilp : create the ILP of the scheduling
+#					- set_II : change the II of the pipelined scheduling ILP
+#					- is_II_feasible : check on the CDFG if an II can be feasible
+#					- reduce_constraints : remove the duplicated difference constraints, and the ones implied by a longer path of constraints
+#					- presolve : tighten the bounds of the scheduling variables to the ASAP and ALAP times, and drop the constraints of the fixed nodes
+#					- set_solver_limits : set the time limit and the relative MIP gap of the solver
 #					- solve_scheduling_ilp: solve the ilp and obtain scheduling
 #					- get_sink_delays: get delays of sinks after computing solution
-#					- print_gantt_chart : prints the gantt chart of a scheduling solution
-#					- print_scheduling_summary: it prints the start time of each node into a txt report. If the loop is pipelined, it also prints the achieved II.
+#					- print_gantt_chart : prints the gantt chart of a scheduling solution (only at artifact level "full")
+#					- print_scheduling_summary: it prints the start time of each node into a txt report. If the loop is pipelined, it also prints the achieved II (not at artifact level "none").
 ############################################################################################################################################
 ############################################################################################################################################
 
 
 scheduling_techniques = ["asap", "alap", "pipelined"]
+foldable_types = ["constant", "argument", "br"] # types of the nodes that are not scheduling-relevant, they can be folded out of the ILP
 
 class Scheduler:
 
-	# initialization of the scheduler with the parser
-	def __init__(self, parser, sched_technique, log=None):
+	# initialization of the scheduler with the parser, build_ilp False for the schedulers that do not use a solver (no ILP nor folded nodes)
+	def __init__(self, parser, sched_technique, log=None, solver="PULP_CBC_CMD", artifacts="full", workers=1, compaction=True, build_ilp=True):
 		if log != None:
 			self.log = log
 		else:
 			self.log = logging.getLogger('scheduler') # if the logger is not given at object generation, create a new one
+		assert(artifacts in artifact_levels) # the artifact level chosen must belong to the allowed ones
+		assert(workers >= 1) # at least one process solves the ILP
+		self.artifacts = artifacts
+		self.workers = workers
+		self.optimal = None
 		self.parser = parser
-		self.cdfg = parser.get_cdfg()
+		self.cdfg = parser.get_cdfg().overlay() # the cdfg of the parser is shared, artificial nodes and solutions are only added to this overlay
 		self.cfg = parser.get_cfg()
 		self.add_artificial_nodes() # adding supersource and supersinks to the cdfg
 		self.set_sched_technique(sched_technique)
 		self.sched_sol = None
 		self.II = None
+		self.pipelining_constraints = None
+		self.rec_mii = None
+		self.presolve_bounds = True
+		self.original_bounds = None
+		self.dropped_constraints = 0
+		self.presolve_reduction = True
+		self.reduced_constraints = 0
+		self.reduction_rows = None
+		self.folded_nodes = {}
+		if not(build_ilp): # the scheduler does not use a solver, only its CDFG overlay
+			self.ilp, self.constraints, self.obj_fun = None, None, None
+		else:
+			if compaction:
+				self.fold_nodes() # the folded nodes get no variable in the ILP
 
-		# set solver options
-		self.ilp = ILP(log=log)
-		self.constraints = Constraint_Set(self.ilp, log=log)
-		self.obj_fun = Obj_Function(self.ilp, log=log)
+			# set solver options
+			self.ilp = ILP(solver=solver, log=log, artifacts=artifacts)
+			self.ilp.technique = self.sched_tech
+			self.constraints = Constraint_Set(self.ilp, log=log)
+			self.obj_fun = Obj_Function(self.ilp, log=log)
 
-		# define ilp variable per each node
-		self.add_nodes_to_ilp()
+			# define ilp variable per each node
+			self.add_nodes_to_ilp()
 		pass
 	
 	"""
@@ -85,36 +128,78 @@ class Scheduler:
 		#self.log.error("The add_artificial_nodes member function in src/main_flow/scheduler.py has not yet been implemented")
 		#self.log.info("Exiting early due to an unimplemented function")
 
+		supersources, supersinks = {}, {}
 		for bb in self.cfg:
-			numbericBBID = bb.attr["id"]
-			bbLabel = bb.attr["label"]
+			numbericBBID = int(bb.attr["id"])
 
 			supersource_name = f"ssrc_{numbericBBID}"
 			supersink_name = f"ssink_{numbericBBID}"
 
-			self.cdfg.add_node(supersource_name, id=numbericBBID, bbID=bbLabel, type="supersource", label=supersource_name)
-			self.cdfg.add_node(supersink_name, id=numbericBBID, bbID=bbLabel, type="supersink", label=supersink_name)
+			supersources[numbericBBID] = self.cdfg.add_node(supersource_name, type="supersource", bb=numbericBBID, label=supersource_name)
+			supersinks[numbericBBID] = self.cdfg.add_node(supersink_name, type="supersink", bb=numbericBBID, label=supersink_name)
 
-		for node in self.cdfg:
+		cdfg = self.cdfg
+		new_edges = []
+		for node in cdfg.nodes():
 			# ignore supersource and -sink
-			if node.attr["type"] in ["supersource", "supersink"]: continue
-			# only check in same BB
-			preds = [pred for pred in self.cdfg.in_neighbors(node) if pred.attr["id"] == node.attr["id"]]
-			succs = [succ for succ in self.cdfg.out_neighbors(node) if succ.attr["id"] == node.attr["id"]]
-			if len([pred for pred in preds if self.cdfg.get_edge(pred, node).attr["style"] != "dashed"]) == 0:
+			if cdfg.get_type(node) in ["supersource", "supersink"]: continue
+			node_bb = cdfg.node_bb[node]
+			# only check non-dashed edges in same BB
+			preds = [e for e in cdfg.in_edges(node) if cdfg.node_bb[cdfg.edge_src[e]] == node_bb and cdfg.edge_kind[e] != EDGE_BACK]
+			succs = [e for e in cdfg.out_edges(node) if cdfg.node_bb[cdfg.edge_dst[e]] == node_bb and cdfg.edge_kind[e] != EDGE_BACK]
+			if len(preds) == 0:
 				# node has no predecessors -> needs to be connected
-				self.cdfg.add_edge(f"ssrc_{node.attr['id']}", node)
-			if len([succ for succ in succs if self.cdfg.get_edge(node, succ).attr["style"] != "dashed"]) == 0:
+				new_edges.append((supersources[node_bb], node))
+			if len(succs) == 0:
 				# node has no successors -> needs to be connected
-				self.cdfg.add_edge(node, f"ssink_{node.attr['id']}")
+				new_edges.append((node, supersinks[node_bb]))
+		for src, dst in new_edges: # edges are added after the scan, so that the CSR adjacency is built only once
+			cdfg.add_edge(src, dst)
 
 		#draw the cdfg for testing your code in task 1
-		self.cdfg.layout(prog='dot')
-		self.cdfg.draw('output.pdf')
+		if self.artifacts == "full":
+			self.cdfg.draw('output.pdf')
 	
 		#end the program here until you're ready to start task 2
 		#quit()
 
+	"""
+	Folds the constants, arguments and branches out of the ILP: their sv is the sv of a neighbour (anchor) plus an offset, so they get no variable
+	and their constraints are written on the anchor. With a minimized sv (ASAP, pipelined), a node with a single predecessor in its BB starts when
+	the predecessor ends; with a maximized sv (ALAP), a node with a single successor in its BB ends when the successor starts. Any optimal solution
+	of the ILP has these values, so the folding is exact (the objective coefficient of the node is moved to its anchor). The nodes of the back edges
+	are not folded, as well as the nodes with several neighbours on the side of their anchor
+	"""
+	def fold_nodes(self):
+		cdfg = self.cdfg
+		direction = -1 if self.sched_tech == "alap" else 1 # sign of the objective coefficients of the nodes
+		order = get_topological_order(cdfg)
+		for node in (order if direction == 1 else reversed(order)): # the anchor of a node is folded before the node
+			if not(cdfg.get_type(node) in foldable_types):
+				continue
+			node_bb = cdfg.node_bb[node]
+			if any([ cdfg.edge_kind[e] == EDGE_BACK for e in cdfg.in_edges(node) + cdfg.out_edges(node) ]):
+				continue
+			if direction == 1:
+				neighbours = set([ cdfg.edge_src[e] for e in cdfg.in_edges(node) if cdfg.node_bb[cdfg.edge_src[e]] == node_bb ])
+			else:
+				neighbours = set([ cdfg.edge_dst[e] for e in cdfg.out_edges(node) if cdfg.node_bb[cdfg.edge_dst[e]] == node_bb ])
+			if len(neighbours) != 1:
+				continue
+			neighbour = neighbours.pop()
+			anchor, offset = self.folded_nodes.get(neighbour, (neighbour, 0))
+			offset += cdfg.node_latency[neighbour] if direction == 1 else -cdfg.node_latency[node]
+			self.folded_nodes[node] = (anchor, offset)
+		folded_types = {}
+		for node in self.folded_nodes:
+			folded_types[cdfg.get_type(node)] = folded_types.get(cdfg.get_type(node), 0) + 1
+		self.log.info(f"CDFG compaction: {len(self.folded_nodes)} node(s) out of {len(cdfg)} folded out of the ILP {dict(sorted(folded_types.items()))}")
+
+	# function to get the sv of the folded nodes (dictionary of value per variable name) from the solution of the ILP
+	def get_folded_solution(self, solution):
+		names = self.cdfg.node_names
+		return { f"sv{names[node]}" : solution[f"sv{names[anchor]}"] + offset for node, (anchor, offset) in self.folded_nodes.items() }
+
 	"""
 	Adds the scheduling variable of each node in the CDFG to the ILP formulation.
 	"""
@@ -123,10 +208,12 @@ class Scheduler:
 		#self.log.error("The add_nodes_to_ilp member function in src/main_flow/scheduler.py has not yet been implemented")
 		#self.log.info("Exiting early due to an unimplemented function")
 		for node in self.cdfg:
-			if node.attr["type"] in ["supersource", "supersink"]:
-				self.ilp.add_variable(f"sv{node}", lower_bound=0, var_type="i")
+			if node in self.folded_nodes:
+				continue
+			if self.cdfg.get_type(node) in ["supersource", "supersink"]:
+				self.ilp.add_variable(f"sv{self.cdfg.node_names[node]}", lower_bound=0, var_type="i")
 			else:
-				self.ilp.add_variable(f"sv{node}", var_type="i")
+				self.ilp.add_variable(f"sv{self.cdfg.node_names[node]}", var_type="i")
 		#quit()
 
 	"""
@@ -137,12 +224,29 @@ class Scheduler:
 
 		#self.log.error("The set_data_dependency_constraints member function in src/main_flow/scheduler.py has not yet been implemented")
 		#self.log.info("Exiting early due to an unimplemented function")
-		edges = get_cdfg_edges(self.cdfg)
-		for edge in edges:
-			nodeA, nodeB = edge
-			if nodeA.attr["id"] != nodeB.attr["id"]: continue # ignore if not in same BB
-			if edge.attr["style"] == "dashed": continue # ignore if back edge
-			self.constraints.add_constraint({f"sv{nodeA}": -1, f"sv{nodeB}": 1}, "geq", get_node_latency(nodeA.attr))
+		cdfg = self.cdfg
+		var_columns = self.ilp.get_variable_columns()
+		node_columns = np.array([var_columns.get(f"sv{node_name}", -1) for node_name in cdfg.node_names], dtype=np.int64) # -1: folded node
+		# the sv of a folded node is the sv of its anchor plus an offset
+		node_anchors, node_offsets = np.arange(len(cdfg), dtype=np.int64), np.zeros(len(cdfg), dtype=np.int64)
+		for node, (anchor, offset) in self.folded_nodes.items():
+			node_anchors[node], node_offsets[node] = anchor, offset
+		edges = np.fromiter(get_cdfg_edges(cdfg), dtype=np.int64)
+		nodesA, nodesB = np.asarray(cdfg.edge_src)[edges], np.asarray(cdfg.edge_dst)[edges]
+		node_bb = np.asarray(cdfg.node_bb)
+		keep = (node_bb[nodesA] == node_bb[nodesB]) & (np.asarray(cdfg.edge_kind)[edges] != EDGE_BACK) # ignore if not in same BB or if back edge
+		nodesA, nodesB = nodesA[keep], nodesB[keep]
+		# svB - svA >= latency(A) is written on the anchors, the edges between a folded node and its anchor are satisfied by the folding
+		latencies = np.asarray(cdfg.node_latency)[nodesA] + node_offsets[nodesA] - node_offsets[nodesB]
+		nodesA, nodesB = node_anchors[nodesA], node_anchors[nodesB]
+		assert((latencies[nodesA == nodesB] <= 0).all()) # the folding satisfies the constraints between the nodes of a same anchor
+		keep = nodesA != nodesB
+		nodesA, nodesB, latencies = nodesA[keep], nodesB[keep], latencies[keep]
+		# one constraint svB - svA >= latency(A) per edge, all added at once
+		rows = np.repeat(np.arange(len(nodesA)), 2)
+		cols = np.stack((node_columns[nodesA], node_columns[nodesB]), axis=1).ravel()
+		coeffs = np.tile([-1, 1], len(nodesA))
+		self.constraints.add_constraints(rows, cols, coeffs, "geq", latencies)
 		#quit()
 
 	"""
@@ -162,22 +266,34 @@ class Scheduler:
 		#output to terminal that this is the next function to implement
 		#self.log.error("The set_asap_objective_function member function in src/main_flow/scheduler.py has not yet been implemented")
 		#self.log.info("Exiting early due to an unimplemented function")
+		coeffs = {}
 		for node in self.cdfg:
-			if node.attr["type"] in ["supersource", "supersink"]: continue
-			self.obj_fun.add_variable(f"sv{node}", 1) # we want to minimize the starting time of nodes -> set coeff=1
+			if self.cdfg.get_type(node) in ["supersource", "supersink"]: continue
+			self.add_objective_coefficient(coeffs, node, 1) # we want to minimize the starting time of nodes -> set coeff=1
+		for var_name, coeff in coeffs.items():
+			self.obj_fun.add_variable(var_name, coeff)
 		#quit()
 
+	# function to add the coefficient of the sv of a node to the objective coefficients (dictionary of coefficient per variable name)
+	# the coefficient of a folded node is added to its anchor, the offset of its sv is a constant of the objective function
+	def add_objective_coefficient(self, coeffs, node, coeff):
+		node = self.folded_nodes.get(node, (node, 0))[0]
+		var_name = f"sv{self.cdfg.node_names[node]}"
+		coeffs[var_name] = coeffs.get(var_name, 0) + coeff
+
 	"""
 	Returns the sv of each BB's supersink in the form of a dictionary/list
 	"""
 	def get_sink_svs(self):
+		assert self.sched_sol != None, "There should be a solution to an ILP before running this function"
 		#output to terminal that this is the next function to implement
 		#self.log.error("The get_sink_svs member function in src/main_flow/scheduler.py has not yet been implemented")
 		#self.log.info("Exiting early due to an unimplemented function")
 		sink_svs = dict()
 		for node in self.cdfg:
-			if node.attr["type"] != "supersink": continue
-			sink_svs[f"{node}"] = self.ilp.get_operation_timing_solution(node)
+			if self.cdfg.get_type(node) != "supersink": continue
+			node_name = self.cdfg.node_names[node]
+			sink_svs[node_name] = self.sched_sol[f"sv{node_name}"] # the solution of the ILP, or of a scheduler without ILP
 		sink_svs = dict(sorted(sink_svs.items()))
 		self.log.debug(sink_svs)
 		return sink_svs
@@ -214,9 +330,12 @@ class Scheduler:
 		#output to terminal that this is the next function to implement
 		#self.log.error("The set_alap_objective_function member function in src/main_flow/scheduler.py has not yet been implemented")
 		#self.log.info("Exiting early due to an unimplemented function")
-		for node in self.cdfg:
-			if "ssrc" in node or "ssink" in node: continue
-			self.obj_fun.add_variable(f"sv{node}", -1) # we want to maximize the starting time of nodes -> set coeff=-1
+		coeffs = {}
+		for node, node_name in enumerate(self.cdfg.node_names):
+			if "ssrc" in node_name or "ssink" in node_name: continue
+			self.add_objective_coefficient(coeffs, node, -1) # we want to maximize the starting time of nodes -> set coeff=-1
+		for var_name, coeff in coeffs.items():
+			self.obj_fun.add_variable(var_name, coeff)
 		#quit()
 
 	"""
@@ -230,11 +349,12 @@ class Scheduler:
 		#self.log.error("The set_pipelining_constraints member function in src/main_flow/scheduler.py has not yet been implemented")
 		#self.log.info("Exiting early due to an unimplemented function")
 
-		edges = get_cdfg_edges(self.cdfg)
-		for edge in edges:
-			if edge.attr["style"] != "dashed": continue
-			nodeA, nodeB = edge # A store, B load
-			self.constraints.add_constraint({f"sv{nodeA}": 1, f"sv{nodeB}": -1}, "leq", II * 1 - get_node_latency(nodeA.attr))
+		cdfg = self.cdfg
+		self.pipelining_constraints = []
+		for edge in get_back_edges(cdfg):
+			nodeA, nodeB = cdfg.edge_src[edge], cdfg.edge_dst[edge] # A store, B load
+			constraint_id = self.constraints.add_constraint({f"sv{cdfg.node_names[nodeA]}": 1, f"sv{cdfg.node_names[nodeB]}": -1}, "leq", II * 1 - cdfg.node_latency[nodeA])
+			self.pipelining_constraints.append((constraint_id, cdfg.node_latency[nodeA]))
 		#quit()
 
 	"""
@@ -261,7 +381,7 @@ class Scheduler:
 		BB_latencies = dict()
 		for bb in self.cfg:
 			numbericBBID = bb.attr["id"]
-			BB_latencies[numbericBBID] = self.ilp.get_operation_timing_solution(f"ssink_{numbericBBID}") - self.ilp.get_operation_timing_solution(f"ssrc_{numbericBBID}")
+			BB_latencies[numbericBBID] = self.sched_sol[f"svssink_{numbericBBID}"] - self.sched_sol[f"svssrc_{numbericBBID}"] # the solution of the ILP, or of a scheduler without ILP
 		BBid_with_longest_latency = (sorted(BB_latencies.items(), key=lambda item: item[1], reverse=True))[0][0]
 		self.log.debug(f"BB latencies: {BB_latencies} -> BB id with longest latency {BBid_with_longest_latency}")
 		return BBid_with_longest_latency
@@ -271,7 +391,7 @@ class Scheduler:
 #### DO NOT TOUCH FROM THIS LINE ####
 
 	def pass_scheduling_ilp(self, resources):
-		resources.set_scheduling_ilp(self.ilp, self.constraints, self.obj_fun)
+		resources.set_scheduling_ilp(self.ilp, self.constraints, self.obj_fun, self.cdfg)
 
 	"""
 	Sets the scheduling technique of the scheduler
@@ -299,6 +419,141 @@ class Scheduler:
 
 		self.set_obj_function()
 
+	"""
+	Changes the II of the pipelined scheduling ILP already created: only the right coefficients of the inter-iteration constraints depend on the II,
+	so the ILP is not created again and the solver only applies these changes to its model
+	@type II: integer
+	@param II: the new II value
+	"""
+	def set_II(self, II):
+		assert(self.sched_tech == "pipelined" and self.pipelining_constraints != None) # the pipelined scheduling ILP should be created
+		for constraint_id, latency in self.pipelining_constraints:
+			self.constraints.set_right_constant(constraint_id, II * 1 - latency)
+		self.II = II
+
+	# function to check on the CDFG if an II can be feasible: the inter-iteration and data dependency constraints are only satisfiable if II >= RecMII
+	def is_II_feasible(self, II):
+		if self.rec_mii == None:
+			self.rec_mii = get_rec_mii(self.cdfg)
+		return II >= self.rec_mii
+
+	"""
+	Removes the redundant difference constraints `svB - svA >= c` between scheduling variables: the duplicated constraints (e.g. of the parallel
+	edges of the CDFG), the ones weaker than another constraint of the same pair of variables, and the ones implied by a longer path of constraints
+	with at least the same weight (e.g. the chaining constraints of the resources that follow the data dependencies). The inter-iteration
+	constraints depend on the II, they are neither removed nor used to imply other constraints. The other constraints are kept. The reduction of the
+	difference constraints does not depend on the II, the longest paths are not computed again if they are the ones kept by the last reduction
+	"""
+	def reduce_constraints(self):
+		sv_names = set([ f"sv{node_name}" for node_name in self.cdfg.node_names ])
+		II_dependent = set([ int(constraint_id[1:]) for constraint_id, _ in self.pipelining_constraints ]) if self.pipelining_constraints != None else set()
+		variables = self.ilp.get_column_variables()
+		numbers, indptr, cols, coeffs, signs, rhs = self.constraints.get_constraint_arrays(self.ilp.get_variable_columns())
+		cols, coeffs, indptr = cols.tolist(), coeffs.tolist(), indptr.tolist()
+		strongest = {} # strongest constraint of each pair of variables (A, B), as (c, number)
+		removed = []
+		for row, (number, sign, row_rhs) in enumerate(zip(numbers.tolist(), signs.tolist(), rhs.tolist())):
+			terms = [ (col, coeff) for col, coeff in zip(cols[indptr[row]:indptr[row + 1]], coeffs[indptr[row]:indptr[row + 1]]) if coeff != 0 ]
+			if number in II_dependent or sign == ilp.LpConstraintEQ or len(terms) != 2 or sorted([ coeff for _, coeff in terms ]) != [-1, 1]:
+				continue
+			if any([ col < 0 or not(variables[col].name in sv_names) for col, _ in terms ]):
+				continue
+			if sign == ilp.LpConstraintLE: # `expr <= rhs` is `-expr >= -rhs`
+				terms, row_rhs = [ (col, -coeff) for col, coeff in terms ], -row_rhs
+			(nodeA, _), (nodeB, _) = sorted(terms, key=lambda term : term[1])
+			if not((nodeA, nodeB) in strongest):
+				strongest[(nodeA, nodeB)] = (row_rhs, number)
+			elif row_rhs > strongest[(nodeA, nodeB)][0]:
+				removed.append(strongest[(nodeA, nodeB)][1])
+				strongest[(nodeA, nodeB)] = (row_rhs, number)
+			else:
+				removed.append(number)
+		duplicates = len(removed)
+		rows = set([ (number, weight) for weight, number in strongest.values() ])
+		if duplicates == 0 and rows == self.reduction_rows:
+			self.log.debug(f"Constraint reduction: the {len(rows)} difference constraint(s) are unchanged since the last reduction, they are not reduced again")
+			return
+		# the longest paths are computed in the reverse topological order of the constraint graph, if it has no cycle
+		successors, in_degree = {}, {}
+		for (nodeA, nodeB), (weight, _) in strongest.items():
+			update_dic_list(successors, nodeA, (nodeB, weight))
+			in_degree[nodeB] = in_degree.get(nodeB, 0) + 1
+		order = [ node for node in successors if in_degree.get(node, 0) == 0 ]
+		for node in order:
+			for succ, _ in successors.get(node, []):
+				in_degree[succ] -= 1
+				if in_degree[succ] == 0:
+					order.append(succ)
+		if len(order) < len(set([ node for pair in strongest for node in pair ])):
+			self.log.debug("Constraint reduction: the difference constraints form a cycle, only the duplicated constraints are removed")
+		else:
+			longest = {} # longest path from each node to the nodes it reaches
+			for node in reversed(order):
+				# longest paths of at least two constraints, they imply the constraints of the node that are not longer
+				paths = {}
+				for succ, weight in successors.get(node, []):
+					for dst, length in longest[succ].items():
+						if not(dst in paths) or weight + length > paths[dst]:
+							paths[dst] = weight + length
+				for succ, weight in successors.get(node, []):
+					if succ in paths and paths[succ] >= weight:
+						removed.append(strongest[(node, succ)][1])
+					else:
+						paths[succ] = weight
+				longest[node] = paths
+		for number in removed:
+			self.constraints.remove_constraint(f"c{number}")
+		self.reduced_constraints += len(removed)
+		removed = set(removed)
+		self.reduction_rows = set([ (number, weight) for number, weight in rows if not(number in removed) ])
+		self.log.info(f"Constraint reduction: {len(strongest) + duplicates} difference constraint(s) reduced to {len(strongest) + duplicates - len(removed)} ({duplicates} duplicated or weaker, {len(removed) - duplicates} implied by longer paths), {len(numbers)} constraint(s) reduced to {len(numbers) - len(removed)} in total")
+
+	"""
+	Tightens the bounds of the scheduling variables to the ASAP and ALAP times implied by the difference constraints of the ILP (the other
+	constraints, e.g. the resource constraints, are relaxed), the mobility of a node is the width of its bounds (ALAP - ASAP). The nodes without mobility
+	are fixed, and their difference constraints, implied by the bounds, can be dropped from the model
+	@type drop_fixed: boolean
+	@param drop_fixed: True to drop the difference constraints of the fixed nodes, the bounds then replace them and are kept by the next presolves
+	"""
+	def presolve(self, drop_fixed=True):
+		sv_names = [ f"sv{self.cdfg.node_names[node]}" for node in self.cdfg if not(node in self.folded_nodes) ]
+		if self.original_bounds == None:
+			self.original_bounds = { var_name : (self.ilp.get_variable(var_name).lowBound, self.ilp.get_variable(var_name).upBound) for var_name in sv_names }
+		elif self.dropped_constraints == 0: # the constraints may have changed since the last presolve (e.g. the II), its bounds are not valid anymore
+			for var_name, (lower_bound, upper_bound) in self.original_bounds.items():
+				self.ilp.get_variable(var_name).lowBound, self.ilp.get_variable(var_name).upBound = lower_bound, upper_bound
+		sdc_engine = SDC_Engine(self.ilp, log=self.log)
+		bounds = sdc_engine.get_bounds()
+		if bounds == None:
+			self.log.warning("Presolve: the difference constraints are infeasible, the bounds are not tightened")
+			return
+		bounded, fixed = set(), set()
+		for var_name in sv_names:
+			if None in bounds[var_name]: # only the nodes with an ASAP and an ALAP time are bounded, a lower bound alone does not help the solver
+				continue
+			bounded.add(var_name)
+			var = self.ilp.get_variable(var_name)
+			var.lowBound, var.upBound = bounds[var_name]
+			if var.lowBound == var.upBound:
+				fixed.add(var_name)
+		dropped = 0
+		if drop_fixed and len(fixed) > 0:
+			variables = self.ilp.get_column_variables()
+			numbers, indptr, cols, coeffs, _, _ = self.constraints.get_constraint_arrays(self.ilp.get_variable_columns())
+			cols, coeffs, indptr = cols.tolist(), coeffs.tolist(), indptr.tolist()
+			for row, number in enumerate(numbers.tolist()):
+				terms = [ (col, coeff) for col, coeff in zip(cols[indptr[row]:indptr[row + 1]], coeffs[indptr[row]:indptr[row + 1]]) if coeff != 0 ]
+				if len(terms) == 0 or not(sdc_engine.is_difference_constraint(terms)) or any([ col < 0 for col, _ in terms ]):
+					continue
+				var_names = [ variables[col].name for col, _ in terms ]
+				# the constraint is implied by the bounds if one of its variables is fixed and all of them are bounded by the presolve
+				if any([ var_name in fixed for var_name in var_names ]) and all([ var_name in bounded for var_name in var_names ]):
+					self.constraints.remove_constraint(f"c{number}")
+					dropped += 1
+		self.dropped_constraints += dropped
+		mobility = sum([ bounds[var_name][1] - bounds[var_name][0] for var_name in bounded ]) / len(bounded) if len(bounded) > 0 else 0
+		self.log.info(f"Presolve: {len(fixed)} fixed node(s) out of {len(sv_names)}, {len(bounded)} bounded node(s) with an average mobility of {mobility:.2f}, {dropped} constraint(s) dropped")
+
 	"""
 	Create the optimization function by adding variables to the obj_fun object according to the specified scheduling technique
 	"""
@@ -314,27 +569,49 @@ class Scheduler:
 			raise NotImplementedError
 		
 
+	"""
+	Sets the limits of the solver of the scheduling ILP: when the time limit is reached, the best schedule found is kept, marked as not optimal
+	@param time_limit: time limit of each solution in seconds (None if unlimited)
+	@param gap_rel: relative MIP gap at which the solver stops (None for the default gap of the solver)
+	"""
+	def set_solver_limits(self, time_limit=None, gap_rel=None):
+		self.ilp.set_limits(time_limit, gap_rel)
+
 	# function to solve the ilp and obtain scheduling
+	# it returns the status of the ILP: 1 (optimal) or `LpStatusNotOptimal` (time limit reached) if there is a schedule, `ilp.LpStatusNotSolved` if the time limit is
+	# reached without any schedule, otherwise the ILP cannot be solved (e.g. -1 if it is infeasible)
 	def solve_scheduling_ilp(self, base_path, example_name):
+		if self.sched_tech == "pipelined" and not(self.is_II_feasible(self.II)):
+			self.ilp.print_ilp("{0}/{1}/output.lp".format(base_path, example_name))
+			self.log.warning(f"II = {self.II} is lower than RecMII = {self.rec_mii}, the ILP is infeasible and it is not solved")
+			return -1
+		if self.presolve_reduction:
+			self.reduce_constraints()
+		if self.presolve_bounds: # the bounds of the pipelined scheduling depend on the II, its constraints are kept so that the II can be changed
+			self.presolve(drop_fixed=(self.sched_tech != "pipelined"))
 		# log the result
 		self.ilp.print_ilp("{0}/{1}/output.lp".format(base_path, example_name))
-		res = self.ilp.solve_ilp()
-		if res != 1:
+		res = self.ilp.solve_ilp_parallel(self.workers) # the BBs are independent components of the ILP, solved in parallel if there are several workers
+		if not(res in solution_statuses):
 			self.log.warn("The ILP problem cannot be solved")
 			return res
+		self.optimal = res == 1
+		if not(self.optimal):
+			self.log.warning("The schedule is the best one found within the time limit, it is not proven optimal")
 		self.sched_sol = self.ilp.get_ilp_solution() # save solution in an attribute
+		self.sched_sol.update(self.get_folded_solution(self.sched_sol)) # the folded nodes are filled back in for the reports
 		# iterate through the different variables to obtain results
-		for var, value in self.ilp.get_ilp_solution().items():
+		for var, value in self.sched_sol.items():
 			node_type = 'AUX'
 			# check if the node represents a timing
 			if re.search(r'^sv', var):
 				node_name = re.sub(r'^sv', '', var)
-				attributes = self.cdfg.get_node(node_name).attr
-				node_type = attributes['type']
-				attributes['label'] = attributes['label'] + '\n' + f'[{value}]'
-				attributes['latency'] = value
+				node = self.cdfg.get_id(node_name)
+				node_type = self.cdfg.get_type(node)
+				self.cdfg.set_start(node, value) # exported as the 'latency' attribute, and appended to the label
 			self.log.debug(f'{var} of type {node_type}:= {value}')
-		self.cdfg.draw("test_dag_result.pdf", prog="dot")
+		if self.artifacts == "full":
+			self.cdfg.draw("test_dag_result.pdf", layout="dot")
 		if 'max_latency' in self.ilp.get_ilp_solution():
 			self.log.info(f'The maximum latency for this cdfg is {self.ilp.get_ilp_solution()["max_latency"]}')
 		elif 'max_II' in self.ilp.get_ilp_solution():
@@ -347,14 +624,17 @@ class Scheduler:
 	# function to get the gantt chart of a scheduling
 	def print_gantt_chart(self, chart_title="Untitled", file_path=None):
 		assert self.sched_sol != None, "There should be a solution to an ILP before running this function"
+		if self.artifacts != "full":
+			return
 		variables = {}
 		start_time = {}
 		duration = {}
 		latest_tick = {} # variable to find last tick for xlables
 		bars_colors = {}
-		for node_name in get_cdfg_nodes(self.cdfg):
-			if 'label' in self.cdfg.get_node(node_name).attr:
-				attributes = self.cdfg.get_node(node_name).attr
+		for node in get_cdfg_nodes(self.cdfg):
+			attributes = self.cdfg.get_node_attrs(node)
+			if 'label' in attributes:
+				node_name = self.cdfg.node_names[node]
 				bb_id = attributes['id']
 				if not(bb_id in variables):
 					variables[bb_id] = []
@@ -422,12 +702,12 @@ class Scheduler:
 
 
 			#kernel 3 and 4's loop are both in BB1
-			nodes = [n for n in get_cdfg_nodes(self.cdfg) if n.attr['id'] == str(self.find_loop_bb())]
+			nodes = [self.cdfg.node_names[n] for n in get_cdfg_nodes(self.cdfg) if self.cdfg.get_node_attr(n, 'id') == str(self.find_loop_bb())]
 			print(nodes)
 			for it in range(1,-1, -1):
 				for node in nodes:
-					if 'label' in self.cdfg.get_node(node).attr:
-						attributes = self.cdfg.get_node(node).attr
+					attributes = self.cdfg.get_node_attrs(self.cdfg.get_id(node))
+					if 'label' in attributes:
 						bb_id = attributes['id']
 						# if not(bb_id in variables):
 						# 	print("sad")
@@ -496,13 +776,15 @@ class Scheduler:
 	# function to get the gantt chart of a scheduling solution
 	def print_scheduling_summary(self, file_path=None):
 		assert self.sched_sol != None, "There should be a solution to an ILP before running this function"
+		if self.artifacts == "none":
+			return
 		with open(file_path, 'w') as f:
 			# sort the summary by BBs, print the starting time of each node
 			for id_ in range(len(self.cfg)):
 				# sort the summary by starting time of each node
-				for node in sorted(get_cdfg_nodes(self.cdfg), key=lambda n : n.attr["latency"]):
-					if int(node.attr['id']) == id_:
-						f.write(f'sv({node}) @ bb({id_}) := {node.attr["latency"]}\n')
+				for node in sorted(get_cdfg_nodes(self.cdfg), key=lambda n : self.cdfg.get_node_attr(n, "latency")):
+					if self.cdfg.node_bb[node] == id_:
+						f.write(f'sv({self.cdfg.node_names[node]}) @ bb({id_}) := {self.cdfg.get_node_attr(node, "latency")}\n')
 			if self.II != None:
 				f.write(f'II := {self.II}')
 			else:
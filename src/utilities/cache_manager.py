@@ -0,0 +1,192 @@
+import os
+import hashlib
+import pickle
+import zlib
+import logging
+from collections import OrderedDict
+
+############################################################################################################################################
+############################################################################################################################################
+#
+#	`CACHE_MANAGER` CLASS
+#
+############################################################################################################################################
+#	DESCRIPTION:
+#				 The following class is a content-addressed on-disk cache. Each entry is a compressed binary file named after the hash of
+#				 its content key, and the total size of the cache is bounded by evicting the least recently used entries
+############################################################################################################################################
+#	ATTRIBUTES:
+#				- cache_dir : directory containing the cache entries
+#				- max_size : maximum total size of the cache entries (in bytes)
+#				- hits : number of cache hits
+#				- misses : number of cache misses
+#				- log: logger object used to output logs
+############################################################################################################################################
+#	FUNCTIONS:
+#				- get_key : compute the key of an entry from its content
+#				- get_entry_path : get the path of the file of an entry
+#				- load : load an entry (None if not present)
+#				- store : store an entry and evict the least recently used ones if the cache is too large
+#				- evict : remove the least recently used entries until the cache fits its maximum size
+############################################################################################################################################
+############################################################################################################################################
+
+cache_entry_extension = ".cache"
+
+class Cache_Manager:
+
+	def __init__(self, cache_dir, max_size=256*1024*1024, log=None):
+		if log != None:
+			self.log = log
+		else:
+			self.log = logging.getLogger('cache') # if the logger is not given at object generation, create a new one
+		assert(max_size > 0) # the cache should be able to contain at least one entry
+		self.cache_dir = cache_dir
+		self.max_size = max_size
+		self.hits = 0
+		self.misses = 0
+		os.makedirs(cache_dir, exist_ok=True)
+
+	# function to compute the key of an entry from its content (bytes or strings)
+	def get_key(self, *contents):
+		key = hashlib.sha256()
+		for content in contents:
+			if type(content) is str:
+				content = content.encode()
+			key.update(len(content).to_bytes(8, 'little')) # the length avoids collisions between different splits of the same content
+			key.update(content)
+		return key.hexdigest()
+
+	# function to get the path of the file of an entry
+	def get_entry_path(self, key):
+		return os.path.join(self.cache_dir, key + cache_entry_extension)
+
+	# function to load an entry, it returns None if the entry is not present or cannot be read
+	def load(self, key):
+		entry_path = self.get_entry_path(key)
+		try:
+			with open(entry_path, 'rb') as f:
+				entry = pickle.loads(zlib.decompress(f.read()))
+		except FileNotFoundError:
+			self.misses += 1
+			return None
+		except (OSError, EOFError, zlib.error, pickle.UnpicklingError) as e:
+			self.log.warning("Cache entry {0} cannot be read ({1}), it is discarded".format(entry_path, e))
+			self.misses += 1
+			return None
+		try:
+			os.utime(entry_path) # the modification time is used as last access time for the LRU eviction
+		except FileNotFoundError: # already evicted by a concurrent run
+			pass
+		self.hits += 1
+		self.log.debug("Cache hit for entry {0}".format(entry_path))
+		return entry
+
+	# function to store an entry, the file is written atomically so that concurrent runs never read a partial entry
+	def store(self, key, entry):
+		entry_path = self.get_entry_path(key)
+		tmp_path = "{0}.{1}.tmp".format(entry_path, os.getpid())
+		with open(tmp_path, 'wb') as f:
+			f.write(zlib.compress(pickle.dumps(entry, protocol=pickle.HIGHEST_PROTOCOL)))
+		os.replace(tmp_path, entry_path)
+		self.log.debug("Cache entry {0} stored".format(entry_path))
+		self.evict()
+
+	# function to remove the least recently used entries until the cache fits its maximum size
+	def evict(self):
+		entries = []
+		for file_name in os.listdir(self.cache_dir):
+			if not(file_name.endswith(cache_entry_extension)):
+				continue
+			entry_path = os.path.join(self.cache_dir, file_name)
+			try:
+				stat = os.stat(entry_path)
+			except FileNotFoundError: # already evicted by a concurrent run
+				continue
+			entries.append((stat.st_mtime, stat.st_size, entry_path))
+		total_size = sum([ size for _, size, _ in entries ])
+		for _, size, entry_path in sorted(entries): # least recently used first
+			if total_size <= self.max_size:
+				break
+			try:
+				os.remove(entry_path)
+			except FileNotFoundError: # already evicted by a concurrent run
+				pass
+			total_size -= size
+			self.log.debug("Cache entry {0} evicted".format(entry_path))
+
+############################################################################################################################################
+############################################################################################################################################
+#
+#	`SOLUTION_CACHE` CLASS
+#
+############################################################################################################################################
+#	DESCRIPTION:
+#				 The following class memoizes the solutions of ILP formulations, keyed by their fingerprint (`ILP.get_fingerprint`). The
+#				 solutions are kept in an in-memory LRU of bounded size, and optionally in an on-disk cache (`Cache_Manager`) shared by the runs
+############################################################################################################################################
+#	INFO:
+#				a solution is the status of the solver and the value of each variable (empty if the ILP formulation is infeasible)
+#				the solutions are only stored if they are proven (optimal or infeasible), the caller decides it
+############################################################################################################################################
+#	ATTRIBUTES:
+#				- max_entries : maximum number of solutions in memory
+#				- entries : solutions in memory, from the least to the most recently used
+#				- disk_cache : Cache_Manager object storing the solutions on disk (None if disabled)
+#				- hits : number of lookups finding a solution (in memory or on disk)
+#				- disk_hits : number of lookups finding a solution on disk only
+#				- misses : number of lookups finding no solution
+#				- log: logger object used to output logs
+############################################################################################################################################
+#	FUNCTIONS:
+#				- load : look up the solution of a fingerprint (None if not present)
+#				- store : store the solution of a fingerprint
+#				- get_stats : get the counters of the cache
+############################################################################################################################################
+############################################################################################################################################
+
+solution_cache_version = "1" # to be increased whenever the fingerprint or the solution format changes, it invalidates the solutions on disk
+
+class Solution_Cache:
+
+	def __init__(self, max_entries=1024, disk_cache=None, log=None):
+		if log != None:
+			self.log = log
+		else:
+			self.log = logging.getLogger('solution_cache') # if the logger is not given at object generation, create a new one
+		assert(max_entries > 0) # the cache should be able to contain at least one solution
+		self.max_entries = max_entries
+		self.entries = OrderedDict()
+		self.disk_cache = disk_cache
+		self.hits = 0
+		self.disk_hits = 0
+		self.misses = 0
+
+	# function to look up the solution of a fingerprint in memory, then on disk, it returns None if it is not present
+	def load(self, fingerprint):
+		if fingerprint in self.entries:
+			self.entries.move_to_end(fingerprint)
+			self.hits += 1
+			return self.entries[fingerprint]
+		if self.disk_cache != None:
+			solution = self.disk_cache.load(self.disk_cache.get_key("solution", solution_cache_version, fingerprint))
+			if solution != None:
+				self.store(fingerprint, solution, disk=False)
+				self.hits += 1
+				self.disk_hits += 1
+				return solution
+		self.misses += 1
+		return None
+
+	# function to store the solution of a fingerprint, the least recently used solution leaves the memory if it is full
+	def store(self, fingerprint, solution, disk=True):
+		self.entries[fingerprint] = solution
+		self.entries.move_to_end(fingerprint)
+		while len(self.entries) > self.max_entries:
+			self.entries.popitem(last=False)
+		if disk and self.disk_cache != None:
+			self.disk_cache.store(self.disk_cache.get_key("solution", solution_cache_version, fingerprint), solution)
+
+	# function to get the counters of the cache
+	def get_stats(self):
+		return {"hits": self.hits, "disk_hits": self.disk_hits, "misses": self.misses, "entries": len(self.entries)}
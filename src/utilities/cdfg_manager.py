@@ -5,6 +5,7 @@
 #
 ############################################################################################################################################
 #	FUNCTIONS:
+#				- get_type_latency : retrieve a synthetic latency from the type of the cdfg node
 #				- get_node_latency : retrieve a synthetic latency from the attribute of the cdfg node
 #				- get_cdfg_edges : retrieve edges of cdfg
 #				- get_cdfg_nodes : retrieve nodes of cdfg
@@ -12,37 +13,51 @@
 #				- create_control_edge : create a control edge between src and dst in the cdfg
 #				- is_control_edge : check if edge between src and dst is a control edge
 #				- get_topological_order : assume that the input graph is a DAG, return the topological order of the nodes
+#				- get_bb_topological_orders : return the topological order of the nodes of each BB
+#				- get_topological_orders : return both orders, cached on the graph until it is modified
+#				- get_loop_bbs : return the BBs containing the back edges
+#				- get_recurrence_edges : return the edges of the recurrence graph of the pipelined scheduling
+#				- get_strongly_connected_components : return the strongly connected components of a graph
+#				- get_max_ratio_cycle : return the cycle with the maximum latency / distance ratio of a strongly connected graph
+#				- get_critical_recurrence : return the recurrence cycle with the maximum latency / distance ratio
+#				- get_rec_mii : return the recurrence-constrained minimum II
 ############################################################################################################################################
 ############################################################################################################################################
 
+from array import array
+from fractions import Fraction
 
 # function to retrieve the delay from the type
-def get_node_latency(attr):
-	if attr['type'] == 'mul' or attr['type'] == 'div':
+def get_type_latency(node_type):
+	if node_type == 'mul' or node_type == 'div':
 		return 4
-	elif attr['type'] == 'load':
+	elif node_type == 'load':
 		return 1
-	elif attr['type'] in ('br', 'supersink', 'supersource', 'constant'):
+	elif node_type in ('br', 'supersink', 'supersource', 'constant'):
 		return 0
 	else:
 		return 1
 
-# function to retrieve edges of cdfg
+# function to retrieve the delay from the attributes of a node
+def get_node_latency(attr):
+	return get_type_latency(attr['type'])
+
+# function to retrieve edges of cdfg (edge ids, grouped by source node)
 def get_cdfg_edges(cdfg):
-	return map(lambda e : cdfg.get_edge(*e), cdfg.edges(keys=True))
+	return cdfg.edges()
 
-# function to retrieve nodes of cdfg
+# function to retrieve nodes of cdfg (node ids)
 def get_cdfg_nodes(cdfg):
-	return map(lambda n : cdfg.get_node(n), cdfg.nodes())
+	return cdfg.nodes()
 
 # function to retrieve all dag edges of cdfg
 def get_dag_edges(cdfg):
-	is_dag_edges = lambda e : e.attr['style'] != 'dashed'
+	is_dag_edges = lambda e : cdfg.edge_kind[e] != EDGE_BACK
 	return filter(is_dag_edges, get_cdfg_edges(cdfg))
 
 # function to retrieve all the back edges that are not in the DAG
 def get_back_edges(cdfg):
-	is_bak_edges = lambda e : e.attr['style'] == 'dashed'
+	is_bak_edges = lambda e : cdfg.edge_kind[e] == EDGE_BACK
 	return filter(is_bak_edges, get_cdfg_edges(cdfg))
 
 
@@ -58,7 +73,7 @@ def update_dic_list(dic, key, new_element):
 
 # function to create a control edge between src and dst in the cdfg
 def create_control_edge(cdfg, src, dst):
-	cdfg.add_edge(src, dst, style="dashed")
+	cdfg.add_edge(src, dst, EDGE_BACK)
 	return cdfg
 
 # function to check if edge between src and dst is a control edge
@@ -66,28 +81,521 @@ def is_control_edge(cdfg, src, dst):
 	pass
 
 
-''' assume that the input graph is a DAG, return topological ordering among the nodes
-	https://en.wikipedia.org/wiki/Topological_sorting#Depth-first_search '''
+''' assume that the input graph is a DAG (back edges excluded), return topological ordering among the nodes
+	https://en.wikipedia.org/wiki/Topological_sorting#Kahn's_algorithm
+	the order is computed once per version of the graph, in O(V+E), and cached on the graph '''
 
 def get_topological_order(cdfg):
-	# node_list: historical ordering
-	# temp_list: a DFS run
-	node_list, temp_list = [], []
-	def visit(node):
-		if node in node_list:
+	return get_topological_orders(cdfg)[0]
+
+# function to retrieve the topological order of the nodes of each BB (dictionary of node lists per numeric BB id)
+def get_bb_topological_orders(cdfg):
+	return get_topological_orders(cdfg)[1]
+
+# function to retrieve the (cached) topological order of the nodes and the topological order of the nodes of each BB
+def get_topological_orders(cdfg):
+	if cdfg.topological_orders != None and cdfg.topological_orders[0] == cdfg.version:
+		return cdfg.topological_orders[1:]
+	out_ptr, out_edges = cdfg.build_csr()[0:2]
+	edge_dst, edge_kind = cdfg.edge_dst, cdfg.edge_kind
+	num_nodes = len(cdfg)
+	# number of dag edges entering each node
+	in_degree = array('i', [0]) * num_nodes
+	for e in out_edges:
+		if edge_kind[e] != EDGE_BACK: # skip the dashed edges: they are for sure cyclic
+			in_degree[edge_dst[e]] += 1
+	# the order list is also the queue of Kahn's algorithm: the nodes in node_list[head:] are ready but not yet visited
+	node_list = [ node for node in range(num_nodes) if in_degree[node] == 0 ]
+	head = 0
+	while head < len(node_list):
+		node = node_list[head]
+		head += 1
+		for e in out_edges[out_ptr[node]:out_ptr[node + 1]]:
+			if edge_kind[e] == EDGE_BACK:
+				continue
+			dst = edge_dst[e]
+			in_degree[dst] -= 1
+			if in_degree[dst] == 0:
+				node_list.append(dst)
+	assert len(node_list) == num_nodes, 'error - the CDFG graph should not contain not dashed loop back edges!'
+	bb_orders = {}
+	for node in node_list:
+		update_dic_list(bb_orders, cdfg.node_bb[node], node)
+	cdfg.topological_orders = (cdfg.version, node_list, bb_orders)
+	return node_list, bb_orders
+
+# function to retrieve the BBs containing the back edges (the BBs of the loops)
+def get_loop_bbs(cdfg):
+	loop_bbs = set()
+	for e in get_back_edges(cdfg):
+		loop_bbs.add(cdfg.node_bb[cdfg.edge_src[e]])
+		loop_bbs.add(cdfg.node_bb[cdfg.edge_dst[e]])
+	return loop_bbs
+
+# function to retrieve the edges of the recurrence graph of the pipelined scheduling, as (src, dst, latency, distance) tuples
+# a dag edge a -> b of a same BB requires sv(b) >= sv(a) + latency(a) (distance 0), a back edge src -> dst requires sv(dst) + II >= sv(src) + latency(src) (distance 1)
+def get_recurrence_edges(cdfg):
+	recurrence_edges = []
+	for e in get_cdfg_edges(cdfg):
+		src, dst = cdfg.edge_src[e], cdfg.edge_dst[e]
+		if cdfg.edge_kind[e] == EDGE_BACK:
+			recurrence_edges.append((src, dst, cdfg.node_latency[src], 1))
+		elif cdfg.node_bb[src] == cdfg.node_bb[dst]:
+			recurrence_edges.append((src, dst, cdfg.node_latency[src], 0))
+	return recurrence_edges
+
+''' return the strongly connected components of a graph given as a list of out edges (indices in edges) per node, in O(V+E)
+	https://en.wikipedia.org/wiki/Tarjan%27s_strongly_connected_components_algorithm (iterative version) '''
+
+def get_strongly_connected_components(out_edges, edges):
+	num_nodes = len(out_edges)
+	index = [ -1 ] * num_nodes
+	low_link = [ 0 ] * num_nodes
+	on_stack = [ False ] * num_nodes
+	stack = []
+	components = []
+	counter = 0
+	for root in range(num_nodes):
+		if index[root] != -1:
+			continue
+		call_stack = [ (root, 0) ] # node and position of the next out edge to visit
+		index[root] = low_link[root] = counter
+		counter += 1
+		stack.append(root)
+		on_stack[root] = True
+		while call_stack:
+			node, pos = call_stack[-1]
+			if pos < len(out_edges[node]):
+				call_stack[-1] = (node, pos + 1)
+				succ = edges[out_edges[node][pos]][1]
+				if index[succ] == -1:
+					index[succ] = low_link[succ] = counter
+					counter += 1
+					stack.append(succ)
+					on_stack[succ] = True
+					call_stack.append((succ, 0))
+				elif on_stack[succ]:
+					low_link[node] = min(low_link[node], index[succ])
+				continue
+			call_stack.pop()
+			if call_stack:
+				parent = call_stack[-1][0]
+				low_link[parent] = min(low_link[parent], low_link[node])
+			if low_link[node] == index[node]:
+				component = []
+				while True:
+					member = stack.pop()
+					on_stack[member] = False
+					component.append(member)
+					if member == node:
+						break
+				components.append(component)
+	return components
+
+''' return the cycle with the maximum ratio latency / distance of a strongly connected graph, as (latency, distance, cycle)
+	the edges are (src, dst, latency, distance) tuples, every cycle should have a positive distance, and every node of nodes an out edge in out_edges
+	the maximum cycle ratio is found by Howard's policy iteration, see A. Dasdan, "Experimental analysis of the fastest optimum cycle ratio
+	and mean algorithms", ACM TODAES 2004 '''
+
+def get_max_ratio_cycle(nodes, out_edges, edges):
+	eps = 1e-9
+	# initial policy: the out edge with the largest latency
+	policy = {}
+	for node in nodes:
+		policy[node] = max(out_edges[node], key=lambda i : edges[i][2])
+	ratio = dict.fromkeys(nodes, 0.0)
+	value = dict.fromkeys(nodes, 0.0)
+	while True:
+		# value determination: each component of the policy graph contains one cycle, whose ratio is given to the whole component
+		policy_in_edges = { node : [] for node in nodes }
+		for node in nodes:
+			policy_in_edges[edges[policy[node]][1]].append(policy[node])
+		cycles = []
+		visited = dict.fromkeys(nodes, 0) # 0: not visited, 1: on the current walk, 2: done
+		for start in nodes:
+			walk = []
+			node = start
+			while visited[node] == 0:
+				visited[node] = 1
+				walk.append(node)
+				node = edges[policy[node]][1]
+			if visited[node] == 1: # the walk closed a new cycle
+				cycle = walk[walk.index(node):]
+				latency = sum([ edges[policy[n]][2] for n in cycle ])
+				distance = sum([ edges[policy[n]][3] for n in cycle ])
+				assert distance > 0, 'error - the CDFG graph should not contain not dashed loop back edges!'
+				cycles.append((latency, distance, cycle))
+				cycle_ratio = latency / distance
+				ratio[node] = cycle_ratio
+				value[node] = 0.0
+				tree = [ node ]
+				while tree:
+					dst = tree.pop()
+					for i in policy_in_edges[dst]:
+						src = edges[i][0]
+						if src == node:
+							continue
+						ratio[src] = cycle_ratio
+						value[src] = edges[i][2] - cycle_ratio * edges[i][3] + value[dst]
+						tree.append(src)
+			for n in walk:
+				visited[n] = 2
+		# policy improvement: towards a larger ratio first, then (if no ratio can increase) towards a larger value
+		improved = False
+		for node in nodes:
+			for i in out_edges[node]:
+				dst = edges[i][1]
+				if ratio[dst] > ratio[node] + eps:
+					ratio[node] = ratio[dst] # updated on the fly, so that the out edge with the largest ratio is kept
+					policy[node] = i
+					improved = True
+		if not(improved):
+			for node in nodes:
+				for i in out_edges[node]:
+					_, dst, latency, distance = edges[i]
+					if abs(ratio[dst] - ratio[node]) <= eps and latency - ratio[node] * distance + value[dst] > value[node] + eps:
+						value[node] = latency - ratio[node] * distance + value[dst]
+						policy[node] = i
+						improved = True
+		if not(improved):
+			break
+	# the float ratios only drive the iterations, the cycle is selected with exact ratios
+	latency, distance, cycle = max(cycles, key=lambda c : Fraction(c[0], c[1]))
+	for pos in range(len(cycle)):
+		if edges[policy[cycle[pos - 1]]][3] > 0: # start the cycle after an edge with a distance (a back edge)
+			return latency, distance, cycle[pos:] + cycle[:pos]
+	return latency, distance, cycle
+
+''' return the critical recurrence of the CDFG as (latency, distance, cycle), None if the CDFG has no recurrence
+	the critical recurrence is the cycle of the recurrence graph with the maximum ratio latency / distance (distance = number of back edges),
+	the cycle is the list of its node ids starting after a back edge (usually a phi)
+	each strongly connected component is solved separately, so the cost grows with the size of the recurrences, not of the CDFG '''
+
+def get_critical_recurrence(cdfg):
+	recurrence_edges = get_recurrence_edges(cdfg)
+	out_edges = [ [] for _ in range(len(cdfg)) ]
+	for i, edge in enumerate(recurrence_edges):
+		out_edges[edge[0]].append(i)
+	critical_recurrence = None
+	component_id = [ -1 ] * len(cdfg)
+	for c, component in enumerate(get_strongly_connected_components(out_edges, recurrence_edges)):
+		if len(component) == 1 and not(any([ recurrence_edges[i][1] == component[0] for i in out_edges[component[0]] ])):
+			continue # no cycle in the component
+		for node in component:
+			component_id[node] = c
+		component_out_edges = { node : [ i for i in out_edges[node] if component_id[recurrence_edges[i][1]] == c ] for node in component }
+		latency, distance, cycle = get_max_ratio_cycle(component, component_out_edges, recurrence_edges)
+		if critical_recurrence == None or Fraction(latency, distance) > Fraction(critical_recurrence[0], critical_recurrence[1]):
+			critical_recurrence = (latency, distance, cycle)
+	return critical_recurrence
+
+# function to compute the recurrence-constrained minimum II (RecMII), i.e. the ceiling of the maximum cycle ratio of the recurrence graph
+def get_rec_mii(cdfg):
+	critical_recurrence = get_critical_recurrence(cdfg)
+	if critical_recurrence == None:
+		return 0
+	latency, distance, _ = critical_recurrence
+	return -(-latency // distance)
+
+############################################################################################################################################
+############################################################################################################################################
+#
+#	`CDFG` CLASS
+#
+############################################################################################################################################
+#	DESCRIPTION:
+#				 The following class is a compact in-memory CDFG (Control DataFlow Graph). Nodes are integer ids whose attributes are stored
+#				 as arrays (struct of arrays), edges are stored as arrays and indexed through CSR (Compressed Sparse Row) in/out adjacency.
+#				 Pygraphviz is only used when the graph is exported (DOT or PDF output)
+############################################################################################################################################
+#	INFO:
+#				'EDGE_DATA' and 'EDGE_BACK' are the edge kinds (back edges are the dashed loop-carried edges)
+############################################################################################################################################
+#	ATTRIBUTES:
+#				- node_names : name of each node
+#				- node_ids : dictionary of node id per name
+#				- type_names : name of each type code
+#				- type_codes : dictionary of type code per type name
+#				- node_type : type code of each node
+#				- node_bb : numeric BB id of each node (-1 if not assigned)
+#				- node_latency : latency of each node, derived from its type
+#				- node_bitwidth : bitwidth of each node (-1 if not assigned)
+#				- node_start : scheduled start time of each node (nan if not scheduled)
+#				- node_attrs : dictionary of the remaining (export only) attributes of each node, e.g. label and instruction
+#				- bb_labels : dictionary of BB label per numeric BB id
+#				- edge_src, edge_dst, edge_kind : source, destination and kind of each edge
+#				- csr : CSR in/out adjacency, built on demand and dropped when nodes or edges are added
+#				- version : counter increased at each modification of the graph
+#				- topological_orders : cached topological orders (global and per BB) with the version of the graph they were computed for
+#				- frozen : the graph cannot be modified anymore (overlays of it can)
+#				- shared_fields : fields that are still shared with the base graph of an overlay
+############################################################################################################################################
+#	FUNCTIONS:
+#				- add_node : add a node or update the attributes of an existing one
+#				- get_id : get the id of a node from its name
+#				- has_node : check if a node name is in the graph
+#				- set_type : set the type (and the latency) of a node
+#				- get_type : get the type name of a node
+#				- set_start : set the scheduled start time of a node
+#				- add_edge : add an edge between two nodes
+#				- set_edge_kind : set the kind of an edge
+#				- freeze : freeze the graph
+#				- overlay : create a copy-on-write overlay of the graph
+#				- own : take a private copy of fields shared with the base graph
+#				- nodes : retrieve node ids
+#				- edges : retrieve edge ids, grouped by source node
+#				- build_csr : build CSR in/out adjacency
+#				- out_edges / in_edges : retrieve edges leaving / entering a node
+#				- successors / predecessors : retrieve nodes connected to a node
+#				- has_edge : check if there is an edge between two nodes
+#				- get_node_attr : get an attribute of a node as a string (same format as pygraphviz)
+#				- get_node_attrs : get all the attributes of a node
+#				- to_agraph : export the graph to a pygraphviz AGraph
+#				- draw : draw the graph in an output file
+#				- write : write the DOT representation of the graph in an output file
+############################################################################################################################################
+############################################################################################################################################
+
+EDGE_DATA, EDGE_BACK = 0, 1
+
+# fields that an overlay shares with its base graph until it modifies them
+node_fields = ('node_names', 'node_ids', 'node_type', 'node_bb', 'node_latency', 'node_bitwidth', 'node_start', 'node_attrs')
+edge_fields = ('edge_src', 'edge_dst', 'edge_kind')
+type_fields = ('type_names', 'type_codes')
+
+class CDFG:
+
+	def __init__(self):
+		self.node_names = []
+		self.node_ids = {}
+		self.type_names = ['']
+		self.type_codes = {'': 0}
+		self.node_type = array('h')
+		self.node_bb = array('i')
+		self.node_latency = array('i')
+		self.node_bitwidth = array('i')
+		self.node_start = array('d')
+		self.node_attrs = []
+		self.bb_labels = {}
+		self.edge_src = array('i')
+		self.edge_dst = array('i')
+		self.edge_kind = array('b')
+		self.csr = None
+		self.version = 0
+		self.topological_orders = None
+		self.frozen = False
+		self.shared_fields = set()
+
+	def __len__(self):
+		return len(self.node_names)
+
+	def __iter__(self):
+		return iter(range(len(self.node_names)))
+
+	# function to add a node (if not present) and to update the given attributes, it returns the node id
+	def add_node(self, name, type=None, bb=None, bitwidth=None, **attrs):
+		assert not(self.frozen), "The CDFG is frozen, use an overlay to modify it"
+		node = self.node_ids.get(name)
+		if node is None:
+			self.own(*node_fields)
+			node = len(self.node_names)
+			self.node_ids[name] = node
+			self.node_names.append(name)
+			self.node_type.append(0)
+			self.node_bb.append(-1)
+			self.node_latency.append(get_type_latency(''))
+			self.node_bitwidth.append(-1)
+			self.node_start.append(float('nan'))
+			self.node_attrs.append({})
+			self.csr = None
+		if type != None:
+			self.set_type(node, type)
+		if bb != None:
+			self.own('node_bb')
+			self.node_bb[node] = bb
+		if bitwidth != None:
+			self.own('node_bitwidth')
+			self.node_bitwidth[node] = int(bitwidth)
+		if len(attrs) > 0:
+			self.own('node_attrs')
+			self.node_attrs[node] = { **self.node_attrs[node], **attrs } # a new dictionary, the old one can be shared with a base graph
+		self.version += 1
+		return node
+
+	# function to get the id of a node from its name
+	def get_id(self, name):
+		assert(name in self.node_ids) # the name should be in the dictionary of nodes
+		return self.node_ids[name]
+
+	# function to check if a node name is in the graph
+	def has_node(self, name):
+		return name in self.node_ids
+
+	# function to set the type of a node, the latency of the node follows its type
+	def set_type(self, node, node_type):
+		assert not(self.frozen), "The CDFG is frozen, use an overlay to modify it"
+		self.own('node_type', 'node_latency')
+		if not(node_type in self.type_codes):
+			self.own('type_names', 'type_codes')
+			self.type_codes[node_type] = len(self.type_names)
+			self.type_names.append(node_type)
+		self.node_type[node] = self.type_codes[node_type]
+		self.node_latency[node] = get_type_latency(node_type)
+		self.version += 1
+
+	# function to get the type name of a node
+	def get_type(self, node):
+		return self.type_names[self.node_type[node]]
+
+	# function to set the scheduled start time of a node
+	def set_start(self, node, value):
+		assert not(self.frozen), "The CDFG is frozen, use an overlay to modify it"
+		self.own('node_start')
+		self.node_start[node] = value
+
+	# function to add an edge between the nodes src and dst, it returns the edge id
+	def add_edge(self, src, dst, kind=EDGE_DATA):
+		assert not(self.frozen), "The CDFG is frozen, use an overlay to modify it"
+		self.own(*edge_fields)
+		self.edge_src.append(src)
+		self.edge_dst.append(dst)
+		self.edge_kind.append(kind)
+		self.csr = None
+		self.version += 1
+		return len(self.edge_src) - 1
+
+	# function to set the kind of an edge
+	def set_edge_kind(self, edge, kind):
+		assert not(self.frozen), "The CDFG is frozen, use an overlay to modify it"
+		self.own('edge_kind')
+		self.edge_kind[edge] = kind
+		self.version += 1
+
+	# function to freeze the graph: it cannot be modified anymore, but it can be shared by several overlays
+	def freeze(self):
+		self.frozen = True
+		return self
+
+	# function to create a copy-on-write overlay of the graph: the overlay shares the arrays of the graph until it modifies them
+	def overlay(self):
+		overlay = CDFG.__new__(CDFG)
+		overlay.__dict__.update(self.__dict__)
+		overlay.frozen = False
+		overlay.shared_fields = set(node_fields + edge_fields + type_fields)
+		return overlay
+
+	# function to take a private copy of the given fields if they are still shared with a base graph
+	def own(self, *fields):
+		if len(self.shared_fields) == 0:
 			return
-		assert node not in temp_list, 'error - the CDFG graph should not contain not dashed loop back edges!'
-		temp_list.append(node)
-		for e in get_cdfg_edges(cdfg):
-			# skip to visit the dashed edges: they are for sure cyclic
-			if e[0] == node and not ('style' in e.attr and e.attr['style'] == 'dashed'): 
-				visit(e[1])
-		node_list.insert(0, node)
-		temp_list.remove(node)
-	
-	# we call a separate DFS per each node
-	for node in get_cdfg_nodes(cdfg): 
-		if node not in node_list:
-			visit(node)
-	
-	return node_list
+		for field in fields:
+			if field in self.shared_fields:
+				value = getattr(self, field)
+				setattr(self, field, value.copy() if type(value) is dict else value[:])
+				self.shared_fields.discard(field)
+
+	# function to retrieve node ids
+	def nodes(self):
+		return range(len(self.node_names))
+
+	# function to retrieve edge ids, grouped by source node
+	def edges(self):
+		return iter(self.build_csr()[1])
+
+	# function to build the CSR in/out adjacency, the out (in) edges of a node are sorted by destination (source) node, as in graphviz
+	def build_csr(self):
+		if self.csr != None:
+			return self.csr
+		num_nodes = len(self.node_names)
+		# stable counting sort of a sequence of edge ids by one of their endpoints
+		def counting_sort(edges, endpoint):
+			ptr = array('i', [0]) * (num_nodes + 1)
+			for edge in edges:
+				ptr[endpoint[edge] + 1] += 1
+			for node in range(num_nodes):
+				ptr[node + 1] += ptr[node]
+			fill = array('i', ptr)
+			adj = array('i', [0]) * len(edges)
+			for edge in edges:
+				adj[fill[endpoint[edge]]] = edge
+				fill[endpoint[edge]] += 1
+			return ptr, adj
+		all_edges = range(len(self.edge_src))
+		out_ptr, out_edges = counting_sort(counting_sort(all_edges, self.edge_dst)[1], self.edge_src)
+		in_ptr, in_edges = counting_sort(counting_sort(all_edges, self.edge_src)[1], self.edge_dst)
+		self.csr = (out_ptr, out_edges, in_ptr, in_edges)
+		return self.csr
+
+	# function to retrieve edges leaving a node
+	def out_edges(self, node):
+		out_ptr, out_edges = self.build_csr()[0:2]
+		return out_edges[out_ptr[node]:out_ptr[node + 1]]
+
+	# function to retrieve edges entering a node
+	def in_edges(self, node):
+		in_ptr, in_edges = self.build_csr()[2:4]
+		return in_edges[in_ptr[node]:in_ptr[node + 1]]
+
+	# function to retrieve the destination of the edges leaving a node
+	def successors(self, node):
+		return [ self.edge_dst[e] for e in self.out_edges(node) ]
+
+	# function to retrieve the source of the edges entering a node
+	def predecessors(self, node):
+		return [ self.edge_src[e] for e in self.in_edges(node) ]
+
+	# function to check if there is an edge between src and dst
+	def has_edge(self, src, dst):
+		return any(self.edge_dst[e] == dst for e in self.out_edges(src))
+
+	# function to get an attribute of a node, as a string formatted as pygraphviz would do ('' if not set)
+	def get_node_attr(self, node, key):
+		if key == 'type':
+			return self.get_type(node)
+		elif key == 'id':
+			return str(self.node_bb[node]) if self.node_bb[node] >= 0 else ''
+		elif key == 'bbID':
+			return self.bb_labels.get(self.node_bb[node], '')
+		elif key == 'bitwidth':
+			return str(self.node_bitwidth[node]) if self.node_bitwidth[node] >= 0 else ''
+		elif key == 'latency':
+			return str(self.node_start[node]) if self.node_start[node] == self.node_start[node] else '' # nan is not equal to itself
+		return str(self.node_attrs[node].get(key, ''))
+
+	# function to get all the attributes of a node that are set, the label includes the scheduled start time if present
+	def get_node_attrs(self, node):
+		attrs = {}
+		for key in ('id', 'bbID', 'type', 'bitwidth', 'latency'):
+			value = self.get_node_attr(node, key)
+			if value != '':
+				attrs[key] = value
+		for key, value in self.node_attrs[node].items():
+			attrs[key] = str(value)
+		if 'latency' in attrs:
+			attrs['label'] = attrs.get('label', self.node_names[node]) + '\n' + f'[{attrs["latency"]}]'
+		return attrs
+
+	# function to export the graph to a pygraphviz AGraph, with a cluster per BB
+	def to_agraph(self):
+		import pygraphviz as pgv # pygraphviz is only needed at the export boundary
+		agraph = pgv.AGraph(strict=False, directed=True)
+		for node in self.nodes():
+			agraph.add_node(self.node_names[node], **self.get_node_attrs(node))
+		for edge in self.edges():
+			if self.edge_kind[edge] == EDGE_BACK:
+				agraph.add_edge(self.node_names[self.edge_src[edge]], self.node_names[self.edge_dst[edge]], style='dashed')
+			else:
+				agraph.add_edge(self.node_names[self.edge_src[edge]], self.node_names[self.edge_dst[edge]])
+		for bb, bb_label in self.bb_labels.items():
+			bb_nodes = [ self.node_names[node] for node in self.nodes() if self.node_bb[node] == bb ]
+			if len(bb_nodes) > 0:
+				agraph.add_subgraph(bb_nodes, name = f'cluster_{bb_label}', color = 'darkgreen', label = bb_label)
+		return agraph
+
+	# function to draw the graph in an output file
+	def draw(self, output_file, layout='dot'):
+		self.to_agraph().draw(output_file, prog=layout)
+
+	# function to write the DOT representation of the graph in an output file
+	def write(self, output_file):
+		self.to_agraph().write(output_file)
@@ -1,5 +1,28 @@
 import pulp as ilp
 import logging
+import math
+import time
+import numpy as np
+import hashlib
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing
+from queue import Empty
+import os
+import signal
+try: # scipy is only needed by the SCIPY_HIGHS solver
+	from scipy.optimize import milp, LinearConstraint, Bounds
+	from scipy.sparse import csr_array
+except ImportError:
+	milp = None
+# status of a solution found by a solver stopped by its time limit before proving its optimality (pulp has no such status), the solution is valid
+# a solver stopped by its time limit without any solution returns the status `ilp.LpStatusNotSolved`, which does not mean that the ILP is infeasible
+LpStatusNotOptimal = 2
+# statuses of the solutions whose variables hold a valid solution
+solution_statuses = [ilp.LpStatusOptimal, LpStatusNotOptimal]
+# artifact levels: "none" writes no file, "summary" only writes the scheduling summaries, "full" writes every file (ILP formulation, drawings, charts)
+artifact_levels = ["none", "summary", "full"]
+
 # function to check if `n` is a number or not
 def is_number(n):
 	if n == None:
@@ -23,6 +46,7 @@ def is_number(n):
 #				- valid : validity of the objimizaiton function
 #				- function_coeff : output objective function with coefficients
 #				- ilp_obj : ILP object linked to objective function
+#				- version : counter increased at each modification of the objective function
 #				- log: logger object used to output logs
 ############################################################################################################################################
 #	FUNCTIONS:
@@ -43,6 +67,7 @@ class Obj_Function:
 		assert(ilp_obj != None) # ilp_obj represents the ILP object to which the objective function belongs to
 		self.valid = True
 		self.function_coeff = {}
+		self.version = 0
 		self.ilp_obj = ilp_obj
 		ilp_obj.set_objective_function(self)
 		if coeff_dict == None: # the coefficients can be added later on
@@ -54,6 +79,7 @@ class Obj_Function:
 				self.valid = False
 				return
 		self.function_coeff = coeff_dict	
+		self.version += 1
 
 	# function to return validity of the objective function
 	def is_valid(self):
@@ -75,11 +101,13 @@ class Obj_Function:
 			warning_string += "\nOld coefficient : {1}\nNew Coefficient : {2}".format(self.function_coeff[var_name], coeff)
 			self.log.warning(warning_string)
 		self.function_coeff[self.ilp_obj.get_variable(var_name)] = coeff
+		self.version += 1
 	
 	# function to remove a variable from the objective function
 	def remove_variable(self, var_name):
 		assert(var_name in self.function_coeff)
 		del self.function_coeff[var_name]
+		self.version += 1
 
 	# function to get the objective function
 	def get_obj_function(self):
@@ -97,16 +125,30 @@ class Obj_Function:
 ############################################################################################################################################
 #	INFO:
 #				'disequality_signs' is a dictionary that contains allowed signs for constraints
+#				the constraints added in bulk (`add_constraints`) are stored as sparse CSR blocks of NumPy arrays, their LpConstraint objects
+#				are only created when they are needed (pulp model, `get_constraints`)
 ############################################################################################################################################
 #	ATTRIBUTES:
 #				- ilp_obj : ILP object linked to objective function
 #				- constraints : set of constraints
+#				- blocks : blocks of constraints added in bulk (CSR arrays, the removed rows are masked)
+#				- constraint_counter : number of constraints ever added (constraint ids are never reused)
+#				- changes : constraints (or blocks) added, or removed (None), since the last call of `get_changes`
+#				- version : counter increased at each modification of the constraint set
 #				- log: logger object used to output logs
 ############################################################################################################################################
 #	FUNCTIONS:
 #				- add_constraint : add contraint to constraints' set
+#				- add_constraints : add a block of constraints given as sparse NumPy arrays to constraints' set
 #				- remove_constraint : remove constraint from constraints
+#				- set_right_constant : change the right coefficient of a constraint
+#				- set_coefficient : change the coefficient of a variable of a constraint
+#				- get_block : get the block containing a constraint added in bulk
+#				- get_block_constraint : get the LpConstraint object of a row of a block
+#				- get_constraint : get a constraint from its id
 #				- get_constraints : retrieve constraints' set
+#				- get_constraint_arrays : retrieve constraints' set as sparse CSR arrays
+#				- get_changes : retrieve and clear the constraints added or removed since the last call
 ############################################################################################################################################
 ############################################################################################################################################
 
@@ -121,12 +163,17 @@ class Constraint_Set:
 			self.log = logging.getLogger('constraint') # if the logger is not given at object generation, create a new one
 		assert(ilp_obj != None) # ilp_obj represents the ILP object to which the objective function belongs to
 		self.constraints = {}
+		self.blocks = []
+		self.constraint_counter = 0
+		self.changes = {}
+		self.version = 0
+		self.all_constraints = None
 		self.ilp_obj = ilp_obj
 		ilp_obj.set_constraints(self)
 
 	# function to add a new constraint
 	def add_constraint(self, coeff_list, dis_sign, right_constant=0):
-		constraint_id = "c{0}".format(len(self.constraints) + 1)
+		constraint_id = "c{0}".format(self.constraint_counter + 1)
 		constraint = {}
 		for var_name in coeff_list:
 			if not(type(var_name) is str):
@@ -150,16 +197,235 @@ class Constraint_Set:
 		# generation of constraint using the LpConstraint object
 		constraint = ilp.LpConstraint(e=ilp.LpAffineExpression(e=constraint), sense=disequality_signs[dis_sign], name=constraint_id ,rhs=right_constant)
 		self.constraints[constraint_id] = constraint
+		self.changes[constraint_id] = constraint
+		self.constraint_counter += 1
+		self.version += 1
 		return constraint_id
+
+	# function to add a block of constraints `sum(coeffs[k] * var[cols[k]] for k in row r) dis_signs[r] right_constants[r]`
+	# rows, cols and coeffs are the COO entries of the block (row indices start at 0, column indices are the ones of `ILP.get_variable_columns`)
+	# dis_signs is either one disequality sign for all rows, or an array of values of `disequality_signs`
+	# it returns the range of the numbers of the new constraints (their ids are "c" followed by the number), or None if the block is not valid
+	def add_constraints(self, rows, cols, coeffs, dis_signs, right_constants):
+		rows, cols = np.asarray(rows, dtype=np.int64), np.asarray(cols, dtype=np.int64)
+		coeffs, right_constants = np.asarray(coeffs, dtype=np.float64), np.asarray(right_constants, dtype=np.float64)
+		num_rows = len(right_constants)
+		if type(dis_signs) is str:
+			if not(dis_signs in disequality_signs):
+				self.log.error("Disequality sign {0} is not allowerd. Allowed signs = {1}".format(dis_signs, disequality_signs.keys()))
+				return None
+			dis_signs = np.full(num_rows, disequality_signs[dis_signs], dtype=np.int8)
+		dis_signs = np.asarray(dis_signs, dtype=np.int8)
+		# validation of the whole block at once
+		if not(rows.ndim == cols.ndim == coeffs.ndim == dis_signs.ndim == right_constants.ndim == 1) or not(len(rows) == len(cols) == len(coeffs)) or len(dis_signs) != num_rows:
+			self.log.error("The arrays of the block of constraints do not have consistent shapes")
+			return None
+		if len(rows) > 0 and (rows.min() < 0 or rows.max() >= num_rows):
+			self.log.error("Row indices of the block of constraints should be in [0, {0})".format(num_rows))
+			return None
+		variable_list = self.ilp_obj.get_column_variables()
+		if len(cols) > 0 and (cols.min() < 0 or cols.max() >= len(variable_list)):
+			self.log.error("Column indices of the block of constraints should be in [0, {0}) (variables of the ILP object)".format(len(variable_list)))
+			return None
+		if not(np.isin(dis_signs, list(disequality_signs.values())).all()):
+			self.log.error("Disequality signs of the block of constraints should be in {0}".format(list(disequality_signs.values())))
+			return None
+		if not(np.isfinite(coeffs).all()) or not(np.isfinite(right_constants).all()):
+			self.log.error("Coefficients and right coefficients of the block of constraints should be numeric")
+			return None
+		# sparse CSR storage of the block
+		order = np.argsort(rows, kind='stable')
+		indptr = np.zeros(num_rows + 1, dtype=np.int64)
+		np.cumsum(np.bincount(rows, minlength=num_rows), out=indptr[1:])
+		block = {
+			'first' : self.constraint_counter + 1, # number of the first constraint of the block
+			'indptr' : indptr, 'cols' : cols[order], 'coeffs' : coeffs[order], 'signs' : dis_signs, 'rhs' : right_constants,
+			'active' : np.ones(num_rows, dtype=bool), # the removed rows are not active
+			'variables' : variable_list, # variables of the columns
+			'objects' : {} # LpConstraint objects of the rows, created on demand
+		}
+		self.blocks.append(block)
+		self.changes[("block", block['first'])] = block
+		self.constraint_counter += num_rows
+		self.version += 1
+		return range(block['first'], block['first'] + num_rows)
 	
 	# function to remove a constraint
 	def remove_constraint(self, constraint_id):
+		block = self.get_block(constraint_id)
+		if block != None:
+			row = int(constraint_id[1:]) - block['first']
+			assert(block['active'][row])
+			block['active'][row] = False
+			block['objects'].pop(row, None)
+		else:
+			assert(constraint_id in self.constraints)
+			del self.constraints[constraint_id]
+		self.changes[constraint_id] = None
+		self.version += 1
+
+	# function to change the right coefficient of a constraint, only this constraint is then updated in the model
+	def set_right_constant(self, constraint_id, right_constant):
+		if not(is_number(right_constant)):
+			self.log.error("Right Coefficient of the constraint {0} is not numeric".format(right_constant))
+			return
+		block = self.get_block(constraint_id)
+		if block != None:
+			row = int(constraint_id[1:]) - block['first']
+			assert(block['active'][row])
+			block['rhs'][row] = right_constant
+			block['objects'].pop(row, None) # the LpConstraint object is created again with the new right coefficient
+			constraint = self.get_block_constraint(block, row)
+		else:
+			assert(constraint_id in self.constraints)
+			constraint = self.constraints[constraint_id]
+			constraint.constant = -right_constant # pulp stores 'expression + constant sign 0'
+		self.changes[constraint_id] = constraint
+		self.version += 1
+
+	# function to change the coefficient of a variable already present in a constraint, only this constraint is then updated in the model
+	def set_coefficient(self, constraint_id, var_name, coeff):
+		if not(is_number(coeff)):
+			self.log.error("Coefficient {0} of variable {1} is not numeric".format(coeff, var_name))
+			return
+		block = self.get_block(constraint_id)
+		if block != None:
+			row = int(constraint_id[1:]) - block['first']
+			assert(block['active'][row])
+			entries = [ k for k in range(block['indptr'][row], block['indptr'][row + 1]) if block['variables'][block['cols'][k]].name == var_name ]
+			assert(len(entries) == 1) # the variable should be a term of the constraint
+			block['coeffs'][entries[0]] = coeff
+			block['objects'].pop(row, None) # the LpConstraint object is created again with the new coefficient
+			constraint = self.get_block_constraint(block, row)
+		else:
+			assert(constraint_id in self.constraints)
+			constraint = self.constraints[constraint_id]
+			var = self.ilp_obj.get_variable(var_name)
+			assert(var in constraint) # the variable should be a term of the constraint
+			constraint[var] = coeff
+		self.changes[constraint_id] = constraint
+		self.version += 1
+
+	# function to get the block containing a constraint added in bulk (None if it was not added in bulk)
+	def get_block(self, constraint_id):
+		if constraint_id in self.constraints or not(constraint_id[1:].isdigit()):
+			return None
+		number = int(constraint_id[1:])
+		for block in self.blocks:
+			if block['first'] <= number < block['first'] + len(block['rhs']):
+				return block
+		return None
+
+	# function to get the LpConstraint object of a row of a block, it is created once
+	def get_block_constraint(self, block, row):
+		if not(row in block['objects']):
+			start, end = block['indptr'][row], block['indptr'][row + 1]
+			variables = block['variables']
+			expression = ilp.LpAffineExpression(e={ variables[col] : coeff.item() for col, coeff in zip(block['cols'][start:end], block['coeffs'][start:end]) })
+			block['objects'][row] = ilp.LpConstraint(e=expression, sense=block['signs'][row].item(), name="c{0}".format(block['first'] + row), rhs=block['rhs'][row].item())
+		return block['objects'][row]
+
+	# function to get a constraint from its id
+	def get_constraint(self, constraint_id):
+		block = self.get_block(constraint_id)
+		if block != None:
+			row = int(constraint_id[1:]) - block['first']
+			assert(block['active'][row])
+			return self.get_block_constraint(block, row)
 		assert(constraint_id in self.constraints)
-		del self.constraints[constraint_id]
+		return self.constraints[constraint_id]
 
-	# function to retrieve constraints
+	# function to retrieve constraints (dictionary of constraint per id, in the order they were added)
 	def get_constraints(self):
-		return self.constraints
+		if len(self.blocks) == 0:
+			return self.constraints
+		if self.all_constraints == None or self.all_constraints[0] != self.version:
+			numbered = [ (int(constraint_id[1:]), constraint_id, self.constraints[constraint_id]) for constraint_id in self.constraints ]
+			for block in self.blocks:
+				for row in np.flatnonzero(block['active']).tolist():
+					numbered.append((block['first'] + row, None, block))
+			all_constraints = {}
+			for number, constraint_id, constraint in sorted(numbered, key=lambda entry : entry[0]):
+				if constraint_id == None: # row of a block
+					constraint_id = "c{0}".format(number)
+					constraint = self.get_block_constraint(constraint, number - constraint['first'])
+				all_constraints[constraint_id] = constraint
+			self.all_constraints = (self.version, all_constraints)
+		return self.all_constraints[1]
+
+	# function to retrieve constraints as sparse CSR arrays over the given variable columns (dictionary of column per variable name)
+	# it returns the constraint numbers, the row pointers, the column indices, the coefficients, the disequality signs and the right coefficients
+	def get_constraint_arrays(self, var_columns):
+		numbers, row_lengths, cols, coeffs, signs, rhs = [], [], [], [], [], []
+		# constraints added one by one
+		if len(self.constraints) > 0:
+			for constraint_id, constraint in self.constraints.items():
+				terms = list(constraint.items())
+				numbers.append(np.array([int(constraint_id[1:])]))
+				row_lengths.append(np.array([len(terms)]))
+				cols.append(np.array([ var_columns[var.name] for var, _ in terms ], dtype=np.int64))
+				coeffs.append(np.array([ coeff for _, coeff in terms ], dtype=np.float64))
+				signs.append(np.array([constraint.sense], dtype=np.int8))
+				rhs.append(np.array([-constraint.constant], dtype=np.float64))
+		# constraints added in bulk
+		for block in self.blocks:
+			active = block['active']
+			block_cols = block['cols']
+			if block['variables'] is not self.ilp_obj.get_column_variables() or len(block['variables']) != len(var_columns): # columns of another variable list
+				block_cols = np.array([ var_columns.get(var.name, -1) for var in block['variables'] ], dtype=np.int64)[block_cols] # -1: removed variable, only in removed rows
+			row_length = np.diff(block['indptr'])
+			entry_active = np.repeat(active, row_length)
+			numbers.append(block['first'] + np.flatnonzero(active))
+			row_lengths.append(row_length[active])
+			cols.append(block_cols[entry_active])
+			coeffs.append(block['coeffs'][entry_active])
+			signs.append(block['signs'][active])
+			rhs.append(block['rhs'][active])
+		if len(numbers) == 0:
+			return np.zeros(0, dtype=np.int64), np.zeros(1, dtype=np.int64), np.zeros(0, dtype=np.int64), np.zeros(0), np.zeros(0, dtype=np.int8), np.zeros(0)
+		numbers, row_lengths = np.concatenate(numbers), np.concatenate(row_lengths)
+		cols, coeffs, signs, rhs = np.concatenate(cols), np.concatenate(coeffs), np.concatenate(signs), np.concatenate(rhs)
+		# rows sorted by constraint number
+		order = np.argsort(numbers, kind='stable')
+		entry_start = np.cumsum(row_lengths) - row_lengths # first entry of each row, before sorting
+		indptr = np.zeros(len(numbers) + 1, dtype=np.int64)
+		np.cumsum(row_lengths[order], out=indptr[1:])
+		# entry k of sorted row r comes from entry k - indptr[r] + entry_start[order[r]]
+		entry_order = np.arange(len(cols)) + np.repeat(entry_start[order] - indptr[:-1], row_lengths[order])
+		return numbers[order], indptr, cols[entry_order], coeffs[entry_order], signs[order], rhs[order]
+
+	# function to retrieve the changes since the last call (dictionary of constraint per id, None if removed), they are then cleared
+	def get_changes(self):
+		changes = {}
+		for key, change in self.changes.items():
+			if type(key) is tuple: # block of constraints, its (still active) rows are added
+				for row in np.flatnonzero(change['active']).tolist():
+					changes["c{0}".format(change['first'] + row)] = self.get_block_constraint(change, row)
+			else:
+				changes[key] = change
+		self.changes = {}
+		return changes
+
+# function to solve a sub-ILP in a worker process (see `ILP.solve_ilp_parallel`), the sub-ILP is given as plain data so that it can be sent
+# to the process: solver limits, variables as (name, lower bound, upper bound, type), constraints as COO arrays, objective function as (column, coefficient)
+# it returns the status, the value of each variable and the solution time
+def solve_sub_ilp(solver, time_limit, gap_rel, minimize, variables, rows, cols, coeffs, signs, right_constants, objective, initial_values):
+	log = logging.getLogger('sub_ilp')
+	log.setLevel(logging.ERROR) # the status of the sub-ILP is logged by the process that merges the solutions
+	sub_ilp = ILP(solver=solver, minimize=minimize, log=log, artifacts="none")
+	sub_ilp.set_limits(time_limit, gap_rel)
+	for var_name, lower_bound, upper_bound, var_type in variables:
+		sub_ilp.add_variable(var_name, lower_bound, upper_bound, var_type)
+	constraints = Constraint_Set(sub_ilp)
+	constraints.add_constraints(rows, cols, coeffs, signs, right_constants)
+	obj_function = Obj_Function(sub_ilp)
+	for col, coeff in objective:
+		obj_function.add_variable(variables[col][0], coeff)
+	if len(initial_values) > 0:
+		sub_ilp.set_initial_solution(initial_values)
+	status = sub_ilp.solve_ilp()
+	values = { var.name : var.varValue for var in sub_ilp.get_column_variables() } if status in solution_statuses else {}
+	return status, values, sub_ilp.solve_time
 
 ############################################################################################################################################
 ############################################################################################################################################
@@ -171,14 +437,27 @@ class Constraint_Set:
 #				 The following class is used to interact with the ILP formulation
 ############################################################################################################################################
 #	ATTRIBUTES:
-#				- solver : ILP solver
+#				- solver : ILP solver (a pulp solver, or one of the in-process backends of `solver_backends`)
 #				- model_name : name of the ILP model
 #				- model_minimize : model objective function should be minimized or maximized
-#				- model : ILP model
+#				- model : ILP model, it persists between solutions and only the changes are applied to it
+#				- model_constraints : constraint set whose constraints are in the model
+#				- model_objective : objective function (and its version) that is in the model
 #				- variables : ILP variables
 #				- obj_function : objective function
 #				- constraints : constraints set
 #				- status : status of the ILP solution
+#				- backend : in-process backend of the last solution, if the solver is one of `solver_backends`
+#				- column_variables : list of variables in column order (None if it has to be rebuilt)
+#				- artifacts : artifact level, the ILP formulation is only written at level "full"
+#				- initial_solution : True if a starting point is set for the next solution (`set_initial_solution`)
+#				- technique : scheduling technique of the ILP formulation (None if unknown), used by the statistics of the portfolio solver
+#				- time_limit : time limit of the solver in seconds (None if unlimited), the best solution found is then kept with status `LpStatusNotOptimal`
+#				- gap_rel : relative MIP gap at which the solver stops (None for the default gap of the solver)
+#				- solution_cache : Solution_Cache object memoizing the proven solutions by fingerprint (None if disabled)
+#				- components : number of independent components of the last parallel solution (`solve_ilp_parallel`)
+#				- solve_count : number of solutions computed
+#				- solve_time : time spent computing the solutions (in seconds)
 #				- log: logger object used to output logs
 ############################################################################################################################################
 #	FUNCTIONS:
@@ -188,11 +467,24 @@ class Constraint_Set:
 #				- remove_variable : remove an ILP variable
 #				- get_variable : get a variable
 #				- get_variables_list : get the list of variables
+#				- get_column_variables : get the list of variables in column order
+#				- get_variable_columns : get the column of each variable
 #				- set_objective_function : set the objective function
 #				- update_model : update the model with a constraint set and an objective function
+#				- sync_model : apply the changes of the constraint set and of the objective function to the model
+#				- set_initial_solution : set the starting point of the next solution
+#				- set_limits : set the time limit and the relative MIP gap of the solver
+#				- set_solution_cache : set the cache of the solutions
+#				- get_fingerprint : get the canonical fingerprint of the ILP formulation
+#				- load_cached_solution : restore the solution of the ILP formulation from the solution cache
+#				- store_cached_solution : store the solution of the ILP formulation in the solution cache
 #				- solve_ilp	: solve the ILP formulation
+#				- log_status : log the status of a solution that is not optimal
+#				- get_components : get the independent components of the ILP formulation
+#				- get_sub_ilp : get the sub-ILP of some variables and constraints as plain data, to be solved in another process
+#				- solve_ilp_parallel : solve the independent components of the ILP formulation in parallel
 #				- reset_model : reset the ILP model
-#				- print_ilp : print the ILP formulation
+#				- print_ilp : print the ILP formulation (only at artifact level "full")
 #				- get_ilp_solution : get ILP solution
 #				- get_II_solution : get the II of the solution
 #				- get_max_latency_solution : get the maximum latency of the solution
@@ -204,11 +496,21 @@ class Constraint_Set:
 
 class ILP:
 
-	def __init__(self, solver="PULP_CBC_CMD", minimize=True, log=None):
+	def __init__(self, solver="PULP_CBC_CMD", minimize=True, log=None, artifacts="full"):
 		if log != None:
 			self.log = log
 		else:
 			self.log = logging.getLogger('parser') # if the logger is not given at object generation, create a new one
+		assert(artifacts in artifact_levels) # the artifact level chosen must belong to the allowed ones
+		self.artifacts = artifacts
+		self.solve_count = 0
+		self.solve_time = 0.0
+		self.initial_solution = False
+		self.components = None
+		self.technique = None
+		self.time_limit = None
+		self.gap_rel = None
+		self.solution_cache = None
 		self.set_solver(solver)
 		self.model_name = "ILP_model"
 		self.model_minimize = minimize
@@ -220,10 +522,14 @@ class ILP:
 		self.constraints = None
 		self.obj_function = None
 		self.status = None
+		self.backend = None
+		self.model_constraints = None
+		self.model_objective = None
+		self.column_variables = None
 
 	# function to set the solver
 	def set_solver(self, solver="PULP_CBC_CMD"):
-		list_solvers = ilp.listSolvers()
+		list_solvers = ilp.listSolvers() + list(solver_backends)
 		assert(solver in list_solvers) #check that the solver is in the solver list
 		self.solver = solver
 
@@ -242,11 +548,14 @@ class ILP:
 			return
 		var = ilp.LpVariable(var_name, lower_bound, upper_bound, var_type_dic[var_type])
 		self.variables[var_name] = var
+		self.column_variables = None
 	
 	# function to remove an ILP variable
 	def remove_variable(self, var_name):
 		assert(var_name in self.variables) # check that the variable is in the list of variables
 		del self.variables[var_name]
+		self.column_variables = None
+		self.model_constraints = None # the pulp model keeps the variables of its removed constraints, it is rebuilt at the next solution
 
 	# function to get a variable
 	def get_variable(self, var_name):
@@ -257,6 +566,16 @@ class ILP:
 	def get_variables_list(self):
 		return self.variables
 
+	# function to retrieve the list of variables in column order (the order they were added), used by the constraints added in bulk
+	def get_column_variables(self):
+		if self.column_variables == None:
+			self.column_variables = list(self.variables.values())
+		return self.column_variables
+
+	# function to retrieve the column of each variable (dictionary of column per variable name)
+	def get_variable_columns(self):
+		return { var.name : col for col, var in enumerate(self.get_column_variables()) }
+
 	# function to set objective function
 	def set_objective_function(self, obj_function):
 		if not(type(obj_function) is Obj_Function): # check that the objective function is an object of the class Obj_Function
@@ -282,36 +601,264 @@ class ILP:
 		model += obj_function.get_obj_function(), "Objective_Function" # adding objective function in the model
 		return model
 
+	# function to set the starting point of the next solution (dictionary of value per variable name), used by the pulp solvers with warm start
+	def set_initial_solution(self, values):
+		for var_name, value in values.items():
+			self.get_variable(var_name).setInitialValue(value)
+		self.initial_solution = True
+
+	# function to set the time limit (in seconds) and the relative MIP gap of the solver, None for no limit or the default gap
+	def set_limits(self, time_limit=None, gap_rel=None):
+		assert(time_limit == None or time_limit > 0) # the solver should be given some time
+		assert(gap_rel == None or gap_rel >= 0) # the gap is a nonnegative fraction of the objective value
+		self.time_limit = time_limit
+		self.gap_rel = gap_rel
+
+	# function to set the cache of the solutions (None to disable it)
+	def set_solution_cache(self, solution_cache):
+		self.solution_cache = solution_cache
+
+	# function to get the canonical fingerprint of the ILP formulation: it depends on the variables, the constraints and the objective function,
+	# but not on the ids of the constraints nor on the order of insertion of the variables and the constraints
+	def get_fingerprint(self):
+		variables = self.get_column_variables()
+		var_names = [ var.name for var in variables ]
+		numbers, indptr, cols, coeffs, signs, rhs = self.constraints.get_constraint_arrays(self.get_variable_columns())
+		cols, coeffs, indptr, signs, rhs = cols.tolist(), coeffs.tolist(), indptr.tolist(), signs.tolist(), rhs.tolist()
+		rows = []
+		for row in range(len(numbers)):
+			terms = sorted([ (var_names[col], coeff) for col, coeff in zip(cols[indptr[row]:indptr[row + 1]], coeffs[indptr[row]:indptr[row + 1]]) if coeff != 0 and col >= 0 ])
+			sign, row_rhs = signs[row], rhs[row]
+			# `expr <= rhs` is written `-expr >= -rhs`, and `expr == rhs` with a positive first coefficient
+			if sign == ilp.LpConstraintLE or (sign == ilp.LpConstraintEQ and len(terms) > 0 and terms[0][1] < 0):
+				terms, sign, row_rhs = [ (var_name, -coeff) for var_name, coeff in terms ], -sign, -row_rhs
+			rows.append((tuple([ (var_name, coeff + 0.0) for var_name, coeff in terms ]), sign, row_rhs + 0.0)) # + 0.0 turns -0.0 into 0.0
+		rows.sort()
+		var_description = sorted([ (var.name, None if var.lowBound is None else float(var.lowBound), None if var.upBound is None else float(var.upBound), var.cat) for var in variables ])
+		objective = sorted([ (var.name, float(coeff)) for var, coeff in self.obj_function.function_coeff.items() if coeff != 0 ])
+		return hashlib.sha256(repr((self.model_minimize, var_description, rows, objective)).encode()).hexdigest()
+
+	# function to restore the solution of the ILP formulation from the solution cache, it returns the fingerprint of the ILP formulation and
+	# True if the solution is restored (its status is then the status of the ILP object)
+	def load_cached_solution(self):
+		fingerprint = self.get_fingerprint()
+		solution = self.solution_cache.load(fingerprint)
+		if solution == None:
+			return fingerprint, False
+		self.status, values = solution
+		for var_name, value in values.items():
+			self.variables[var_name].varValue = value
+		self.initial_solution = False
+		self.log.debug("Solution of the ILP formulation {0} restored from the solution cache (status {1})".format(fingerprint[:16], self.status))
+		return fingerprint, True
+
+	# function to store the solution of the ILP formulation in the solution cache, only if it is proven (optimal or infeasible): the solvers also
+	# report the solutions found within the MIP gap or at the time limit as optimal, they are not stored (the fingerprint ignores the limits)
+	def store_cached_solution(self, fingerprint):
+		if self.status == ilp.LpStatusOptimal and self.gap_rel == None and self.time_limit == None:
+			self.solution_cache.store(fingerprint, (self.status, { var_name : var.varValue for var_name, var in self.variables.items() }))
+		elif self.status == ilp.LpStatusInfeasible:
+			self.solution_cache.store(fingerprint, (self.status, {}))
+
 	# function to solve the ILP formulation
 	def solve_ilp(self):
-		self.reset_model()
-		self.model = self.update_model(self.model, self.constraints, self.obj_function)
-		solver = ilp.getSolver(self.get_solver(), msg=0) # msg=0 enforces no output of the ILP solver
-		self.status = self.model.solve(solver)
-		if(self.status != 1):
-			self.log.warning("ILP problem cannot be solved (Status {0})\t['-1': infeasible, '-2': unbounded, '-3': undefined]".format(self.status))
+		if self.solution_cache != None:
+			fingerprint, cached = self.load_cached_solution()
+			if cached:
+				return self.status
+		start_time = time.perf_counter()
+		if self.get_solver() in solver_backends: # solved in process, without pulp model
+			assert(not(self.constraints is None)) # check that constraints' set is not None
+			assert(not(self.obj_function is None) and self.obj_function.is_valid()) # check the objective function is not None and the objective function is valid
+			self.backend = solver_backends[self.get_solver()](self, log=self.log)
+			self.status = self.backend.solve()
+			problem_name = self.get_solver()
+		else:
+			self.sync_model()
+			warm_start = self.status in solution_statuses or self.initial_solution # the previous (or the given) solution is the starting point of the solver
+			self.initial_solution = False
+			limits = {}
+			if self.time_limit != None:
+				limits["timeLimit"] = self.time_limit
+			if self.gap_rel != None:
+				limits["gapRel"] = self.gap_rel
+			solver = ilp.getSolver(self.get_solver(), msg=0, warmStart=warm_start, **limits) # msg=0 enforces no output of the ILP solver
+			self.status = self.model.solve(solver)
+			problem_name = "ILP"
+			if self.status == ilp.LpStatusOptimal and self.model.sol_status == ilp.LpSolutionIntegerFeasible: # stopped by the time limit with a solution
+				self.status = LpStatusNotOptimal
+			if self.status in solution_statuses: # a fixed variable whose constraints have been dropped can be out of the model, its value is its bound
+				for var in self.get_column_variables():
+					if var.lowBound is not None and var.lowBound == var.upBound:
+						var.varValue = var.lowBound
+		self.solve_count += 1
+		self.solve_time += time.perf_counter() - start_time
+		self.log_status(problem_name)
+		if self.solution_cache != None:
+			self.store_cached_solution(fingerprint)
+		return self.status
+
+	# function to log the status of a solution that is not optimal
+	def log_status(self, problem_name):
+		if self.status == LpStatusNotOptimal:
+			self.log.warning("{0} problem: the time limit of {1} s is reached, the best solution found is not proven optimal".format(problem_name, self.time_limit))
+		elif self.status == ilp.LpStatusNotSolved:
+			self.log.warning("{0} problem: no solution found within the time limit of {1} s (the problem is not proven infeasible)".format(problem_name, self.time_limit))
+		elif(self.status != 1):
+			self.log.warning("{0} problem cannot be solved (Status {1})\t['-1': infeasible, '-2': unbounded, '-3': undefined]".format(problem_name, self.status))
+
+	# function to get the independent components of the ILP formulation: the variables of a constraint are in the same component
+	# it returns the columns of the variables of each component, and the component of each column
+	def get_components(self):
+		num_cols = len(self.get_column_variables())
+		_, indptr, cols, _, _, _ = self.constraints.get_constraint_arrays(self.get_variable_columns())
+		parent = list(range(num_cols)) # union-find forest of the columns
+		def find(col):
+			while parent[col] != col:
+				parent[col] = parent[parent[col]]
+				col = parent[col]
+			return col
+		cols, indptr = cols.tolist(), indptr.tolist()
+		for row in range(len(indptr) - 1):
+			row_cols = [ col for col in cols[indptr[row]:indptr[row + 1]] if col >= 0 ]
+			for col in row_cols[1:]:
+				root, other_root = find(row_cols[0]), find(col)
+				if root != other_root:
+					parent[other_root] = root
+		components, component_ids = [], {}
+		col_components = []
+		for col in range(num_cols):
+			root = find(col)
+			if not(root in component_ids):
+				component_ids[root] = len(components)
+				components.append([])
+			components[component_ids[root]].append(col)
+			col_components.append(component_ids[root])
+		return components, col_components
+
+	# function to get the sub-ILP of some columns and of the rows selected by row_mask as plain data, the arguments of `solve_sub_ilp` after the solver
+	# constraint_arrays are the arrays of `Constraint_Set.get_constraint_arrays` for the columns of `get_variable_columns`
+	def get_sub_ilp(self, sub_cols, row_mask, constraint_arrays):
+		_, indptr, cols, coeffs, signs, rhs = constraint_arrays
+		variables = self.get_column_variables()
+		var_columns = self.get_variable_columns()
+		var_types = { ilp.LpInteger : 'i', ilp.LpContinuous : 'c' }
+		row_lengths = np.diff(indptr)
+		local_cols = np.full(len(variables), -1, dtype=np.int64) # column of each variable in the sub-ILP (-1 if not in the sub-ILP)
+		local_cols[sub_cols] = np.arange(len(sub_cols))
+		sub_rows = np.flatnonzero(row_mask)
+		local_rows = np.full(len(rhs), -1, dtype=np.int64)
+		local_rows[sub_rows] = np.arange(len(sub_rows))
+		entries = np.flatnonzero(np.repeat(row_mask, row_lengths))
+		entry_rows = np.repeat(np.arange(len(rhs)), row_lengths)[entries]
+		return (self.time_limit, self.gap_rel, self.model_minimize,
+			[ (variables[col].name, variables[col].lowBound, variables[col].upBound, var_types[variables[col].cat]) for col in sub_cols ],
+			local_rows[entry_rows], local_cols[cols[entries]], coeffs[entries], signs[sub_rows], rhs[sub_rows],
+			[ (int(local_cols[var_columns[var.name]]), coeff) for var, coeff in self.obj_function.function_coeff.items() if local_cols[var_columns[var.name]] >= 0 ],
+			{ variables[col].name : variables[col].varValue for col in sub_cols if variables[col].varValue != None } if self.initial_solution else {})
+
+	"""
+	Solves the ILP formulation by solving its independent components in parallel in a pool of worker processes, the solutions of the components
+	are then merged in the variables of the ILP object, as if the ILP formulation was solved at once. The components are grouped in at most
+	`workers` sub-ILPs of similar size, each one solved by the solver of the ILP object in its own process
+	@param workers: number of worker processes, the ILP formulation is solved at once if it is 1 or if it has a single component
+	"""
+	def solve_ilp_parallel(self, workers):
+		assert(not(self.constraints is None)) # check that constraints' set is not None
+		assert(not(self.obj_function is None) and self.obj_function.is_valid()) # check the objective function is not None and the objective function is valid
+		if workers <= 1 or self.get_solver() == "PORTFOLIO": # the portfolio already solves the ILP formulation in several processes
+			return self.solve_ilp()
+		start_time = time.perf_counter()
+		components, col_components = self.get_components()
+		self.components = len(components)
+		if len(components) <= 1:
+			return self.solve_ilp()
+		if self.solution_cache != None:
+			fingerprint, cached = self.load_cached_solution()
+			if cached:
+				return self.status
+		constraint_arrays = self.constraints.get_constraint_arrays(self.get_variable_columns())
+		numbers, indptr, cols, _, _, _ = constraint_arrays
+		row_lengths = np.diff(indptr)
+		# component of each row (the rows without variable are constant constraints, they are kept in the first component)
+		row_components = [ col_components[cols[indptr[row]]] if row_lengths[row] > 0 else 0 for row in range(len(numbers)) ]
+		# the largest components are assigned first to the least loaded group
+		component_sizes = [ len(component) for component in components ]
+		for component in row_components:
+			component_sizes[component] += 1
+		groups = [ [] for _ in range(min(workers, len(components))) ]
+		loads = [ 0 ] * len(groups)
+		for component in sorted(range(len(components)), key=lambda component : -component_sizes[component]):
+			group = loads.index(min(loads))
+			groups[group].append(component)
+			loads[group] += component_sizes[component]
+		group_of_component = {}
+		for group, group_components in enumerate(groups):
+			for component in group_components:
+				group_of_component[component] = group
+		row_groups = np.array([ group_of_component[component] for component in row_components ], dtype=np.int64)
+		tasks = []
+		for group, group_components in enumerate(groups):
+			group_cols = sorted([ col for component in group_components for col in components[component] ])
+			tasks.append((self.get_solver(),) + self.get_sub_ilp(group_cols, row_groups == group, constraint_arrays))
+		self.initial_solution = False
+		with ProcessPoolExecutor(max_workers=len(tasks)) as pool:
+			results = list(pool.map(solve_sub_ilp, *zip(*tasks)))
+		# the ILP formulation is optimal if every component is optimal, otherwise its status is the one of the worst component:
+		# infeasible, then failed, then not optimal
+		status_order = lambda status : 0 if status == ilp.LpStatusInfeasible else 1 if not(status in solution_statuses) else 2 if status == LpStatusNotOptimal else 3
+		self.status = min([ status for status, _, _ in results ], key=status_order)
+		for _, values, _ in results:
+			for var_name, value in values.items():
+				self.variables[var_name].varValue = value
+		self.solve_count += 1
+		self.solve_time += time.perf_counter() - start_time
+		self.log.debug("{0} independent components solved in {1} processes (longest sub-ILP solution: {2:.4f} s)".format(len(components), len(tasks), max([ solve_time for _, _, solve_time in results ])))
+		self.log_status("ILP")
+		if self.solution_cache != None:
+			self.store_cached_solution(fingerprint)
 		return self.status
 
+	# function to apply the changes of the constraint set and of the objective function to the model, the model is only rebuilt for a new constraint set
+	def sync_model(self):
+		assert(not(self.constraints is None)) # check that constraints' set is not None
+		assert(not(self.obj_function is None) and self.obj_function.is_valid()) # check the objective function is not None and the objective function is valid
+		if not(self.model_constraints is self.constraints):
+			self.reset_model()
+			self.constraints.get_changes() # all the constraints are added to the new model
+			self.model = self.update_model(self.model, self.constraints, self.obj_function)
+			self.model_constraints = self.constraints
+			self.model_objective = (self.obj_function, self.obj_function.version)
+			return
+		for constraint_id, constraint in self.constraints.get_changes().items():
+			self.model.constraints.pop(constraint_id, None) # the constraint is removed, or replaced
+			if constraint is not None:
+				self.model += constraint, constraint_id
+		if self.model_objective != (self.obj_function, self.obj_function.version):
+			self.model.setObjective(self.obj_function.get_obj_function())
+			self.model_objective = (self.obj_function, self.obj_function.version)
+
 	# function to reset the ILP model
 	def reset_model(self):
 		if self.model_minimize:
 			self.model = ilp.LpProblem(self.model_name, ilp.LpMinimize)
 		else:
 			self.model = ilp.LpProblem(self.model_name, ilp.LpMaximize)
+		self.model_constraints = None
+		self.model_objective = None
 
-	# function to print the ILP formulation
+	# function to print the ILP formulation (the model is the one that is solved, not a copy)
 	def print_ilp(self, output_file="output.lp"):
-		if self.model_minimize:
-			model = ilp.LpProblem(self.model_name, ilp.LpMinimize)
-		else:
-			model = ilp.LpProblem(self.model_name, ilp.LpMaximize)
-		model = self.update_model(model, self.constraints, self.obj_function)
-		model.writeLP(output_file)
+		if self.artifacts != "full":
+			return
+		self.sync_model()
+		self.model.objective.name = "Objective_Function" # the pulp solvers rename the objective function of the model they solve
+		self.model.writeLP(output_file)
 		self.log.info("The ILP formulation is written in "+output_file)
 
 	# function to get ILP solution
 	def get_ilp_solution(self):
-		assert self.status != None and self.status == 1, "The function `solve_ilp` has to be called before using `get_ilp_solution` and its result has to be valid" # check that the ILP solution is valid
+		assert self.status != None and self.status in solution_statuses, "The function `solve_ilp` has to be called before using `get_ilp_solution` and its result has to be valid" # check that the ILP solution is valid
 		result = {}
 		for var_name in self.variables:
 			result[var_name] = self.variables[var_name].varValue
@@ -319,13 +866,13 @@ class ILP:
 
 	# function to get ILP solution II
 	def get_II_solution(self):
-		assert self.status != None and self.status == 1, "The function `solve_ilp` has to be called before using `get_ilp_solution` and its result has to be valid" # check that the ILP solution is valid
+		assert self.status != None and self.status in solution_statuses, "The function `solve_ilp` has to be called before using `get_ilp_solution` and its result has to be valid" # check that the ILP solution is valid
 		assert "II" in self.variables, "II should be initiated as a variable in the ILP"
 		return self.variables["II"].varValue
 
 	# function to get ILP solution max_latency
 	def get_max_latency_solution(self):
-		assert self.status != None and self.status == 1, "The function `solve_ilp` has to be called before using `get_ilp_solution` and its result has to be valid" # check that the ILP solution is valid
+		assert self.status != None and self.status in solution_statuses, "The function `solve_ilp` has to be called before using `get_ilp_solution` and its result has to be valid" # check that the ILP solution is valid
 		max_latency = -1
 		for var_name in self.variables:
 			if var_name != "II" and self.variables[var_name].varValue > max_latency:
@@ -335,7 +882,7 @@ class ILP:
 
 	# function to get ILP solution variables whose value is equal to a certain value 
 	def get_variables_solution(self, clock):
-		assert self.status != None and self.status == 1, "The function `solve_ilp` has to be called before using `get_ilp_solution` and its result has to be valid" # check that the ILP solution is valid
+		assert self.status != None and self.status in solution_statuses, "The function `solve_ilp` has to be called before using `get_ilp_solution` and its result has to be valid" # check that the ILP solution is valid
 		result = []
 		for var_name in self.variables:
 			if var_name != "II" and self.variables[var_name].varValue == clock:
@@ -344,7 +891,492 @@ class ILP:
 
 	# function to get ILP solution of the timing of an operation
 	def get_operation_timing_solution(self, operation):
-		assert self.status != None and self.status == 1, "The function `solve_ilp` has to be called before using `get_ilp_solution` and its result has to be valid" # check that the ILP solution is valid
+		assert self.status != None and self.status in solution_statuses, "The function `solve_ilp` has to be called before using `get_ilp_solution` and its result has to be valid" # check that the ILP solution is valid
 		var_name = f'sv{operation}'
 		assert var_name in self.variables, "{var_name} should be initiated as a variable in the ILP"
-		return self.variables[var_name].varValue
\ No newline at end of file
+		return self.variables[var_name].varValue
+############################################################################################################################################
+############################################################################################################################################
+#
+#	`SDC_ENGINE` CLASS
+#
+############################################################################################################################################
+#	DESCRIPTION:
+#				 The following class solves the ILP formulation without an ILP solver when it is a system of difference constraints
+#				 (each constraint has the form `sv_b - sv_a >= c`, or bounds a single variable). The constraints are the edges of a constraint graph,
+#				 the minimum (ASAP) solution is given by the longest paths from a zero node and the maximum (ALAP) solution by the longest paths
+#				 in the reversed graph. The longest paths are computed with SPFA (queue-based Bellman-Ford), a positive cycle of the constraint
+#				 graph means that the constraints are infeasible
+############################################################################################################################################
+#	INFO:
+#				it is selected with the solver name "SDC" (see `solver_backends`)
+#				'zero_node_name' is the name of the node of the constraint graph representing the constant 0
+############################################################################################################################################
+#	ATTRIBUTES:
+#				- ilp_obj : ILP object whose variables, constraints and objective function are solved
+#				- var_names : name of each node of the constraint graph (node 0 is the zero node)
+#				- var_ids : dictionary of node per variable name
+#				- is_integer : the variable of each node is an integer
+#				- edges : edges of the constraint graph, (src, dst, weight, constraint id or bound) meaning `dst - src >= weight`
+#				- status : status of the solution (same codes as pulp)
+#				- infeasible_cycle : names of the constraints forming the positive cycle, if the constraints are infeasible
+#				- log: logger object used to output logs
+############################################################################################################################################
+#	FUNCTIONS:
+#				- build_graph : build the constraint graph from the variables and the constraint set of the ILP object
+#				- is_difference_constraint : check if a constraint is a difference constraint (or a bound)
+#				- add_constraint : add the edges of a constraint to the constraint graph
+#				- add_edge : add the edge of a difference constraint to the constraint graph
+#				- get_constraint_description : get the description of the constraint of an edge
+#				- get_longest_paths : compute the longest paths in the constraint graph (SPFA), or return a positive cycle
+#				- get_pred_cycle : find a cycle in the graph of the predecessors of the longest paths
+#				- get_min_solution : get the minimum solution of the constraints (every variable as small as possible)
+#				- get_max_solution : get the maximum solution of the constraints (every variable as large as possible)
+#				- get_bounds : get the bounds of the variables implied by the difference constraints
+#				- solve : solve the ILP formulation and write the solution in the ILP variables
+#				- get_infeasible_cycle : get the names of the constraints forming the positive cycle
+############################################################################################################################################
+############################################################################################################################################
+
+zero_node_name = "_zero_"
+
+class SDC_Engine:
+
+	def __init__(self, ilp_obj, log=None):
+		if log != None:
+			self.log = log
+		else:
+			self.log = logging.getLogger('sdc_engine') # if the logger is not given at object generation, create a new one
+		assert(ilp_obj != None) # ilp_obj represents the ILP object to be solved
+		self.ilp_obj = ilp_obj
+		self.var_names = [zero_node_name]
+		self.var_ids = {}
+		self.is_integer = [True]
+		self.edges = []
+		self.status = None
+		self.infeasible_cycle = None
+
+	# function to build the constraint graph, it returns False if a constraint is not a difference constraint
+	# in a relaxation, the constraints that are not difference constraints are skipped instead
+	def build_graph(self, relaxation=False):
+		variables = self.ilp_obj.get_column_variables()
+		self.var_names = [zero_node_name] + [ var.name for var in variables ]
+		self.var_ids = { var_name : node for node, var_name in enumerate(self.var_names) }
+		self.is_integer = [True] + [ var.cat == ilp.LpInteger for var in variables ] # the zero node is an integer constant
+		self.edges = []
+		for node, var in enumerate(variables, 1):
+			if var.lowBound != None:
+				self.add_edge([(node, 1)], var.lowBound, "lower bound of {0}".format(var.name))
+			if var.upBound != None:
+				self.add_edge([(node, -1)], -var.upBound, "upper bound of {0}".format(var.name))
+		# the constraints are read as sparse arrays, the nodes of the variables are their columns + 1
+		numbers, indptr, cols, coeffs, signs, rhs = self.ilp_obj.constraints.get_constraint_arrays(self.ilp_obj.get_variable_columns())
+		nodes, coeffs, indptr = (cols + 1).tolist(), coeffs.tolist(), indptr.tolist()
+		for row, (number, sign, row_rhs) in enumerate(zip(numbers.tolist(), signs.tolist(), rhs.tolist())):
+			terms = [ (node, coeff) for node, coeff in zip(nodes[indptr[row]:indptr[row + 1]], coeffs[indptr[row]:indptr[row + 1]]) if coeff != 0 ]
+			if relaxation and not(self.is_difference_constraint(terms)):
+				continue
+			if not(self.add_constraint("c{0}".format(number), terms, sign, row_rhs)):
+				return False
+		return True
+
+	# function to check if the constraint of the terms (nodes or variables, and coefficients) is a difference constraint, or a bound
+	def is_difference_constraint(self, terms):
+		return len(terms) <= 1 or (len(terms) == 2 and terms[0][1] == -terms[1][1])
+
+	# function to add the edges of the constraint `sum(coeff * var) sign rhs`, it returns False if it is not a difference constraint
+	def add_constraint(self, constraint_id, terms, sign, rhs):
+		if sign in (ilp.LpConstraintGE, ilp.LpConstraintEQ):
+			if not(self.add_edge(terms, rhs, constraint_id)):
+				return False
+		if sign in (ilp.LpConstraintLE, ilp.LpConstraintEQ): # `expr <= rhs` is `-expr >= -rhs`
+			if not(self.add_edge([ (node, -coeff) for node, coeff in terms ], -rhs, constraint_id)):
+				return False
+		return True
+
+	# function to add the edge of the constraint `sum(coeff * var) >= rhs` (terms of nodes and coefficients), it returns False if it is not a difference constraint
+	def add_edge(self, terms, rhs, constraint_name):
+		if len(terms) == 0: # constant constraint `0 >= rhs`, a self loop on the zero node (a positive cycle if it is violated)
+			src, dst, coeff = 0, 0, 1
+		elif len(terms) == 1 and terms[0][1] > 0: # `var - 0 >= rhs / coeff`
+			src, dst, coeff = 0, terms[0][0], terms[0][1]
+		elif len(terms) == 1: # `0 - var >= rhs / |coeff|`
+			src, dst, coeff = terms[0][0], 0, -terms[0][1]
+		elif len(terms) == 2 and terms[0][1] == -terms[1][1]: # `dst - src >= rhs / coeff`
+			(src, _), (dst, coeff) = sorted(terms, key=lambda term : term[1])
+		else:
+			self.log.error("Constraint {0} is not a difference constraint, it cannot be solved by the SDC engine".format(self.get_constraint_description(constraint_name)))
+			return False
+		weight = rhs / coeff
+		if self.is_integer[src] and self.is_integer[dst]: # integer variables can only satisfy an integer bound
+			weight = math.ceil(weight - 1e-9)
+		self.edges.append((src, dst, weight, constraint_name))
+		return True
+
+	# function to get the description of the constraint of an edge (a bound, or a constraint id with its expression)
+	def get_constraint_description(self, constraint_name):
+		if " " in constraint_name: # bound of a variable
+			return constraint_name
+		return "{0}: {1}".format(constraint_name, self.ilp_obj.constraints.get_constraint(constraint_name))
+
+	# function to compute (in place) the longest paths from the nodes whose distance is not None, through the given edges
+	# the nodes in `fixed` keep their distance. It returns the edge ids of a positive cycle, or None if there is none
+	def get_longest_paths(self, edges, dist, fixed=()):
+		num_nodes = len(dist)
+		out_adj = [ [] for _ in range(num_nodes) ]
+		for e, (src, dst, _, _) in enumerate(edges):
+			if not(dst in fixed):
+				out_adj[src].append(e)
+		in_queue = [ d != None for d in dist ]
+		queue = deque([ node for node in range(num_nodes) if in_queue[node] ])
+		enqueued = [0] * num_nodes
+		pred = [None] * num_nodes
+		while len(queue) > 0:
+			node = queue.popleft()
+			in_queue[node] = False
+			for e in out_adj[node]:
+				_, dst, weight, _ = edges[e]
+				if dist[dst] != None and dist[node] + weight <= dist[dst]:
+					continue
+				dist[dst] = dist[node] + weight
+				pred[dst] = e
+				if not(in_queue[dst]):
+					enqueued[dst] += 1
+					if enqueued[dst] >= num_nodes: # without positive cycle, a node is enqueued at most num_nodes-1 times
+						cycle = self.get_pred_cycle(edges, pred)
+						if cycle != None:
+							return cycle
+					in_queue[dst] = True
+					queue.append(dst)
+		return None
+
+	# function to find a cycle in the graph of the predecessor edges, it returns its edge ids (None if there is no cycle)
+	def get_pred_cycle(self, edges, pred):
+		state = [0] * len(pred) # 0: not visited, 1: on the current walk, 2: visited
+		for start in range(len(pred)):
+			walk, node = [], start
+			while node != None and state[node] == 0:
+				state[node] = 1
+				walk.append(node)
+				node = None if pred[node] == None else edges[pred[node]][0]
+			if node != None and state[node] == 1: # the walk came back on itself
+				cycle = walk[walk.index(node):]
+				return [ pred[n] for n in reversed(cycle) ]
+			for n in walk:
+				state[n] = 2
+		return None
+
+	# function to get the minimum solution (longest paths from the zero node), it returns the value of each node and a positive cycle (or None)
+	def get_min_solution(self):
+		dist = [0] + [None] * (len(self.var_names) - 1)
+		cycle = self.get_longest_paths(self.edges, dist)
+		return dist, cycle
+
+	# function to get the maximum solution, it returns the value of each node and a positive cycle (or None)
+	def get_max_solution(self):
+		# `dst - src >= weight` is `(-src) - (-dst) >= weight`: the maximum solution is the opposite of the minimum one of the reversed graph
+		reversed_edges = [ (dst, src, weight, name) for src, dst, weight, name in self.edges ]
+		dist = [0] + [None] * (len(self.var_names) - 1)
+		cycle = self.get_longest_paths(reversed_edges, dist)
+		return [ None if d == None else -d for d in dist ], cycle
+
+	# function to get the bounds of the variables implied by the difference constraints (the other constraints are relaxed)
+	# it returns a dictionary of (lower bound, upper bound) per variable name (None if unbounded), or None if the difference constraints are infeasible
+	def get_bounds(self):
+		self.infeasible_cycle = None
+		self.build_graph(relaxation=True)
+		lower, cycle = self.get_min_solution()
+		if cycle == None:
+			upper, cycle = self.get_max_solution()
+		if cycle != None:
+			self.infeasible_cycle = [ self.get_constraint_description(self.edges[e][3]) for e in cycle ]
+			return None
+		return { self.var_names[node] : (lower[node], upper[node]) for node in range(1, len(self.var_names)) }
+
+	# function to solve the ILP formulation, the solution is written in the variables of the ILP object and the status is returned
+	def solve(self):
+		self.infeasible_cycle = None
+		if not(self.build_graph()):
+			self.status = ilp.LpStatusUndefined
+			return self.status
+		# weight of each node in the objective function to be minimized
+		weights = [0] * len(self.var_names)
+		for var, coeff in self.ilp_obj.obj_function.function_coeff.items():
+			weights[self.var_ids[var.name]] = coeff if self.ilp_obj.model_minimize else -coeff
+		if all([ w >= 0 for w in weights ]): # e.g. ASAP: the minimum solution is optimal
+			dist, cycle = self.get_min_solution()
+		elif all([ w <= 0 for w in weights ]): # e.g. ALAP: the maximum solution is optimal
+			dist, cycle = self.get_max_solution()
+			if cycle == None: # the nodes that are not in the objective function are then set as small as possible
+				fixed = set([0] + [ node for node in range(1, len(dist)) if weights[node] != 0 ])
+				max_dist, dist = dist, [ d if node in fixed else None for node, d in enumerate(dist) ]
+				cycle = self.get_longest_paths(self.edges, dist, fixed)
+				dist = [ max_d if d == None else d for d, max_d in zip(dist, max_dist) ]
+		else:
+			self.log.error("The objective function mixes positive and negative coefficients, it cannot be solved by the SDC engine")
+			self.status = ilp.LpStatusUndefined
+			return self.status
+		if cycle != None:
+			self.infeasible_cycle = [ self.get_constraint_description(self.edges[e][3]) for e in cycle ]
+			self.log.warning("The difference constraints are infeasible, positive cycle:\n\t{0}".format("\n\t".join(self.infeasible_cycle)))
+			self.status = ilp.LpStatusInfeasible
+			return self.status
+		unbounded = [ self.var_names[node] for node, d in enumerate(dist) if d == None ]
+		if len(unbounded) > 0:
+			self.log.warning("The variables {0} are not bounded by the difference constraints".format(unbounded))
+			self.status = ilp.LpStatusUnbounded
+			return self.status
+		variables = self.ilp_obj.get_variables_list()
+		for node in range(1, len(dist)):
+			variables[self.var_names[node]].varValue = float(dist[node])
+		self.status = ilp.LpStatusOptimal
+		return self.status
+
+	# function to get the names of the constraints forming the positive cycle (None if the constraints are feasible)
+	def get_infeasible_cycle(self):
+		return self.infeasible_cycle
+
+############################################################################################################################################
+############################################################################################################################################
+#
+#	`HIGHS_BACKEND` CLASS
+#
+############################################################################################################################################
+#	DESCRIPTION:
+#				 The following class solves the ILP formulation in process with HiGHS, through `scipy.optimize.milp`. The constraint set is
+#				 converted into a sparse constraint matrix, there is no temporary file and no solver subprocess
+############################################################################################################################################
+#	INFO:
+#				it is selected with the solver name "SCIPY_HIGHS" (see `solver_backends`), scipy (>= 1.9) is only needed when it is used
+#				'milp_status' is a dictionary that associates the status of `scipy.optimize.milp` to the status of pulp
+#				the time limit and the relative MIP gap of the ILP object are passed to HiGHS
+############################################################################################################################################
+#	ATTRIBUTES:
+#				- ilp_obj : ILP object whose variables, constraints and objective function are solved
+#				- status : status of the solution (same codes as pulp)
+#				- log: logger object used to output logs
+############################################################################################################################################
+#	FUNCTIONS:
+#				- get_constraint_matrix : build the sparse constraint matrix and the bounds of its rows
+#				- solve : solve the ILP formulation and write the solution in the ILP variables
+############################################################################################################################################
+############################################################################################################################################
+
+milp_status = {0: ilp.LpStatusOptimal, 1: ilp.LpStatusNotSolved, 2: ilp.LpStatusInfeasible, 3: ilp.LpStatusUnbounded, 4: ilp.LpStatusUndefined}
+
+class HiGHS_Backend:
+
+	def __init__(self, ilp_obj, log=None):
+		if log != None:
+			self.log = log
+		else:
+			self.log = logging.getLogger('highs') # if the logger is not given at object generation, create a new one
+		assert(ilp_obj != None) # ilp_obj represents the ILP object to be solved
+		self.ilp_obj = ilp_obj
+		self.status = None
+
+	# function to build the constraint matrix (one row per constraint, one column per variable) and the lower and upper bounds of its rows
+	def get_constraint_matrix(self, var_columns):
+		_, indptr, cols, coeffs, signs, rhs = self.ilp_obj.constraints.get_constraint_arrays(var_columns)
+		row_lb = np.where(signs != ilp.LpConstraintLE, rhs, -np.inf)
+		row_ub = np.where(signs != ilp.LpConstraintGE, rhs, np.inf)
+		matrix = csr_array((coeffs, cols, indptr), shape=(len(rhs), len(var_columns)))
+		return matrix, row_lb, row_ub
+
+	# function to solve the ILP formulation, the solution is written in the variables of the ILP object and the status is returned
+	def solve(self):
+		if milp is None:
+			self.log.error("The SCIPY_HIGHS solver requires scipy (>= 1.9)")
+			self.status = ilp.LpStatusUndefined
+			return self.status
+		variables = self.ilp_obj.get_column_variables()
+		var_columns = self.ilp_obj.get_variable_columns()
+		# objective function (always minimized)
+		sign = 1 if self.ilp_obj.model_minimize else -1
+		cost = np.zeros(len(variables))
+		for var, coeff in self.ilp_obj.obj_function.function_coeff.items():
+			cost[var_columns[var.name]] = sign * coeff
+		# variable bounds and integrality
+		var_lb = [ -math.inf if var.lowBound is None else var.lowBound for var in variables ]
+		var_ub = [ math.inf if var.upBound is None else var.upBound for var in variables ]
+		integrality = [ 0 if var.cat == ilp.LpContinuous else 1 for var in variables ]
+		constraints = []
+		matrix, row_lb, row_ub = self.get_constraint_matrix(var_columns)
+		if matrix.shape[0] > 0:
+			constraints.append(LinearConstraint(matrix, row_lb, row_ub))
+		options = {}
+		if self.ilp_obj.time_limit != None:
+			options["time_limit"] = self.ilp_obj.time_limit
+		if self.ilp_obj.gap_rel != None:
+			options["mip_rel_gap"] = self.ilp_obj.gap_rel
+		result = milp(cost, constraints=constraints, integrality=integrality, bounds=Bounds(var_lb, var_ub), options=options)
+		self.status = milp_status.get(result.status, ilp.LpStatusUndefined)
+		if self.status == ilp.LpStatusNotSolved and result.x is not None: # stopped by the time limit with a solution
+			self.status = LpStatusNotOptimal
+		if not(self.status in solution_statuses):
+			self.log.debug("HiGHS: {0}".format(result.message))
+			return self.status
+		for var, value, is_integer in zip(variables, result.x, integrality):
+			var.varValue = float(round(value)) if is_integer else float(value) # remove the integrality tolerance of the solver
+		return self.status
+
+
+############################################################################################################################################
+############################################################################################################################################
+#
+#	`PORTFOLIO_BACKEND` CLASS
+#
+############################################################################################################################################
+#	DESCRIPTION:
+#				 The following class races several solvers on the ILP formulation: each candidate solver solves the ILP formulation in its own
+#				 worker process, the first optimal or infeasible answer is kept and the other workers are killed
+############################################################################################################################################
+#	INFO:
+#				it is selected with the solver name "PORTFOLIO" (see `solver_backends`)
+#				'portfolio_solvers' are the candidate solvers: CBC through pulp, HiGHS in process, and the SDC engine if every constraint is a
+#				difference constraint (it cannot solve the other ILP formulations)
+#				the wins of each solver are recorded per technique (`ILP.technique`) in the class attribute 'wins', shared by all the portfolios of
+#				a run, `get_default_solver` returns the solver winning most often for a technique, and its worker is started first
+############################################################################################################################################
+#	ATTRIBUTES:
+#				- ilp_obj : ILP object whose variables, constraints and objective function are solved
+#				- status : status of the solution (same codes as pulp)
+#				- winner : solver whose answer is kept (None if no solver proved optimality or infeasibility)
+#				- solve_times : solution time of each solver that answered
+#				- log: logger object used to output logs
+############################################################################################################################################
+#	FUNCTIONS:
+#				- get_candidates : get the candidate solvers of the ILP formulation
+#				- kill_worker : kill a worker process and the processes it started (e.g. CBC)
+#				- get_result : wait for the next result of the workers, or for the death of a worker without result
+#				- solve : race the candidate solvers and write the kept solution in the ILP variables
+#				- get_default_solver : get the solver winning most often for a technique
+#				- print_stats : log the wins of each solver per technique
+############################################################################################################################################
+############################################################################################################################################
+
+portfolio_solvers = ["SDC", "SCIPY_HIGHS", "PULP_CBC_CMD"] # the workers are started one after the other, the solvers with the smallest start-up cost first
+portfolio_poll_interval = 0.5 # time in seconds between two checks of the workers that died without answering
+
+# function run by a worker process of the portfolio: it solves the sub-ILP (see `solve_sub_ilp`) and sends its result to the queue
+def race_sub_ilp(queue, solver, *sub_ilp):
+	if hasattr(os, "setpgrp"):
+		os.setpgrp() # the processes started by the solver are in the group of the worker, they are killed with it
+	try:
+		result = solve_sub_ilp(solver, *sub_ilp)
+	except Exception as e:
+		logging.getLogger('portfolio').debug("Portfolio: {0} failed ({1})".format(solver, e))
+		result = (ilp.LpStatusUndefined, {}, 0.0)
+	queue.put((solver, result))
+
+class Portfolio_Backend:
+
+	wins = {} # number of wins of each solver per technique
+
+	def __init__(self, ilp_obj, log=None):
+		if log != None:
+			self.log = log
+		else:
+			self.log = logging.getLogger('portfolio') # if the logger is not given at object generation, create a new one
+		assert(ilp_obj != None) # ilp_obj represents the ILP object to be solved
+		self.ilp_obj = ilp_obj
+		self.status = None
+		self.winner = None
+		self.solve_times = {}
+
+	# function to get the candidate solvers of the ILP formulation (constraint_arrays of `Constraint_Set.get_constraint_arrays`), the solver winning most often for its technique first
+	def get_candidates(self, constraint_arrays):
+		candidates = [ solver for solver in portfolio_solvers if solver in ilp.listSolvers(onlyAvailable=True) or solver in solver_backends ]
+		if milp is None and "SCIPY_HIGHS" in candidates:
+			candidates.remove("SCIPY_HIGHS")
+		_, indptr, _, coeffs, _, _ = constraint_arrays
+		coeffs, indptr = coeffs.tolist(), indptr.tolist()
+		sdc_engine = SDC_Engine(self.ilp_obj, log=self.log)
+		if "SDC" in candidates and not(all([ sdc_engine.is_difference_constraint([ (None, coeff) for coeff in coeffs[indptr[row]:indptr[row + 1]] if coeff != 0 ]) for row in range(len(indptr) - 1) ])):
+			candidates.remove("SDC")
+		default_solver = Portfolio_Backend.get_default_solver(self.ilp_obj.technique)
+		if default_solver in candidates:
+			candidates.remove(default_solver)
+			candidates.insert(0, default_solver)
+		return candidates
+
+	# function to kill a worker process and the processes it started (e.g. CBC)
+	def kill_worker(self, process):
+		try:
+			os.killpg(process.pid, signal.SIGKILL)
+		except (AttributeError, ProcessLookupError, PermissionError): # no process groups, or the worker has not created its group yet
+			process.kill()
+
+	# function to wait for the next result of the workers (dictionary of process per solver), it returns the solver and its result. A worker that
+	# died without sending its result (e.g. killed by the OOM killer, or crashed in its solver) has the undefined status: it has a nonzero exit code,
+	# a worker that exited normally has sent its result before
+	def get_result(self, queue, workers, results, start_time):
+		while True:
+			try:
+				return queue.get(timeout=portfolio_poll_interval)
+			except Empty:
+				for solver, worker in workers.items():
+					if not(solver in results) and not(worker.exitcode in (None, 0)):
+						self.log.warning("Portfolio: the worker of {0} died without result (exit code {1})".format(solver, worker.exitcode))
+						return solver, (ilp.LpStatusUndefined, {}, time.perf_counter() - start_time)
+
+	# function to race the candidate solvers, the solution is written in the variables of the ILP object and the status is returned
+	def solve(self):
+		self.winner = None
+		self.solve_times = {}
+		constraint_arrays = self.ilp_obj.constraints.get_constraint_arrays(self.ilp_obj.get_variable_columns())
+		candidates = self.get_candidates(constraint_arrays)
+		sub_ilp = self.ilp_obj.get_sub_ilp(list(range(len(self.ilp_obj.get_column_variables()))), np.ones(len(constraint_arrays[0]), dtype=bool), constraint_arrays)
+		queue = multiprocessing.Queue()
+		workers = { solver : multiprocessing.Process(target=race_sub_ilp, args=(queue, solver) + sub_ilp, daemon=True) for solver in candidates }
+		start_time = time.perf_counter()
+		for worker in workers.values():
+			worker.start()
+		results = {}
+		while len(results) < len(workers):
+			solver, result = self.get_result(queue, workers, results, start_time)
+			results[solver] = result
+			self.solve_times[solver] = result[2]
+			if result[0] in (ilp.LpStatusOptimal, ilp.LpStatusInfeasible): # a proof of optimality or of infeasibility
+				self.winner = solver
+				break
+		for solver, worker in workers.items():
+			if not(solver in results):
+				self.kill_worker(worker)
+			worker.join()
+		# without a proof, the best solution found is kept, or the answer of the first candidate if there is no solution
+		if self.winner != None:
+			status, values, _ = results[self.winner]
+		else:
+			solutions = [ solver for solver in candidates if results[solver][0] in solution_statuses ]
+			objective = lambda solver : sum([ coeff * results[solver][1][var.name] for var, coeff in self.ilp_obj.obj_function.function_coeff.items() ])
+			best_solver = (min if self.ilp_obj.model_minimize else max)(solutions, key=objective) if len(solutions) > 0 else candidates[0]
+			status, values, _ = results[best_solver]
+		for var_name, value in values.items():
+			self.ilp_obj.get_variable(var_name).varValue = value
+		self.status = status
+		if self.winner != None:
+			technique_wins = Portfolio_Backend.wins.setdefault(self.ilp_obj.technique, {})
+			technique_wins[self.winner] = technique_wins.get(self.winner, 0) + 1
+		self.log.debug("Portfolio: {0} won among {1} ({2})".format(self.winner, candidates, ", ".join([ "{0}: {1:.4f} s".format(solver, t) for solver, t in self.solve_times.items() ])))
+		return self.status
+
+	# function to get the solver winning most often for a technique (None if no solver has won yet)
+	@staticmethod
+	def get_default_solver(technique):
+		technique_wins = Portfolio_Backend.wins.get(technique, {})
+		if len(technique_wins) == 0:
+			return None
+		return max(technique_wins, key=lambda solver : technique_wins[solver])
+
+	# function to log the wins of each solver per technique
+	@staticmethod
+	def print_stats(log):
+		for technique, technique_wins in Portfolio_Backend.wins.items():
+			log.info("Portfolio wins for {0}: {1} (default solver: {2})".format(technique, ", ".join([ "{0} = {1}".format(solver, wins) for solver, wins in sorted(technique_wins.items()) ]), Portfolio_Backend.get_default_solver(technique)))
+
+
+# in-process backends, selected through `ILP.set_solver`, in addition to the pulp solvers
+solver_backends = {"SDC": SDC_Engine, "SCIPY_HIGHS": HiGHS_Backend, "PORTFOLIO": Portfolio_Backend}
+# solvers of the difference constraints only, they cannot solve the other constraints (e.g. the time-indexed or MRT resource constraints)
+difference_solvers = ["SDC"]
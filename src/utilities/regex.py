@@ -14,9 +14,15 @@
 #				- memory_instructions : regex for memory operators
 #				- control_instructions : regex for control operations
 #				- all_regex_instructions : regex containing all instruction types
+#				- opcode_regex_instructions : precompiled regex of the candidate instruction types per opcode
+############################################################################################################################################
+#	FUNCTIONS:
+#				- get_instruction_opcode : retrieve the opcode of an instruction string
+#				- match_instruction : identify the instruction type of an instruction string
 ############################################################################################################################################
 ############################################################################################################################################
 
+import re
 
 # common regex
 fast_math_flags = r'(nnan )?(ninf )?(nsz )?(arcp )?(contract )?(afn )?(reassoc )?(fast )?'
@@ -68,3 +74,44 @@ control_instructions = {
 
 # regex containing all instruction types
 all_regex_instructions = { **binary_instructions, **unary_instructions, **memory_instructions, **control_instructions}
+
+# opcodes whose instruction type name differs from the opcode itself
+opcode_aliases = {
+	'jmp': 'br'                                                        # unconditional branches share the `br` opcode
+}
+
+# function to group the precompiled regex per opcode, keeping the same order as in all_regex_instructions
+def _compile_opcode_regex(regex_instructions):
+	compiled = {}
+	for instruction_key, instruction_regex in regex_instructions.items():
+		opcode = opcode_aliases.get(instruction_key, instruction_key)
+		compiled.setdefault(opcode, []).append((instruction_key, re.compile(instruction_regex)))
+	return compiled
+
+# precompiled regex of the candidate instruction types per opcode
+opcode_regex_instructions = _compile_opcode_regex(all_regex_instructions)
+
+# precompiled regex of all instruction types, used as fallback when the opcode candidates do not match
+compiled_regex_instructions = [ (instruction_key, re.compile(instruction_regex)) for instruction_key, instruction_regex in all_regex_instructions.items() ]
+
+
+# function to retrieve the opcode of an instruction string (format: `<result> = <opcode> ...` or `<opcode> ...`)
+def get_instruction_opcode(instruction):
+	tokens = instruction.split(None, 3)
+	if len(tokens) > 2 and tokens[1] == '=':
+		return tokens[2]
+	return tokens[0] if len(tokens) > 0 else ''
+
+# function to identify the instruction type of an instruction string, it returns the pair (instruction_key, match) or (None, None)
+def match_instruction(instruction):
+	# only the regex of the instruction types sharing the opcode are tried
+	for instruction_key, instruction_regex in opcode_regex_instructions.get(get_instruction_opcode(instruction), []):
+		match = instruction_regex.search(instruction)
+		if match:
+			return instruction_key, match
+	# unexpected formatting: scan all regex as a last resort
+	for instruction_key, instruction_regex in compiled_regex_instructions:
+		match = instruction_regex.search(instruction)
+		if match:
+			return instruction_key, match
+	return None, None